@@ -8,9 +8,12 @@
         'l10n_pe',
     ],
     'data': [
+        'security/ir.model.access.csv',
         'data/ir_cron.xml',
         'views/res_config_settings_views.xml',
-        'views/res_partner_views.xml'
+        'views/res_partner_views.xml',
+        'views/decolecta_enrich_job_views.xml',
+        'wizard/decolecta_enrich_wizard_views.xml',
     ],
     'installable': True,
     'application': False,
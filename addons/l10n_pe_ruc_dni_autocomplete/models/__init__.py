@@ -1,4 +1,7 @@
 from . import res_partner
 from . import decolecta_service
+from . import decolecta_lookup_cache
 from . import res_config_settings
 from . import external_sync_service
+from . import external_sync_outbox
+from . import decolecta_enrich_job
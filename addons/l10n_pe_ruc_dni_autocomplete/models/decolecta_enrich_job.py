@@ -0,0 +1,228 @@
+import logging
+from collections import defaultdict
+
+from odoo import Command, _, api, fields, models
+from ..schemas.sunat_schema import SunatDTO
+from ..schemas.reniec_schema import ReniecDTO
+from ..services.partner_sync import log_event
+
+_logger = logging.getLogger(__name__)
+
+_JOB_STATE = [
+    ('queued', 'En cola'),
+    ('running', 'En proceso'),
+    ('done', 'Procesado'),
+]
+
+_LINE_STATUS = [
+    ('pending', 'Pendiente'),
+    ('done', 'Completado'),
+    ('failed', 'Fallido'),
+    ('skipped', 'Omitido'),
+]
+
+
+class DecolectaEnrichJob(models.Model):
+    _name = 'decolecta.enrich.job'
+    _description = 'Autocompletado masivo RUC/DNI'
+    _order = 'id desc'
+
+    name = fields.Char(string='Referencia', required=True)
+    state = fields.Selection(
+        string='Estado',
+        selection=_JOB_STATE,
+        default='queued',
+        required=True,
+        index=True,
+    )
+    force_refresh = fields.Boolean(string='Ignorar caché', default=False)
+    max_workers = fields.Integer(string='Consultas en paralelo', default=4)
+    line_ids = fields.One2many(
+        'decolecta.enrich.job.line',
+        'job_id',
+        string='Resultados',
+    )
+    partners_count = fields.Integer(string='Contactos')
+    documents_count = fields.Integer(string='Documentos')
+    pending_count = fields.Integer(string='Pendientes', compute='_compute_counts')
+    done_count = fields.Integer(string='Completados', compute='_compute_counts')
+    failed_count = fields.Integer(string='Fallidos', compute='_compute_counts')
+    skipped_count = fields.Integer(string='Omitidos', compute='_compute_counts')
+    progress = fields.Float(string='Progreso', compute='_compute_counts')
+    started_at = fields.Datetime(string='Iniciado el')
+    finished_at = fields.Datetime(string='Finalizado el')
+    duration = fields.Float(string='Duración (s)', compute='_compute_duration')
+    throughput = fields.Float(string='Contactos por segundo', compute='_compute_duration')
+
+    @api.depends('line_ids.status')
+    def _compute_counts(self):
+        counts = defaultdict(dict)
+        for job, status, count in self.env['decolecta.enrich.job.line']._read_group(
+            [('job_id', 'in', self.ids)],
+            ['job_id', 'status'],
+            ['__count'],
+        ):
+            counts[job.id][status] = count
+        for job in self:
+            job_counts = counts[job.id]
+            job.pending_count = job_counts.get('pending', 0)
+            job.done_count = job_counts.get('done', 0)
+            job.failed_count = job_counts.get('failed', 0)
+            job.skipped_count = job_counts.get('skipped', 0)
+            total = sum(job_counts.values())
+            job.progress = 100.0 * (total - job.pending_count) / total if total else 100.0
+
+    @api.depends('started_at', 'finished_at', 'partners_count')
+    def _compute_duration(self):
+        now = fields.Datetime.now()
+        for job in self:
+            if not job.started_at:
+                job.duration = job.throughput = 0.0
+                continue
+            job.duration = ((job.finished_at or now) - job.started_at).total_seconds()
+            job.throughput = job.partners_count / job.duration if job.duration else 0.0
+
+    @api.model
+    def _chunk_size(self):
+        return int(self.env['ir.config_parameter'].sudo().get_param('decolecta.enrich.chunk_size', '100'))
+
+    @api.model
+    def _prepare_lines(self, partners):
+        pe_country = self.env.ref('base.pe')
+        lines = []
+        for partner in partners:
+            vat = (partner.vat or '').strip()
+            line = {'partner_id': partner.id, 'document': vat, 'status': 'pending'}
+            if partner.country_id != pe_country:
+                line.update(status='skipped', message=_('El país debe ser Perú para usar el autocompletado.'))
+            else:
+                doc_type = partner._decolecta_document_type()
+                if not vat or doc_type not in ('ruc', 'dni'):
+                    line.update(status='skipped', message=_('No se pudo determinar el tipo de documento.'))
+                else:
+                    line['document_type'] = doc_type
+            lines.append(line)
+        return lines
+
+    @api.model
+    def _enqueue(self, partners, force_refresh=False, max_workers=4):
+        lines = self._prepare_lines(partners)
+        job = self.create({
+            'name': _('Autocompletado de %s contactos', len(partners)),
+            'force_refresh': force_refresh,
+            'max_workers': max_workers,
+            'partners_count': len(partners),
+            'documents_count': len({(line['document_type'], line['document']) for line in lines if line['status'] == 'pending'}),
+            'line_ids': [Command.create(line) for line in lines],
+        })
+        cron = self.env.ref('l10n_pe_ruc_dni_autocomplete.ir_cron_decolecta_enrich', raise_if_not_found=False)
+        if cron:
+            cron.sudo()._trigger()
+        log_event(_logger, 'decolecta_bulk_enrich_queued', job_id=job.id, partners=len(partners))
+        return job
+
+    @api.model
+    def _cron_process(self):
+        ir_cron = self.env['ir.cron']
+        Line = self.env['decolecta.enrich.job.line']
+        chunk_size = self._chunk_size()
+        while True:
+            job = self.search([('state', 'in', ('queued', 'running'))], order='id', limit=1)
+            if not job:
+                return
+            lines = Line.search([('job_id', '=', job.id), ('status', '=', 'pending')], order='id', limit=chunk_size)
+            if lines:
+                job._process_lines(lines)
+            else:
+                job._finish()
+            remaining = Line.search_count([('job_id.state', 'in', ('queued', 'running')), ('status', '=', 'pending')])
+            if not ir_cron._commit_progress(len(lines), remaining=remaining):
+                return
+
+    def _process_lines(self, lines):
+        self.ensure_one()
+        if self.state == 'queued':
+            self.write({'state': 'running', 'started_at': fields.Datetime.now()})
+        groups = lines.grouped(lambda line: (line.document_type, line.document))
+        try:
+            results = self.env['decolecta.service']._lookup_many(
+                groups,
+                force_refresh=self.force_refresh,
+                max_workers=self.max_workers,
+            )
+        except Exception as exc:
+            _logger.exception('Error consultando Decolecta para el lote %s', self.id)
+            lines.write({'status': 'failed', 'message': _('Error consultando Decolecta: %s') % exc})
+            return
+
+        outcomes = defaultdict(lambda: self.env['decolecta.enrich.job.line'])
+        for (doc_type, number), group in groups.items():
+            payload, error = results[(doc_type, number)]
+            status, message = 'done', False
+            if error is not None:
+                status, message = 'failed', _('Error consultando Decolecta: %s') % error
+            elif not payload:
+                status, message = 'failed', _('No se encontró información para el documento solicitado.')
+            else:
+                try:
+                    self._apply_payload(group.partner_id, doc_type, payload)
+                except Exception as exc:
+                    _logger.exception('Error aplicando datos de Decolecta al documento %s', number)
+                    status, message = 'failed', str(exc)
+            outcomes[(status, message)] |= group
+        for (status, message), group in outcomes.items():
+            group.write({'status': status, 'message': message})
+
+    def _apply_payload(self, partners, doc_type, payload):
+        if doc_type == 'ruc':
+            vals = partners._prepare_ruc_vals(SunatDTO.from_payload(payload))
+        else:
+            vals = partners._prepare_dni_vals(ReniecDTO.from_payload(payload))
+        with self.env.cr.savepoint():
+            partners.write(vals)
+
+    def _finish(self):
+        self.ensure_one()
+        self.write({'state': 'done', 'finished_at': fields.Datetime.now()})
+        log_event(
+            _logger,
+            'decolecta_bulk_enrich',
+            job_id=self.id,
+            partners=self.partners_count,
+            documents=self.documents_count,
+            done=self.done_count,
+            failed=self.failed_count,
+            skipped=self.skipped_count,
+            seconds=round(self.duration, 3),
+        )
+
+
+class DecolectaEnrichJobLine(models.Model):
+    _name = 'decolecta.enrich.job.line'
+    _description = 'Resultado de autocompletado masivo RUC/DNI'
+    _order = 'id'
+
+    job_id = fields.Many2one(
+        'decolecta.enrich.job',
+        required=True,
+        index=True,
+        ondelete='cascade',
+    )
+    partner_id = fields.Many2one(
+        'res.partner',
+        string='Contacto',
+        ondelete='cascade',
+    )
+    document_type = fields.Selection(
+        string='Tipo de documento',
+        selection=[('ruc', 'RUC'), ('dni', 'DNI')],
+    )
+    document = fields.Char(string='Documento')
+    status = fields.Selection(
+        string='Estado',
+        selection=_LINE_STATUS,
+        default='pending',
+        required=True,
+        index=True,
+    )
+    message = fields.Char(string='Detalle')
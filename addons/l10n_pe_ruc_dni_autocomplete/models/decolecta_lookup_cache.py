@@ -0,0 +1,107 @@
+import logging
+from datetime import timedelta
+
+from psycopg2 import IntegrityError
+
+from odoo import api, fields, models
+
+_logger = logging.getLogger(__name__)
+
+_DOCUMENT_TYPES = [
+    ('ruc', 'RUC'),
+    ('dni', 'DNI'),
+]
+
+
+class DecolectaLookupCache(models.Model):
+    _name = 'decolecta.lookup.cache'
+    _description = 'Caché de consultas RUC/DNI a Decolecta'
+    _order = 'fetched_at desc'
+
+    document_type = fields.Selection(
+        string='Tipo de documento',
+        selection=_DOCUMENT_TYPES,
+        required=True,
+    )
+    document_number = fields.Char(
+        string='Número de documento',
+        required=True,
+        index=True,
+    )
+    payload = fields.Json(string='Respuesta')
+    not_found = fields.Boolean(
+        string='Sin resultados',
+        default=False,
+    )
+    fetched_at = fields.Datetime(
+        string='Consultado el',
+        required=True,
+        default=fields.Datetime.now,
+    )
+
+    _document_unique = models.Constraint(
+        'UNIQUE(document_type, document_number)',
+        'Ya existe una entrada de caché para este documento.',
+    )
+
+    @api.model
+    def _cache_config(self):
+        icp = self.env['ir.config_parameter'].sudo()
+        return {
+            'ttl_hours': float(icp.get_param('decolecta.cache.ttl_hours', '24')),
+            'negative_ttl_hours': float(icp.get_param('decolecta.cache.negative_ttl_hours', '1')),
+        }
+
+    @api.model
+    def _ttl_seconds(self, not_found, cfg=None):
+        cfg = cfg or self._cache_config()
+        hours = cfg['negative_ttl_hours'] if not_found else cfg['ttl_hours']
+        return hours * 3600
+
+    @api.model
+    def _find_fresh(self, document_type, document_number):
+        record = self.search([
+            ('document_type', '=', document_type),
+            ('document_number', '=', document_number),
+        ], limit=1)
+        if not record:
+            return None
+        age = (fields.Datetime.now() - record.fetched_at).total_seconds()
+        if age >= self._ttl_seconds(record.not_found):
+            return None
+        return record
+
+    @api.model
+    def _store(self, document_type, document_number, payload):
+        vals = {
+            'payload': payload or None,
+            'not_found': not payload,
+            'fetched_at': fields.Datetime.now(),
+        }
+        domain = [
+            ('document_type', '=', document_type),
+            ('document_number', '=', document_number),
+        ]
+        record = self.search(domain, limit=1)
+        if record:
+            record.write(vals)
+            return record
+        try:
+            with self.env.cr.savepoint():
+                return self.create({**vals, 'document_type': document_type, 'document_number': document_number})
+        except IntegrityError:
+            record = self.search(domain, limit=1)
+            record.write(vals)
+            return record
+
+    @api.autovacuum
+    def _gc_expired_entries(self):
+        cfg = self._cache_config()
+        now = fields.Datetime.now()
+        expired = self.search([
+            '|',
+            '&', ('not_found', '=', False), ('fetched_at', '<', now - timedelta(hours=cfg['ttl_hours'])),
+            '&', ('not_found', '=', True), ('fetched_at', '<', now - timedelta(hours=cfg['negative_ttl_hours'])),
+        ])
+        _logger.info('Eliminando %s entradas expiradas de la caché Decolecta', len(expired))
+        expired.unlink()
@@ -1,13 +1,23 @@
 # -*- coding: utf-8 -*-
 import logging
-from odoo import models
+
+import requests
+
+from odoo import fields, models
 from odoo.exceptions import UserError
 from ..schemas.sunat_schema import SunatDTO
 from ..schemas.reniec_schema import ReniecDTO
-from ..services.decolecta_client import fetch_decolecta_payload
+from ..services.decolecta_client import fetch_decolecta_payload, fetch_decolecta_payloads, is_not_found
+from ..services.lookup_cache import is_missing, lookup_lru
+from ..services.rate_limiter import get_token_bucket
 
 _logger = logging.getLogger(__name__)
 
+_DOCUMENTS = {
+    'ruc': ('sunat/ruc/full', 'numero_documento'),
+    'dni': ('reniec/dni', 'document_number'),
+}
+
 
 class DecolectaServiceMixin(models.AbstractModel):
     _name = 'decolecta.service'
@@ -20,40 +30,111 @@ class DecolectaServiceMixin(models.AbstractModel):
         return {
             'token': icp.get_param('decolecta.api.token'),
             'base_url': self._BASE_URL,
+            'rps': float(icp.get_param('decolecta.api.rps', '3')),
+            'burst': int(icp.get_param('decolecta.api.burst', '5')),
+            'deadline': float(icp.get_param('decolecta.api.deadline', '5') or 0),
         }
 
-    def fetch_ruc_payload(self, ruc: str) -> dict:
+    def _limiter(self, cfg):
+        return get_token_bucket('%s.decolecta.api' % self.env.cr.dbname, cfg['rps'], cfg['burst'])
+
+    def _cache_key(self, document_type, number):
+        return (self.env.cr.dbname, document_type, number)
+
+    def _cached_payload(self, document_type, number):
+        key = self._cache_key(document_type, number)
+        payload = lookup_lru.get(key)
+        if not is_missing(payload):
+            _logger.debug('Decolecta cache LRU hit %s=%s', document_type, number)
+            return payload
+        cache = self.env['decolecta.lookup.cache'].sudo()
+        entry = cache._find_fresh(document_type, number)
+        if not entry:
+            return payload
+        payload = entry.payload or {}
+        age = (fields.Datetime.now() - entry.fetched_at).total_seconds()
+        lookup_lru.set(key, payload, cache._ttl_seconds(entry.not_found) - age)
+        _logger.debug('Decolecta cache DB hit %s=%s', document_type, number)
+        return payload
+
+    def _remember_payload(self, document_type, number, payload):
+        required_key = _DOCUMENTS[document_type][1]
+        if not payload or not payload.get(required_key):
+            payload = {}
+        cache = self.env['decolecta.lookup.cache'].sudo()
+        cache._store(document_type, number, payload)
+        lookup_lru.set(self._cache_key(document_type, number), payload, cache._ttl_seconds(not payload))
+        return payload
+
+    def _lookup(self, document_type, number, force_refresh=False):
+        if not force_refresh:
+            payload = self._cached_payload(document_type, number)
+            if not is_missing(payload):
+                return payload
+        try:
+            payload = self._fetch_payload(_DOCUMENTS[document_type][0], number)
+        except requests.HTTPError as exc:
+            if not is_not_found(exc):
+                raise
+            payload = {}
+        return self._remember_payload(document_type, number, payload)
+
+    def _lookup_many(self, keys, force_refresh=False, max_workers=4):
+        results = {}
+        pending = {}
+        for document_type, number in keys:
+            payload = None if force_refresh else self._cached_payload(document_type, number)
+            if payload is None or is_missing(payload):
+                pending[(document_type, number)] = (_DOCUMENTS[document_type][0], {'numero': number})
+            else:
+                results[(document_type, number)] = (payload, None)
+        if not pending:
+            return results
         cfg = self._config()
         if not cfg['token']:
             raise UserError("No hay un token configurado para la integración con Decolecta.")
-        payload = fetch_decolecta_payload(
+        fetched = fetch_decolecta_payloads(
+            pending,
             base_url=cfg['base_url'],
             token=cfg['token'],
-            endpoint='sunat/ruc/full',
-            params={'numero': ruc},
+            max_workers=max_workers,
+            rps=cfg['rps'],
+            limiter=self._limiter(cfg),
         )
-        return payload
+        for (document_type, number), (payload, error) in fetched.items():
+            if error is None:
+                payload = self._remember_payload(document_type, number, payload)
+            results[(document_type, number)] = (payload, error)
+        return results
 
-    def fetch_ruc(self, ruc: str) -> tuple[dict, SunatDTO]:
-        payload = self.fetch_ruc_payload(ruc)
-        if not payload or not payload.get('numero_documento'):
-            raise UserError("No se encontró información para el RUC solicitado.")
-        return payload, SunatDTO.from_payload(payload)
-
-    def fetch_dni_payload(self, dni: str) -> dict:
+    def _fetch_payload(self, endpoint, number):
         cfg = self._config()
         if not cfg['token']:
             raise UserError("No hay un token configurado para la integración con Decolecta.")
-        payload = fetch_decolecta_payload(
+        return fetch_decolecta_payload(
             base_url=cfg['base_url'],
             token=cfg['token'],
-            endpoint='reniec/dni',
-            params={'numero': dni},
+            endpoint=endpoint,
+            params={'numero': number},
+            rps=cfg['rps'],
+            limiter=self._limiter(cfg),
+            deadline=cfg['deadline'],
         )
-        return payload
 
-    def fetch_dni(self, dni: str) -> tuple[dict, ReniecDTO]:
-        payload = self.fetch_dni_payload(dni)
+    def fetch_ruc_payload(self, ruc: str, force_refresh: bool = False) -> dict:
+        return self._lookup('ruc', ruc, force_refresh=force_refresh)
+
+    def fetch_ruc(self, ruc: str, force_refresh: bool = False) -> tuple[dict, SunatDTO | None]:
+        payload = self.fetch_ruc_payload(ruc, force_refresh=force_refresh)
+        if not payload or not payload.get('numero_documento'):
+            return payload, None
+        return payload, SunatDTO.from_payload(payload)
+
+    def fetch_dni_payload(self, dni: str, force_refresh: bool = False) -> dict:
+        return self._lookup('dni', dni, force_refresh=force_refresh)
+
+    def fetch_dni(self, dni: str, force_refresh: bool = False) -> tuple[dict, ReniecDTO | None]:
+        payload = self.fetch_dni_payload(dni, force_refresh=force_refresh)
         if not payload or not payload.get('document_number'):
-            raise UserError("No se encontró información para el DNI solicitado.")
+            return payload, None
         return payload, ReniecDTO.from_payload(payload)
@@ -0,0 +1,236 @@
+import logging
+from datetime import timedelta
+
+from odoo import api, fields, models
+from odoo.tools import SQL
+
+from ..services.partner_sync import build_external_payload, external_key, log_event
+
+_logger = logging.getLogger(__name__)
+
+_OUTBOX_STATE = [
+    ('pending', 'Pendiente'),
+    ('sending', 'Enviando'),
+    ('dead', 'Descartado'),
+]
+
+_DRAIN_SCHEDULED = 'external_sync_outbox.drain_scheduled'
+
+
+class ExternalSyncOutbox(models.Model):
+    _name = 'external.sync.outbox'
+    _description = 'Cola de sincronización con sistema externo'
+    _order = 'id'
+
+    partner_id = fields.Many2one(
+        'res.partner',
+        string='Contacto',
+        required=True,
+        ondelete='cascade',
+    )
+    external_id = fields.Char(
+        string='External ID',
+        required=True,
+    )
+    state = fields.Selection(
+        string='Estado',
+        selection=_OUTBOX_STATE,
+        default='pending',
+        required=True,
+        index=True,
+    )
+    revision = fields.Integer(
+        string='Revisión',
+        default=1,
+    )
+    attempts = fields.Integer(
+        string='Intentos',
+        default=0,
+    )
+    next_attempt_at = fields.Datetime(
+        string='Próximo intento',
+        default=fields.Datetime.now,
+        index=True,
+    )
+    claimed_at = fields.Datetime(string='Reservado el')
+    last_error = fields.Text(string='Último error')
+
+    _external_id_unique = models.Constraint(
+        'UNIQUE(external_id)',
+        'Ya existe un envío pendiente para este External ID.',
+    )
+
+    @api.model
+    def _outbox_config(self):
+        icp = self.env['ir.config_parameter'].sudo()
+        return {
+            'max_attempts': int(icp.get_param('external.sync.outbox_max_attempts', '10')),
+            'backoff_seconds': int(icp.get_param('external.sync.outbox_backoff_seconds', '60')),
+            'backoff_cap_seconds': int(icp.get_param('external.sync.outbox_backoff_cap_seconds', '3600')),
+            'lease_seconds': int(icp.get_param('external.sync.outbox_lease_seconds', '300')),
+        }
+
+    @api.model
+    def _enqueue(self, partners):
+        if not partners:
+            return
+        rows = {external_key(partner): partner.id for partner in partners}
+        self.env['res.partner'].flush_model(['external_id'])
+        self.flush_model()
+        self.env.cr.execute(SQL(
+            """
+            INSERT INTO external_sync_outbox (
+                partner_id, external_id, state, revision, attempts, next_attempt_at,
+                create_uid, create_date, write_uid, write_date
+            )
+            SELECT partner_id, external_id, 'pending', 1, 0, now() AT TIME ZONE 'UTC',
+                   %(uid)s, now() AT TIME ZONE 'UTC', %(uid)s, now() AT TIME ZONE 'UTC'
+              FROM unnest(%(partner_ids)s::int[], %(external_ids)s::varchar[]) AS t(partner_id, external_id)
+            ON CONFLICT (external_id) DO UPDATE SET
+                partner_id = EXCLUDED.partner_id,
+                state = 'pending',
+                revision = external_sync_outbox.revision + 1,
+                attempts = 0,
+                next_attempt_at = EXCLUDED.next_attempt_at,
+                claimed_at = NULL,
+                last_error = NULL,
+                write_uid = EXCLUDED.write_uid,
+                write_date = EXCLUDED.write_date
+            """,
+            uid=self.env.uid,
+            partner_ids=list(rows.values()),
+            external_ids=list(rows),
+        ))
+        self.invalidate_model()
+        self._schedule_drain()
+        log_event(_logger, 'external_sync_enqueued', partners=len(rows))
+
+    @api.model
+    def _schedule_drain(self):
+        precommit = self.env.cr.precommit
+        if precommit.data.get(_DRAIN_SCHEDULED):
+            return
+        precommit.data[_DRAIN_SCHEDULED] = True
+        precommit.add(self._trigger_drain)
+
+    @api.model
+    def _trigger_drain(self):
+        cron = self.env.ref('l10n_pe_ruc_dni_autocomplete.ir_cron_external_outbox_drain', raise_if_not_found=False)
+        if cron:
+            cron.sudo()._trigger()
+
+    @api.model
+    def _cron_drain(self, batch_size=None):
+        service = self.env['external.sync.service']
+        batch_size = batch_size or service._config()['batch_size']
+        while True:
+            rows, revisions = self._claim_batch(batch_size)
+            if not rows:
+                return
+            # Release the row locks before calling the external API so user
+            # saves re-enqueueing these partners never wait on the network.
+            self.env['res.partner']._commit_cron_progress()
+            rows._drain_batch(revisions)
+            self.env['res.partner']._commit_cron_progress()
+
+    @api.model
+    def _claim_batch(self, batch_size):
+        self.flush_model()
+        now = fields.Datetime.now()
+        self.env.cr.execute(SQL(
+            """
+            UPDATE external_sync_outbox AS outbox
+               SET state = 'sending', claimed_at = %(now)s
+              FROM (
+                    SELECT id
+                      FROM external_sync_outbox
+                     WHERE (state = 'pending' AND next_attempt_at <= %(now)s)
+                        OR (state = 'sending' AND claimed_at < %(expired)s)
+                     ORDER BY id
+                     LIMIT %(limit)s
+                       FOR UPDATE SKIP LOCKED
+                   ) AS claimable
+             WHERE outbox.id = claimable.id
+            RETURNING outbox.id, outbox.revision
+            """,
+            now=now,
+            expired=now - timedelta(seconds=self._outbox_config()['lease_seconds']),
+            limit=batch_size,
+        ))
+        revisions = dict(self.env.cr.fetchall())
+        self.invalidate_model(['state', 'claimed_at'])
+        return self.browse(sorted(revisions)), revisions
+
+    def _drain_batch(self, revisions):
+        partners = self.partner_id
+        now = fields.Datetime.now()
+        try:
+            payloads = [build_external_payload(partner, updated_at=now) for partner in partners]
+            results = self.env['external.sync.service'].sync_partners(payloads)
+        except Exception as exc:
+            _logger.exception('Error drenando la cola de sincronización externa')
+            self._mark_failed({row.external_id: str(exc) for row in self}, revisions)
+            return
+        failures = dict(partners._apply_external_sync_results(results, synced_at=now))
+        errors = {row.external_id: failures[row.partner_id.id] or 'Sin respuesta' for row in self if row.partner_id.id in failures}
+        failed = self.filtered(lambda row: row.external_id in errors)
+        (self - failed)._delete_sent(revisions)
+        failed._mark_failed(errors, revisions)
+
+    def _delete_sent(self, revisions):
+        if not self:
+            return
+        self.flush_recordset()
+        self.env.cr.execute(SQL(
+            """
+            DELETE FROM external_sync_outbox AS outbox
+             USING unnest(%s::int[], %s::int[]) AS sent(id, revision)
+             WHERE outbox.id = sent.id AND outbox.revision = sent.revision
+            """,
+            self.ids,
+            [revisions[row_id] for row_id in self.ids],
+        ))
+        self.invalidate_recordset()
+
+    def _mark_failed(self, errors, revisions):
+        if not self:
+            return
+        cfg = self._outbox_config()
+        now = fields.Datetime.now()
+        attempts, states, next_attempts = [], [], []
+        for row in self:
+            row_attempts = row.attempts + 1
+            delay = min(cfg['backoff_cap_seconds'], cfg['backoff_seconds'] * (2 ** (row_attempts - 1)))
+            attempts.append(row_attempts)
+            states.append('dead' if row_attempts >= cfg['max_attempts'] else 'pending')
+            next_attempts.append(now + timedelta(seconds=delay))
+        self.flush_recordset()
+        # Rows re-enqueued while the batch was in flight carry a newer
+        # revision and are already pending again; leave them untouched.
+        self.env.cr.execute(SQL(
+            """
+            UPDATE external_sync_outbox AS outbox
+               SET attempts = failed.attempts,
+                   state = failed.state,
+                   next_attempt_at = failed.next_attempt_at,
+                   claimed_at = NULL,
+                   last_error = failed.last_error
+              FROM unnest(%s::int[], %s::int[], %s::int[], %s::varchar[], %s::timestamp[], %s::text[])
+                   AS failed(id, revision, attempts, state, next_attempt_at, last_error)
+             WHERE outbox.id = failed.id AND outbox.revision = failed.revision
+            """,
+            self.ids,
+            [revisions[row_id] for row_id in self.ids],
+            attempts,
+            states,
+            next_attempts,
+            [errors.get(row.external_id) for row in self],
+        ))
+        self.invalidate_recordset()
+        log_event(
+            _logger,
+            'external_sync_outbox_failed',
+            level=logging.WARNING,
+            failed=len(self),
+            errors=errors,
+        )
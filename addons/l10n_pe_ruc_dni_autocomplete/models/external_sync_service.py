@@ -7,6 +7,7 @@ from odoo import models
 from odoo.exceptions import UserError
 
 from ..services.http_client import HttpClient
+from ..services.rate_limiter import get_token_bucket
 from ..services.partner_sync import log_event
 
 _logger = logging.getLogger(__name__)
@@ -23,9 +24,14 @@ class ExternalSyncService(models.AbstractModel):
             "token": icp.get_param('external.api.token'),
             "rps": float(icp.get_param('external.api.rps', '3')),
             "max_retries": int(icp.get_param('external.api.max_retries', '5')),
+            "timeout": int(icp.get_param('external.api.timeout', '15')),
+            "deadline": float(icp.get_param('external.api.deadline', '0') or 0),
+            "burst": int(icp.get_param('external.api.burst', '5')),
+            "batch_size": int(icp.get_param('external.api.batch_size', '200')),
+            "cron_max_failures": int(icp.get_param('external.api.cron_max_failures', '3')),
         }
 
-    def sync_partner(self, payload: dict[str, Any]) -> dict[str, Any]:
+    def _call_rpc(self, method: str, params: Any, log_payload: Any) -> Any:
         cfg = self._config()
         if not cfg.get('token'):
             raise UserError('No hay un token configurado para la integración externa.')
@@ -38,25 +44,50 @@ class ExternalSyncService(models.AbstractModel):
         }
         body = {
             'jsonrpc': '2.0',
-            'method': 'partner.sync',
-            'params': payload,
+            'method': method,
+            'params': params,
             'id': datetime.utcnow().timestamp(),
         }
-        client = HttpClient(rps=cfg['rps'], max_retries=cfg['max_retries'])
+        limiter = get_token_bucket('%s.external.api' % self.env.cr.dbname, cfg['rps'], cfg['burst'])
+        client = HttpClient(
+            rps=cfg['rps'],
+            max_retries=cfg['max_retries'],
+            timeout=cfg['timeout'],
+            deadline=cfg['deadline'],
+            limiter=limiter,
+        )
         log_event(
             _logger,
             'external_sync_request',
             url=url,
-            payload=payload,
+            method=method,
+            payload=log_payload,
         )
         resp = client.request('POST', url, headers=headers, json=body)
+        if client.throttle_wait:
+            log_event(
+                _logger,
+                'external_sync_throttled',
+                method=method,
+                wait_seconds=round(client.throttle_wait, 3),
+                wait_seconds_total=round(limiter.stats()['wait_seconds_total'], 3),
+            )
         data = resp.json() if resp.content else {}
         if 'error' in data:
             log_event(
                 _logger,
                 'external_sync_error',
                 error=data.get('error'),
-                payload=payload,
+                payload=log_payload,
             )
             raise UserError('Error en sincronización externa: %s' % json.dumps(data.get('error')))
         return data.get('result')
+
+    def sync_partner(self, payload: dict[str, Any]) -> dict[str, Any]:
+        return self._call_rpc('partner.sync', payload, payload)
+
+    def sync_partners(self, payloads: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        if not payloads:
+            return []
+        external_ids = [payload.get('external_id') for payload in payloads]
+        return self._call_rpc('partner.sync_many', {'partners': payloads}, external_ids) or []
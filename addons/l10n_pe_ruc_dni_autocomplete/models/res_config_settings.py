@@ -9,6 +9,43 @@ class ResConfigSettings(models.TransientModel):
         config_parameter='decolecta.api.token',
         help='Token para consultas RUC, DNI y tipo de cambio. Puedes conseguirlo en Decolecta.',
     )
+    decolecta_api_rps = fields.Float(
+        string='Decolecta API RPS',
+        config_parameter='decolecta.api.rps',
+        default=3.0,
+        help='Límite de requests por segundo hacia Decolecta, compartido por todos los workers.',
+    )
+    decolecta_api_burst = fields.Integer(
+        string='Decolecta API Burst',
+        config_parameter='decolecta.api.burst',
+        default=5,
+        help='Cantidad máxima de requests que pueden enviarse en ráfaga hacia Decolecta.',
+    )
+    decolecta_api_deadline = fields.Float(
+        string='Decolecta API Deadline',
+        config_parameter='decolecta.api.deadline',
+        default=5.0,
+        help='Tiempo máximo en segundos de una consulta desde el botón Autocompletar, incluyendo reintentos. '
+             'El autocompletado masivo no usa este límite. Con 0 se usa timeout × (reintentos + 1).',
+    )
+    decolecta_cache_ttl_hours = fields.Float(
+        string='Decolecta Cache TTL (horas)',
+        config_parameter='decolecta.cache.ttl_hours',
+        default=24.0,
+        help='Horas durante las que se reutiliza una respuesta de Decolecta antes de volver a consultarla.',
+    )
+    decolecta_cache_negative_ttl_hours = fields.Float(
+        string='Decolecta Cache TTL sin resultados (horas)',
+        config_parameter='decolecta.cache.negative_ttl_hours',
+        default=1.0,
+        help='Horas durante las que se recuerda que un documento no existe en Decolecta.',
+    )
+    decolecta_enrich_chunk_size = fields.Integer(
+        string='Decolecta lote de autocompletado masivo',
+        config_parameter='decolecta.enrich.chunk_size',
+        default=100,
+        help='Contactos procesados y confirmados por cada iteración del autocompletado masivo.',
+    )
     external_api_base_url = fields.Char(
         string='External API Base URL',
         config_parameter='external.api.base_url',
@@ -25,9 +62,34 @@ class ResConfigSettings(models.TransientModel):
         default=3.0,
         help='Límite de requests por segundo hacia el sistema externo.',
     )
+    external_api_burst = fields.Integer(
+        string='External API Burst',
+        config_parameter='external.api.burst',
+        default=5,
+        help='Cantidad máxima de requests que pueden enviarse en ráfaga hacia el sistema externo.',
+    )
     external_api_max_retries = fields.Integer(
         string='External API Max Retries',
         config_parameter='external.api.max_retries',
         default=5,
         help='Número máximo de reintentos con backoff.',
     )
+    external_api_timeout = fields.Integer(
+        string='External API Timeout',
+        config_parameter='external.api.timeout',
+        default=15,
+        help='Tiempo máximo en segundos de cada intento contra el sistema externo.',
+    )
+    external_api_deadline = fields.Float(
+        string='External API Deadline',
+        config_parameter='external.api.deadline',
+        default=0.0,
+        help='Tiempo máximo en segundos de una llamada incluyendo reintentos y esperas. '
+             'Con 0 se usa timeout × (reintentos + 1).',
+    )
+    external_api_batch_size = fields.Integer(
+        string='External API Batch Size',
+        config_parameter='external.api.batch_size',
+        default=200,
+        help='Cantidad de partners enviados por lote en la sincronización programada.',
+    )
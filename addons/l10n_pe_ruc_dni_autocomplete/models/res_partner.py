@@ -1,19 +1,36 @@
 import logging
-from odoo import _, api, fields, models
+import threading
+from odoo import _, api, fields, models, tools
+from odoo.tools import SQL
 from odoo.exceptions import UserError
 from ..schemas.sunat_schema import SunatDTO
 from ..schemas.reniec_schema import ReniecDTO
 from ..services.partner_sync import (
     build_external_payload,
+    external_key,
     log_event,
     reconcile_partner_payload,
 )
+from ..services.ubigeo import build_ubigeo_index, resolve_ubigeo
 
 _SUNAT_CONDITION = [
     ('HABIDO', 'HABIDO'),
     ('NO HABIDO', 'NO HABIDO')
 ]
 
+_CRON_CURSOR_PARAM = 'external.sync.cron_cursor'
+
+_EXTERNAL_SYNC_FIELDS = {
+    'name',
+    'vat',
+    'email',
+    'phone',
+    'street',
+    'city',
+    'country_id',
+    'external_score',
+}
+
 _logger = logging.getLogger(__name__)
 
 class ResPartner(models.Model):
@@ -66,22 +83,16 @@ class ResPartner(models.Model):
         string='Actualización externa'
     )
 
-    @api.depends('country_id', 'l10n_latam_identification_type_id')
+    @api.depends('l10n_latam_identification_type_id')
     def _compute_visible_documents(self):
-        for rec in self:
-            country = self.env.ref('base.pe')
-            dni = self.env.ref('l10n_pe.it_DNI')
-            ruc = self.env.ref('l10n_pe.it_RUC')
-            if not rec.country_id or rec.country_id.id != country.id:
-                rec.is_visible_ruc = False
-                rec.is_visible_dni = False
-
-            if rec.l10n_latam_identification_type_id.id == dni.id:
-                rec.is_visible_dni = True
-                rec.is_visible_ruc = False
-            elif rec.l10n_latam_identification_type_id.id == ruc.id:
-                rec.is_visible_dni = False
-                rec.is_visible_ruc = True
+        dni = self.env.ref('l10n_pe.it_DNI')
+        ruc = self.env.ref('l10n_pe.it_RUC')
+        by_type = self.grouped('l10n_latam_identification_type_id')
+        dni_partners = by_type.get(dni, self.browse())
+        ruc_partners = by_type.get(ruc, self.browse())
+        dni_partners.update({'is_visible_dni': True, 'is_visible_ruc': False})
+        ruc_partners.update({'is_visible_dni': False, 'is_visible_ruc': True})
+        (self - dni_partners - ruc_partners).update({'is_visible_dni': False, 'is_visible_ruc': False})
 
     def _detect_document_type(self):
         self.ensure_one()
@@ -101,29 +112,35 @@ class ResPartner(models.Model):
             return 'dni'
         return None
 
+    def _decolecta_document_type(self):
+        self.ensure_one()
+        doc_type_name = (self.l10n_latam_identification_type_id.name or '').upper()
+        if 'RUC' in doc_type_name:
+            return 'ruc'
+        if 'DNI' in doc_type_name:
+            return 'dni'
+        return self._detect_document_type()
+
     def action_complete_from_decolecta(self):
         self.ensure_one()
 
         svc = self.env['decolecta.service']
+        force_refresh = bool(self.env.context.get('decolecta_force_refresh'))
         try:
             pe_country = self.env.ref('base.pe')
             if not self.country_id or self.country_id.id != pe_country.id:
                 raise UserError(_('El país debe ser Perú para usar el autocompletado.'))
 
-            doc_type_name = (self.l10n_latam_identification_type_id.name or '').upper()
-            doc_type = None
-            if 'RUC' in doc_type_name:
-                doc_type = 'ruc'
-            elif 'DNI' in doc_type_name:
-                doc_type = 'dni'
-            else:
-                doc_type = self._detect_document_type()
-
+            doc_type = self._decolecta_document_type()
             if doc_type == 'ruc':
-                payload, dto = svc.fetch_ruc(self.vat)
+                payload, dto = svc.fetch_ruc(self.vat, force_refresh=force_refresh)
+                if dto is None:
+                    return self._decolecta_not_found(_('No se encontró información para el RUC solicitado.'))
                 self._apply_ruc(dto=dto)
             elif doc_type == 'dni':
-                payload, dto = svc.fetch_dni(self.vat)
+                payload, dto = svc.fetch_dni(self.vat, force_refresh=force_refresh)
+                if dto is None:
+                    return self._decolecta_not_found(_('No se encontró información para el DNI solicitado.'))
                 self._apply_dni(dto=dto)
             else:
                 raise UserError(_('No se pudo determinar el tipo de documento.'))
@@ -140,10 +157,17 @@ class ResPartner(models.Model):
             _logger.exception('Error consultando Decolecta')
             raise UserError(_('Error consultando Decolecta: %s') % exc) from exc
 
-    def _apply_ruc(self, dto: SunatDTO):
-        self.ensure_one()
-
+    def _decolecta_not_found(self, message):
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'type': 'warning',
+                'message': message,
+            },
+        }
 
+    def _prepare_ruc_vals(self, dto: SunatDTO):
         vals = {
             'name': dto.razon_social,
             'vat': dto.numero_documento,
@@ -161,23 +185,25 @@ class ResPartner(models.Model):
             'sunat_foreign_trade': dto.comercio_exterior,
         }
 
-        pe_country = self.env.ref('base.pe')
-        state = self._find_department(dto.departamento, pe_country)
-        city = self._find_city(dto.provincia, state, pe_country)
-        district = self._find_district(dto.distrito, city)
+        location = resolve_ubigeo(
+            self._pe_ubigeo_index(),
+            ubigeo=dto.ubigeo,
+            department=dto.departamento,
+            province=dto.provincia,
+            district=dto.distrito,
+        )
 
-        vals['state_id'] = state.id
-        vals['city_id'] = city.id
-        vals['l10n_pe_district'] = district.id
+        vals['state_id'] = location.state_id
+        vals['city_id'] = location.city_id
+        vals['l10n_pe_district'] = location.district_id
         vals['company_type'] = 'company'
         vals['type'] = 'contact'
-        state = None
+        return vals
 
-        self.write(vals)
-
-    def _apply_dni(self, dto: ReniecDTO):
-        self.ensure_one()
+    def _apply_ruc(self, dto: SunatDTO):
+        self.write(self._prepare_ruc_vals(dto))
 
+    def _prepare_dni_vals(self, dto: ReniecDTO):
         full_name = dto.full_name or ' '.join(filter(None, [
             dto.first_name,
             dto.first_last_name,
@@ -185,13 +211,45 @@ class ResPartner(models.Model):
         ])).strip()
 
         vals = {
-            'name': full_name or self.name,
-            'vat': dto.document_number or self.vat,
             'company_type': 'person',
             'type': 'contact',
         }
+        if full_name:
+            vals['name'] = full_name
+        if dto.document_number:
+            vals['vat'] = dto.document_number
+        return vals
 
-        self.write(vals)
+    def _apply_dni(self, dto: ReniecDTO):
+        self.write(self._prepare_dni_vals(dto))
+
+    @api.model
+    @tools.ormcache()
+    def _pe_ubigeo_index(self):
+        pe_country = self.env.ref('base.pe')
+        states = self.env['res.country.state'].sudo().search_read(
+            [('country_id', '=', pe_country.id)],
+            ['code', 'name'],
+        )
+        cities = self.env['res.city'].sudo().search_read(
+            [('country_id', '=', pe_country.id)],
+            ['l10n_pe_code', 'name', 'state_id'],
+        )
+        districts = self.env['l10n_pe.res.city.district'].sudo().search_read(
+            [('city_id.country_id', '=', pe_country.id)],
+            ['code', 'name', 'city_id'],
+        )
+        return build_ubigeo_index(
+            states,
+            [
+                {'id': city['id'], 'code': city['l10n_pe_code'], 'name': city['name'], 'state_id': city['state_id'] and city['state_id'][0]}
+                for city in cities
+            ],
+            [
+                {'id': district['id'], 'code': district['code'], 'name': district['name'], 'city_id': district['city_id'] and district['city_id'][0]}
+                for district in districts
+            ],
+        )
 
     def _find_district(self, district_name, city_id):
         return self.env['l10n_pe.res.city.district'].search([
@@ -214,25 +272,49 @@ class ResPartner(models.Model):
             ('name', '=ilike', department_name)
         ], limit=1)
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        partners = super().create(vals_list)
+        partners._enqueue_external_sync()
+        return partners
+
+    def write(self, vals):
+        res = super().write(vals)
+        if _EXTERNAL_SYNC_FIELDS.intersection(vals):
+            self._enqueue_external_sync()
+        return res
+
+    def _enqueue_external_sync(self):
+        if self.env.context.get('external_sync_skip_outbox'):
+            return
+        linked = self.filtered('external_id')
+        if linked:
+            self.env['external.sync.outbox'].sudo()._enqueue(linked)
+
     def action_sync_to_external(self):
-        self.ensure_one()
-        payload = build_external_payload(self)
+        self.env['external.sync.outbox'].sudo()._enqueue(self)
         log_event(
             _logger,
             'external_sync_start',
             direction='odoo_to_external',
-            partner_id=self.id,
-            external_id=payload.get('external_id'),
+            partner_ids=self.ids,
+            external_ids=[external_key(partner) for partner in self],
         )
-        result = self.env['external.sync.service'].sync_partner(payload)
-        self._apply_external_sync_result(result)
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'type': 'info',
+                'message': _('Sincronización encolada. Se enviará en segundo plano.'),
+            },
+        }
 
     def _apply_external_sync_result(self, result):
         if not result:
             return
         values = reconcile_partner_payload(result)
         if values:
-            self.write(values)
+            self.with_context(external_sync_skip_outbox=True).write(values)
         log_event(
             _logger,
             'external_sync_success',
@@ -242,9 +324,99 @@ class ResPartner(models.Model):
             response=result,
         )
 
-    def _cron_sync_external_score(self):
-        partners = self.search([('external_id', '!=', False)])
-        for partner in partners:
-            payload = build_external_payload(partner)
-            result = self.env['external.sync.service'].sync_partner(payload)
-            partner._apply_external_sync_result(result)
+    def _cron_sync_external_score(self, batch_size=None):
+        icp = self.env['ir.config_parameter'].sudo()
+        service = self.env['external.sync.service']
+        cfg = service._config()
+        batch_size = batch_size or cfg['batch_size']
+        cursor = int(icp.get_param(_CRON_CURSOR_PARAM, '0') or 0)
+        consecutive_failures = 0
+        while True:
+            partners = self.search(
+                [('external_id', '!=', False), ('id', '>', cursor)],
+                order='id',
+                limit=batch_size,
+            )
+            if not partners:
+                icp.set_param(_CRON_CURSOR_PARAM, '0')
+                self._commit_cron_progress()
+                return
+            try:
+                with self.env.cr.savepoint():
+                    failures = partners._sync_external_batch()
+                consecutive_failures = 0
+            except Exception:
+                self.env.invalidate_all()
+                _logger.exception('Error sincronizando lote externo desde partner_id=%s', partners[0].id)
+                failures = [(partner_id, None) for partner_id in partners.ids]
+                consecutive_failures += 1
+            if failures:
+                self.env['external.sync.outbox'].sudo()._enqueue(self.browse([partner_id for partner_id, _error in failures]))
+            cursor = partners[-1].id
+            icp.set_param(_CRON_CURSOR_PARAM, str(cursor))
+            self._commit_cron_progress()
+            if consecutive_failures >= cfg['cron_max_failures']:
+                _logger.warning('Sincronización externa detenida tras %s lotes fallidos consecutivos', consecutive_failures)
+                return
+
+    def _sync_external_batch(self):
+        now = fields.Datetime.now()
+        payloads = [build_external_payload(partner, updated_at=now) for partner in self]
+        results = self.env['external.sync.service'].sync_partners(payloads)
+        return self._apply_external_sync_results(results, synced_at=now)
+
+    def _apply_external_sync_results(self, results, synced_at=None):
+        synced_at = synced_at or fields.Datetime.now()
+        results_by_external_id = {result.get('external_id'): result for result in results or []}
+        synced_ids = []
+        rows = []
+        failures = []
+        for partner in self:
+            result = results_by_external_id.get(external_key(partner))
+            if not result or result.get('status') not in ('created', 'updated'):
+                failures.append((partner.id, result and result.get('error')))
+                continue
+            synced_ids.append(partner.id)
+            values = reconcile_partner_payload(result.get('partner'), synced_at=synced_at)
+            if values:
+                rows.append((
+                    partner.id,
+                    values.get('external_id'),
+                    values.get('external_score'),
+                    fields.Datetime.to_datetime(values.get('external_updated_at')),
+                ))
+        synced = self.browse(synced_ids)
+        if synced:
+            synced.with_context(external_sync_skip_outbox=True).write({'external_last_sync_at': synced_at})
+        synced._write_external_values(rows)
+        log_event(
+            _logger,
+            'external_sync_batch',
+            direction='odoo_to_external',
+            synced=len(synced),
+            failed=failures,
+            updated=len(rows),
+        )
+        return failures
+
+    def _write_external_values(self, rows):
+        if not rows:
+            return
+        fnames = ['external_id', 'external_score', 'external_updated_at']
+        self.flush_model(fnames)
+        self.env.cr.execute(SQL(
+            """
+            UPDATE res_partner AS partner
+               SET external_id = COALESCE(incoming.external_id, partner.external_id),
+                   external_score = COALESCE(incoming.score, partner.external_score),
+                   external_updated_at = COALESCE(incoming.updated_at, partner.external_updated_at)
+              FROM (VALUES %s) AS incoming(id, external_id, score, updated_at)
+             WHERE partner.id = incoming.id
+            """,
+            SQL(', ').join(SQL('(%s, %s::varchar, %s::float8, %s::timestamp)', *row) for row in rows),
+        ))
+        self.browse([row[0] for row in rows]).invalidate_recordset(fnames)
+
+    def _commit_cron_progress(self):
+        if not getattr(threading.current_thread(), 'testing', False):
+            self.env.cr.commit()
@@ -1,3 +1,6 @@
 from . import http_client
+from . import rate_limiter
+from . import lookup_cache
 from . import decolecta_client
 from . import partner_sync
+from . import ubigeo
@@ -1,6 +1,9 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pprint import pformat
-from typing import Any
+from typing import Any, Hashable
+
+import requests
 
 from .http_client import HttpClient
 
@@ -15,6 +18,8 @@ def fetch_decolecta_payload(
     params: dict[str, Any],
     rps: float = 3,
     max_retries: int = 5,
+    limiter=None,
+    deadline: float | None = None,
 ) -> dict[str, Any]:
     url = f"{base_url.rstrip('/')}/{endpoint.lstrip('/')}"
     headers = {
@@ -22,8 +27,48 @@ def fetch_decolecta_payload(
         'Accept': 'application/json',
     }
     _logger.info('Consultando Decolecta endpoint=%s params=%s', endpoint, params)
-    client = HttpClient(rps=rps, max_retries=max_retries)
+    client = HttpClient(rps=rps, max_retries=max_retries, limiter=limiter, deadline=deadline)
     resp = client.request('GET', url, headers=headers, params=params)
     payload = resp.json() or {}
-    _logger.info('Respuesta Decolecta: %s', pformat(payload))
+    _logger.info('Respuesta Decolecta endpoint=%s campos=%s', endpoint, len(payload))
+    if _logger.isEnabledFor(logging.DEBUG):
+        _logger.debug('Respuesta Decolecta: %s', pformat(payload))
     return payload
+
+
+def is_not_found(exc: Exception) -> bool:
+    response = getattr(exc, 'response', None)
+    return isinstance(exc, requests.HTTPError) and response is not None and response.status_code == 404
+
+
+def fetch_decolecta_payloads(
+    jobs: dict[Hashable, tuple[str, dict[str, Any]]],
+    *,
+    base_url: str,
+    token: str,
+    max_workers: int = 4,
+    rps: float = 3,
+    max_retries: int = 5,
+    limiter=None,
+) -> dict[Hashable, tuple[dict[str, Any] | None, Exception | None]]:
+    def fetch(endpoint, params):
+        try:
+            return fetch_decolecta_payload(
+                base_url=base_url,
+                token=token,
+                endpoint=endpoint,
+                params=params,
+                rps=rps,
+                max_retries=max_retries,
+                limiter=limiter,
+            ), None
+        except Exception as exc:
+            if is_not_found(exc):
+                return {}, None
+            return None, exc
+
+    if not jobs:
+        return {}
+    with ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix='decolecta') as pool:
+        futures = {key: pool.submit(fetch, endpoint, params) for key, (endpoint, params) in jobs.items()}
+        return {key: future.result() for key, future in futures.items()}
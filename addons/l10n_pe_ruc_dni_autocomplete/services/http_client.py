@@ -1,68 +1,255 @@
 import logging
 import random
+import threading
 import time
+from urllib.parse import urlsplit
+
 import requests
+from requests.adapters import HTTPAdapter
+
+from .partner_sync import log_event
 
 _logger = logging.getLogger(__name__)
 
 _RETRYABLE_STATUS = {429, 500, 502, 503, 504}
 
+_SESSIONS = {}
+_LIMITERS = {}
+_BREAKERS = {}
+_REGISTRY_LOCK = threading.Lock()
 
-class HttpClient:
-    def __init__(self, *, rps=3, max_retries=5, backoff_base=0.5, backoff_cap=8.0, timeout=15):
+
+def _base_url(url):
+    parts = urlsplit(url)
+    return '%s://%s' % (parts.scheme, parts.netloc)
+
+
+def get_session(base_url, *, pool_maxsize=10):
+    with _REGISTRY_LOCK:
+        session = _SESSIONS.get(base_url)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _SESSIONS[base_url] = session
+        return session
+
+
+class RateLimiter:
+    def __init__(self, rps):
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+        self.set_rate(rps)
+
+    def set_rate(self, rps):
         self._min_interval = 1.0 / float(rps) if rps else 0.0
+
+    def acquire(self):
+        if not self._min_interval:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._min_interval
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+def get_rate_limiter(key, rps):
+    with _REGISTRY_LOCK:
+        limiter = _LIMITERS.get(key)
+        if limiter is None:
+            limiter = _LIMITERS[key] = RateLimiter(rps)
+        else:
+            limiter.set_rate(rps)
+        return limiter
+
+
+class CircuitOpenError(requests.RequestException):
+    pass
+
+
+class CircuitBreaker:
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30.0, clock=time.monotonic):
+        self.name = name
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = self.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.rejected = 0
+        self._opened_at = 0.0
+        self.configure(failure_threshold, reset_timeout)
+
+    def configure(self, failure_threshold, reset_timeout):
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_timeout = float(reset_timeout)
+
+    def allow(self):
+        with self._lock:
+            previous = self.state
+            if self.state == self.CLOSED:
+                return True
+            if self._clock() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._opened_at = self._clock()
+                allowed = True
+            else:
+                self.rejected += 1
+                allowed = False
+        self._log_transition(previous)
+        return allowed
+
+    def record_success(self):
+        with self._lock:
+            previous = self.state
+            self.state = self.CLOSED
+            self.failures = 0
+        self._log_transition(previous)
+
+    def record_failure(self):
+        with self._lock:
+            previous = self.state
+            self.failures += 1
+            if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.failure_threshold):
+                self.state = self.OPEN
+                self._opened_at = self._clock()
+                self.trips += 1
+        self._log_transition(previous)
+
+    def _log_transition(self, previous):
+        if previous == self.state:
+            return
+        log_event(
+            _logger,
+            'circuit_breaker_transition',
+            level=logging.WARNING if self.state == self.OPEN else logging.INFO,
+            previous=previous,
+            **self.stats(),
+        )
+
+    def stats(self):
+        with self._lock:
+            return {
+                'name': self.name,
+                'state': self.state,
+                'failures': self.failures,
+                'trips': self.trips,
+                'rejected': self.rejected,
+            }
+
+
+def get_circuit_breaker(base_url, failure_threshold=5, reset_timeout=30.0):
+    with _REGISTRY_LOCK:
+        breaker = _BREAKERS.get(base_url)
+        if breaker is None:
+            breaker = _BREAKERS[base_url] = CircuitBreaker(base_url, failure_threshold, reset_timeout)
+        else:
+            breaker.configure(failure_threshold, reset_timeout)
+        return breaker
+
+
+def circuit_breaker_stats():
+    with _REGISTRY_LOCK:
+        breakers = list(_BREAKERS.values())
+    return [breaker.stats() for breaker in breakers]
+
+
+class HttpClient:
+    def __init__(
+        self,
+        *,
+        rps=3,
+        max_retries=5,
+        backoff_base=0.5,
+        backoff_cap=8.0,
+        timeout=15,
+        limiter=None,
+        deadline=None,
+        failure_threshold=5,
+        reset_timeout=30.0,
+    ):
+        self._rps = rps
+        self._limiter = limiter
+        self.throttle_wait = 0.0
         self._max_retries = int(max_retries)
         self._backoff_base = float(backoff_base)
         self._backoff_cap = float(backoff_cap)
         self._timeout = int(timeout)
-        self._last_call = 0.0
+        self._deadline = float(deadline) if deadline else float(self._timeout * (self._max_retries + 1))
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
 
     def request(self, method, url, *, headers=None, params=None, json=None, data=None):
+        base_url = _base_url(url)
+        session = get_session(base_url)
+        limiter = self._limiter or get_rate_limiter(base_url, self._rps)
+        breaker = get_circuit_breaker(base_url, self._failure_threshold, self._reset_timeout)
+        deadline_at = time.monotonic() + self._deadline if self._deadline else None
         for attempt in range(self._max_retries + 1):
-            self._throttle()
+            if not breaker.allow():
+                raise CircuitOpenError('Circuito abierto para %s' % base_url)
+            self.throttle_wait += limiter.acquire()
             try:
-                resp = requests.request(
+                resp = session.request(
                     method,
                     url,
                     headers=headers,
                     params=params,
                     json=json,
                     data=data,
-                    timeout=self._timeout,
+                    timeout=self._request_timeout(deadline_at),
                 )
             except requests.RequestException as exc:
-                if attempt >= self._max_retries:
+                breaker.record_failure()
+                if attempt >= self._max_retries or not self._sleep(attempt, deadline_at=deadline_at, reason=str(exc)):
                     raise
-                self._sleep(attempt, reason=str(exc))
                 continue
 
+            if resp.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+
             if resp.status_code in _RETRYABLE_STATUS:
-                if attempt >= self._max_retries:
+                if attempt >= self._max_retries or not self._sleep(
+                    attempt,
+                    retry_after=resp.headers.get('Retry-After'),
+                    deadline_at=deadline_at,
+                    reason='HTTP %s' % resp.status_code,
+                ):
                     resp.raise_for_status()
-                self._sleep(attempt, retry_after=resp.headers.get('Retry-After'), reason='HTTP %s' % resp.status_code)
                 continue
 
             resp.raise_for_status()
             return resp
 
-    def _throttle(self):
-        if not self._min_interval:
-            return
-        now = time.monotonic()
-        wait = (self._last_call + self._min_interval) - now
-        if wait > 0:
-            time.sleep(wait)
-        self._last_call = time.monotonic()
+    def _request_timeout(self, deadline_at):
+        if deadline_at is None:
+            return self._timeout
+        return max(0.1, min(self._timeout, deadline_at - time.monotonic()))
 
-    def _sleep(self, attempt, *, retry_after=None, reason=''):
+    def _sleep(self, attempt, *, retry_after=None, deadline_at=None, reason=''):
+        delay = None
         if retry_after:
             try:
-                time.sleep(float(retry_after))
-                _logger.info('Reintentando por Retry-After. intento=%s motivo=%s', attempt + 1, reason)
-                return
+                delay = float(retry_after)
             except ValueError:
                 pass
+        if delay is None:
+            base = min(self._backoff_cap, self._backoff_base * (2 ** attempt))
+            delay = base + random.uniform(0, base * 0.25)
 
-        base = min(self._backoff_cap, self._backoff_base * (2 ** attempt))
-        time.sleep(base + random.uniform(0, base * 0.25))
-        _logger.info('Reintentando después del backoff. intento=%s motivo=%s', attempt + 1, reason)
+        if deadline_at is not None and time.monotonic() + delay >= deadline_at:
+            _logger.info('Sin presupuesto para reintentar. intento=%s motivo=%s', attempt + 1, reason)
+            return False
+        time.sleep(delay)
+        _logger.info('Reintentando después de %.2fs. intento=%s motivo=%s', delay, attempt + 1, reason)
+        return True
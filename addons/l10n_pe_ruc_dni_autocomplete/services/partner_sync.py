@@ -1,15 +1,54 @@
 import json
+import logging
 from datetime import datetime
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
 
-def log_event(logger, event: str, **fields: Any) -> None:
+MAX_FIELD_LENGTH = 1024
+
+
+def dumps(payload: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(payload, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+def truncate_field(value: Any, limit: int = MAX_FIELD_LENGTH) -> Any:
+    if isinstance(value, str):
+        text = value
+    elif isinstance(value, (dict, list, tuple)):
+        text = dumps(value)
+    else:
+        return value
+    if len(text) <= limit:
+        return value
+    return f"{text[:limit]}...<{len(text)} chars>"
+
+
+class LazyJson:
+    __slots__ = ("payload", "limit")
+
+    def __init__(self, payload: dict[str, Any], limit: int = MAX_FIELD_LENGTH) -> None:
+        self.payload = payload
+        self.limit = limit
+
+    def __str__(self) -> str:
+        return dumps({key: truncate_field(value, self.limit) for key, value in self.payload.items()})
+
+
+def log_event(logger, event: str, level: int = logging.INFO, **fields: Any) -> None:
+    if not logger.isEnabledFor(level):
+        return
     payload = {
         "event": event,
         "timestamp": datetime.utcnow().isoformat(),
         **fields,
     }
-    logger.info(json.dumps(payload, ensure_ascii=False, default=str))
+    logger.log(level, "%s", LazyJson(payload))
 
 
 def normalize_text(value: str | None) -> str | None:
@@ -25,10 +64,13 @@ def normalize_email(value: str | None) -> str | None:
     return value.strip().lower() or None
 
 
-def build_external_payload(partner) -> dict[str, Any]:
-    external_id = partner.external_id or f"odoo-{partner.id}"
+def external_key(partner) -> str:
+    return partner.external_id or f"odoo-{partner.id}"
+
+
+def build_external_payload(partner, updated_at: datetime | None = None) -> dict[str, Any]:
     return {
-        "external_id": external_id,
+        "external_id": external_key(partner),
         "name": normalize_text(partner.name),
         "vat": normalize_text(partner.vat),
         "email": normalize_email(partner.email),
@@ -37,17 +79,17 @@ def build_external_payload(partner) -> dict[str, Any]:
         "city": normalize_text(partner.city),
         "country_code": normalize_text(partner.country_id.code if partner.country_id else None),
         "score": partner.external_score,
-        "updated_at": datetime.utcnow().isoformat(),
+        "updated_at": (updated_at or datetime.utcnow()).isoformat(),
     }
 
 
-def reconcile_partner_payload(payload: dict[str, Any]) -> dict[str, Any]:
+def reconcile_partner_payload(payload: dict[str, Any], synced_at: datetime | None = None) -> dict[str, Any]:
     if not payload:
         return {}
     values = {
         "external_id": payload.get("external_id"),
         "external_score": payload.get("score"),
         "external_updated_at": payload.get("updated_at"),
-        "external_last_sync_at": datetime.utcnow(),
+        "external_last_sync_at": synced_at or datetime.utcnow(),
     }
     return {key: value for key, value in values.items() if value is not None}
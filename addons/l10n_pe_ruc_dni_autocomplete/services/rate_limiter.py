@@ -0,0 +1,106 @@
+import logging
+import os
+import re
+import struct
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non POSIX platforms
+    fcntl = None
+
+_logger = logging.getLogger(__name__)
+
+_STATE = struct.Struct('dddq')
+_BUCKETS = {}
+_BUCKETS_LOCK = threading.Lock()
+
+
+class TokenBucket:
+    def __init__(self, name, rate, burst=None, directory=None):
+        safe_name = re.sub(r'[^A-Za-z0-9_.-]', '_', name)
+        self.name = name
+        self._path = os.path.join(directory or tempfile.gettempdir(), 'token-bucket-%s' % safe_name)
+        self._thread_lock = threading.Lock()
+        self.process_wait_seconds = 0.0
+        self.configure(rate, burst)
+
+    def configure(self, rate, burst=None):
+        self.rate = float(rate or 0)
+        self.capacity = float(burst) if burst else max(self.rate, 1.0)
+
+    def _open(self):
+        return os.fdopen(os.open(self._path, os.O_RDWR | os.O_CREAT, 0o600), 'r+b')
+
+    def _locked(self, handle):
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+
+    def _unlocked(self, handle):
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _read(self, handle, now):
+        handle.seek(0)
+        raw = handle.read(_STATE.size)
+        if len(raw) != _STATE.size:
+            return self.capacity, now, 0.0, 0
+        return _STATE.unpack(raw)
+
+    def _write(self, handle, tokens, updated, wait_total, acquired):
+        handle.seek(0)
+        handle.write(_STATE.pack(tokens, updated, wait_total, acquired))
+        handle.flush()
+
+    def _reserve(self):
+        with self._thread_lock, self._open() as handle:
+            self._locked(handle)
+            try:
+                now = time.time()
+                tokens, updated, wait_total, acquired = self._read(handle, now)
+                tokens = min(self.capacity, tokens + max(now - updated, 0.0) * self.rate) - 1.0
+                wait = -tokens / self.rate if tokens < 0 else 0.0
+                self._write(handle, tokens, now, wait_total + wait, acquired + 1)
+            finally:
+                self._unlocked(handle)
+        return wait
+
+    def acquire(self):
+        if not self.rate:
+            return 0.0
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+            self.process_wait_seconds += wait
+            _logger.debug('Throttle %s: espera=%.3fs', self.name, wait)
+        return wait
+
+    def stats(self):
+        with self._thread_lock, self._open() as handle:
+            self._locked(handle)
+            try:
+                now = time.time()
+                tokens, updated, wait_total, acquired = self._read(handle, now)
+            finally:
+                self._unlocked(handle)
+        return {
+            'name': self.name,
+            'rate': self.rate,
+            'burst': self.capacity,
+            'tokens': min(self.capacity, tokens + max(now - updated, 0.0) * self.rate),
+            'acquired_total': acquired,
+            'wait_seconds_total': wait_total,
+            'process_wait_seconds': self.process_wait_seconds,
+        }
+
+
+def get_token_bucket(name, rate, burst=None, directory=None):
+    with _BUCKETS_LOCK:
+        bucket = _BUCKETS.get(name)
+        if bucket is None:
+            bucket = _BUCKETS[name] = TokenBucket(name, rate, burst=burst, directory=directory)
+        else:
+            bucket.configure(rate, burst)
+        return bucket
@@ -0,0 +1,79 @@
+import unicodedata
+from typing import Iterable, NamedTuple
+
+
+class UbigeoMatch(NamedTuple):
+    state_id: int | bool = False
+    city_id: int | bool = False
+    district_id: int | bool = False
+
+
+def normalize_name(value: str | None) -> str:
+    if not value:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', value)
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(stripped.upper().split())
+
+
+def build_ubigeo_index(
+    states: Iterable[dict],
+    cities: Iterable[dict],
+    districts: Iterable[dict],
+) -> dict[str, dict]:
+    index = {
+        'states_by_code': {},
+        'states_by_name': {},
+        'cities_by_code': {},
+        'cities_by_name': {},
+        'districts_by_code': {},
+        'districts_by_name': {},
+    }
+    for state in states:
+        if state.get('code'):
+            index['states_by_code'][state['code']] = state['id']
+        index['states_by_name'].setdefault(normalize_name(state['name']), state['id'])
+
+    city_states = {}
+    for city in cities:
+        state_id = city.get('state_id') or False
+        city_states[city['id']] = state_id
+        if city.get('code'):
+            index['cities_by_code'][city['code']] = UbigeoMatch(state_id, city['id'])
+        index['cities_by_name'].setdefault((state_id, normalize_name(city['name'])), city['id'])
+
+    for district in districts:
+        city_id = district.get('city_id') or False
+        if district.get('code'):
+            index['districts_by_code'][district['code']] = UbigeoMatch(
+                city_states.get(city_id, False),
+                city_id,
+                district['id'],
+            )
+        index['districts_by_name'].setdefault((city_id, normalize_name(district['name'])), district['id'])
+    return index
+
+
+def resolve_ubigeo(
+    index: dict[str, dict],
+    ubigeo: str | None = None,
+    department: str | None = None,
+    province: str | None = None,
+    district: str | None = None,
+) -> UbigeoMatch:
+    code = (ubigeo or '').strip()
+    match = index['districts_by_code'].get(code)
+    if match:
+        return match
+
+    state_id = index['states_by_code'].get(code[:2]) if len(code) >= 2 else None
+    state_id = state_id or index['states_by_name'].get(normalize_name(department), False)
+
+    city = index['cities_by_code'].get(code[:4]) if len(code) >= 4 else None
+    if city and city.state_id == state_id:
+        city_id = city.city_id
+    else:
+        city_id = index['cities_by_name'].get((state_id, normalize_name(province)), False)
+
+    district_id = index['districts_by_name'].get((city_id, normalize_name(district)), False)
+    return UbigeoMatch(state_id, city_id, district_id)
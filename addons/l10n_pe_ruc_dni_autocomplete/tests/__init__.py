@@ -0,0 +1,5 @@
+from . import test_compute_visible_documents
+from . import test_external_sync_outbox
+from . import test_external_score_cron
+from . import test_decolecta_enrich_job
+from . import test_decolecta_negative_cache
@@ -0,0 +1,84 @@
+import logging
+import os
+import time
+
+from odoo.tests import TransactionCase, tagged
+
+_logger = logging.getLogger(__name__)
+
+BENCH_PARTNERS = int(os.environ.get('ODOO_BENCH_PARTNERS', '100000'))
+BENCH_BATCH = 5000
+
+
+def _legacy_compute_visible_documents(partners):
+    for rec in partners:
+        country = partners.env.ref('base.pe')
+        dni = partners.env.ref('l10n_pe.it_DNI')
+        ruc = partners.env.ref('l10n_pe.it_RUC')
+        if not rec.country_id or rec.country_id.id != country.id:
+            rec.is_visible_ruc = False
+            rec.is_visible_dni = False
+
+        if rec.l10n_latam_identification_type_id.id == dni.id:
+            rec.is_visible_dni = True
+            rec.is_visible_ruc = False
+        elif rec.l10n_latam_identification_type_id.id == ruc.id:
+            rec.is_visible_dni = False
+            rec.is_visible_ruc = True
+
+
+class TestComputeVisibleDocuments(TransactionCase):
+
+    def test_visibility_follows_identification_type(self):
+        pe = self.env.ref('base.pe')
+        partners = self.env['res.partner'].create([
+            {'name': 'DNI', 'country_id': pe.id, 'l10n_latam_identification_type_id': self.env.ref('l10n_pe.it_DNI').id},
+            {'name': 'RUC', 'country_id': pe.id, 'l10n_latam_identification_type_id': self.env.ref('l10n_pe.it_RUC').id},
+            {'name': 'VAT', 'country_id': self.env.ref('base.us').id, 'l10n_latam_identification_type_id': self.env.ref('l10n_latam_base.it_vat').id},
+        ])
+        self.assertEqual(partners.mapped('is_visible_dni'), [True, False, False])
+        self.assertEqual(partners.mapped('is_visible_ruc'), [False, True, False])
+
+
+@tagged('-standard', 'benchmark')
+class TestComputeVisibleDocumentsBenchmark(TransactionCase):
+
+    def _create_partners(self):
+        pe = self.env.ref('base.pe')
+        types = [
+            self.env.ref('l10n_pe.it_DNI').id,
+            self.env.ref('l10n_pe.it_RUC').id,
+            self.env.ref('l10n_latam_base.it_vat').id,
+        ]
+        partners = self.env['res.partner']
+        for start in range(0, BENCH_PARTNERS, BENCH_BATCH):
+            partners |= partners.create([
+                {
+                    'name': 'Bench %s' % index,
+                    'country_id': pe.id,
+                    'l10n_latam_identification_type_id': types[index % len(types)],
+                }
+                for index in range(start, min(start + BENCH_BATCH, BENCH_PARTNERS))
+            ])
+        return partners
+
+    def _measure(self, partners, compute):
+        self.env.invalidate_all()
+        partners = partners.browse(partners.ids)
+        fields = [partners._fields['is_visible_dni'], partners._fields['is_visible_ruc']]
+        started = time.perf_counter()
+        with self.env.protecting(fields, partners):
+            compute(partners)
+        return time.perf_counter() - started
+
+    def test_recompute_benchmark(self):
+        partners = self._create_partners()
+        legacy = self._measure(partners, _legacy_compute_visible_documents)
+        current = self._measure(partners, lambda records: records._compute_visible_documents())
+        _logger.info(
+            'compute_visible_documents partners=%s legacy=%.3fs current=%.3fs speedup=%.1fx',
+            len(partners),
+            legacy,
+            current,
+            legacy / current if current else 0.0,
+        )
@@ -0,0 +1,54 @@
+from unittest.mock import patch
+
+from odoo.tests import TransactionCase
+
+from ..models.decolecta_service import DecolectaServiceMixin
+
+
+class TestDecolectaEnrichJob(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        pe = cls.env.ref('base.pe')
+        dni = cls.env.ref('l10n_pe.it_DNI')
+        cls.partners = cls.env['res.partner'].create([
+            {'name': 'Uno', 'vat': '11111111', 'country_id': pe.id, 'l10n_latam_identification_type_id': dni.id},
+            {'name': 'Dos', 'vat': '22222222', 'country_id': pe.id, 'l10n_latam_identification_type_id': dni.id},
+            {'name': 'Tres', 'vat': '33333333', 'country_id': pe.id, 'l10n_latam_identification_type_id': dni.id},
+            {'name': 'Extranjero', 'vat': '44444444', 'country_id': cls.env.ref('base.us').id},
+        ])
+
+    def _fake_lookup_many(self, keys, force_refresh=False, max_workers=4):
+        results = {}
+        for doc_type, number in keys:
+            if number == '22222222':
+                results[(doc_type, number)] = ({}, None)
+            else:
+                results[(doc_type, number)] = ({'document_number': number, 'full_name': 'PERSONA %s' % number}, None)
+        return results
+
+    def test_wizard_only_enqueues(self):
+        wizard = self.env['decolecta.enrich.wizard'].with_context(
+            active_model='res.partner',
+            active_ids=self.partners.ids,
+        ).create({})
+        with patch.object(DecolectaServiceMixin, '_lookup_many') as lookup:
+            action = wizard.action_enrich()
+        lookup.assert_not_called()
+
+        job = self.env['decolecta.enrich.job'].browse(action['res_id'])
+        self.assertEqual(job.state, 'queued')
+        self.assertEqual(job.pending_count, 3)
+        self.assertEqual(job.skipped_count, 1)
+
+    def test_cron_drains_job_in_chunks(self):
+        self.env['ir.config_parameter'].sudo().set_param('decolecta.enrich.chunk_size', '2')
+        job = self.env['decolecta.enrich.job']._enqueue(self.partners)
+        with patch.object(DecolectaServiceMixin, '_lookup_many', self._fake_lookup_many):
+            self.env['decolecta.enrich.job']._cron_process()
+
+        self.assertEqual(job.state, 'done')
+        self.assertEqual((job.done_count, job.failed_count, job.skipped_count, job.pending_count), (2, 1, 1, 0))
+        self.assertEqual(self.partners[0].name, 'PERSONA 11111111')
+        self.assertEqual(self.partners[1].name, 'Dos')
@@ -0,0 +1,32 @@
+from unittest.mock import patch
+
+from odoo.tests import TransactionCase
+
+from ..models.decolecta_service import DecolectaServiceMixin
+from ..services.lookup_cache import lookup_lru
+
+
+class TestDecolectaNegativeCache(TransactionCase):
+
+    def setUp(self):
+        super().setUp()
+        lookup_lru.clear()
+        self.addCleanup(lookup_lru.clear)
+
+    def test_not_found_is_cached_instead_of_rolled_back(self):
+        partner = self.env['res.partner'].create({
+            'name': 'Sin datos',
+            'vat': '99999999',
+            'country_id': self.env.ref('base.pe').id,
+            'l10n_latam_identification_type_id': self.env.ref('l10n_pe.it_DNI').id,
+        })
+        with patch.object(DecolectaServiceMixin, '_fetch_payload', return_value={}) as fetch:
+            action = partner.action_complete_from_decolecta()
+            lookup_lru.clear()
+            partner.action_complete_from_decolecta()
+
+        self.assertEqual(action['params']['type'], 'warning')
+        self.assertEqual(fetch.call_count, 1)
+        entry = self.env['decolecta.lookup.cache'].search([('document_number', '=', '99999999')])
+        self.assertTrue(entry.not_found)
+        self.assertEqual(partner.name, 'Sin datos')
@@ -0,0 +1,50 @@
+from unittest.mock import patch
+
+from odoo.tests import TransactionCase
+
+from ..models.external_sync_service import ExternalSyncService
+
+
+class TestExternalScoreCron(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.partners = cls.env['res.partner'].with_context(external_sync_skip_outbox=True).create([
+            {'name': 'Empresa %s SAC' % index, 'external_id': 'cron-%s' % index}
+            for index in range(3)
+        ])
+
+    def _fake_sync(self, payloads):
+        if any(payload['external_id'] == 'cron-1' for payload in payloads):
+            raise ValueError('boom')
+        return [
+            {
+                'external_id': payload['external_id'],
+                'status': 'updated',
+                'partner': {'external_id': payload['external_id'], 'score': 0.7},
+            }
+            for payload in payloads
+        ]
+
+    def test_failing_batch_is_skipped_and_queued_for_retry(self):
+        with patch.object(ExternalSyncService, 'sync_partners', self._fake_sync):
+            self.env['res.partner']._cron_sync_external_score(batch_size=1)
+
+        self.assertEqual(self.partners.mapped('external_score'), [0.7, 0.0, 0.7])
+        self.assertTrue(self.partners[0].external_last_sync_at)
+        self.assertFalse(self.partners[1].external_last_sync_at)
+        outbox = self.env['external.sync.outbox'].search([])
+        self.assertEqual(outbox.external_id, 'cron-1')
+        self.assertEqual(self.env['ir.config_parameter'].sudo().get_param('external.sync.cron_cursor'), '0')
+
+    def test_stops_after_consecutive_failed_batches(self):
+        self.env['ir.config_parameter'].sudo().set_param('external.api.cron_max_failures', '1')
+        with patch.object(ExternalSyncService, 'sync_partners', self._fake_sync):
+            self.env['res.partner']._cron_sync_external_score(batch_size=1)
+
+        self.assertEqual(self.partners.mapped('external_score'), [0.7, 0.0, 0.0])
+        self.assertEqual(
+            self.env['ir.config_parameter'].sudo().get_param('external.sync.cron_cursor'),
+            str(self.partners[1].id),
+        )
@@ -0,0 +1,132 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from odoo import fields
+from odoo.tests import TransactionCase
+
+from ..models.external_sync_service import ExternalSyncService
+
+
+class TestExternalSyncOutbox(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.outbox = cls.env['external.sync.outbox']
+        cls.partner = cls.env['res.partner'].with_context(external_sync_skip_outbox=True).create({
+            'name': 'Empresa SAC',
+            'external_id': 'ext-1',
+        })
+
+    def test_edits_are_coalesced_per_external_id(self):
+        for index in range(10):
+            self.partner.write({'phone': '99988877%s' % index})
+
+        rows = self.outbox.search([('external_id', '=', 'ext-1')])
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows.revision, 10)
+
+    def test_reconcile_writes_do_not_enqueue(self):
+        self.partner.with_context(external_sync_skip_outbox=True).write({'external_score': 0.5})
+        self.assertFalse(self.outbox.search([('external_id', '=', 'ext-1')]))
+
+    def test_drain_sends_batch_and_keeps_failures_for_retry(self):
+        other = self.env['res.partner'].create({'name': 'Otra SAC'})
+        (self.partner | other).action_sync_to_external()
+
+        def fake_sync(service, payloads):
+            return [{
+                'external_id': 'ext-1',
+                'status': 'updated',
+                'partner': {'external_id': 'ext-1', 'score': 0.9},
+            }]
+
+        with patch.object(ExternalSyncService, 'sync_partners', fake_sync):
+            self.outbox._cron_drain()
+
+        self.assertEqual(self.partner.external_score, 0.9)
+        remaining = self.outbox.search([])
+        self.assertEqual(remaining.external_id, 'odoo-%s' % other.id)
+        self.assertEqual(remaining.attempts, 1)
+        self.assertTrue(remaining.last_error)
+
+    def test_create_enqueues_linked_partners(self):
+        self.env['res.partner'].create([
+            {'name': 'Nueva SAC', 'external_id': 'ext-new'},
+            {'name': 'Sin vínculo SAC'},
+        ])
+        self.assertEqual(self.outbox.search([]).mapped('external_id'), ['ext-new'])
+
+    def test_enqueue_dedupes_shared_external_id(self):
+        twin = self.env['res.partner'].with_context(external_sync_skip_outbox=True).create({
+            'name': 'Empresa SAC (duplicado)',
+            'external_id': 'ext-1',
+        })
+        (self.partner | twin).action_sync_to_external()
+
+        rows = self.outbox.search([('external_id', '=', 'ext-1')])
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows.revision, 1)
+
+    def test_drain_cron_is_triggered_once_per_transaction(self):
+        self.env.cr.flush()
+        triggers = self.env['ir.cron.trigger']
+        before = triggers.search_count([])
+        for index in range(5):
+            self.partner.write({'phone': '99988877%s' % index})
+        self.env.cr.flush()
+        self.assertEqual(triggers.search_count([]) - before, 1)
+
+    def test_drain_keeps_rows_changed_while_sending(self):
+        self.partner.action_sync_to_external()
+
+        def fake_sync(service, payloads):
+            self.partner.write({'phone': '999888777'})
+            return [{
+                'external_id': 'ext-1',
+                'status': 'updated',
+                'partner': {'external_id': 'ext-1', 'score': 0.9},
+            }]
+
+        with patch.object(ExternalSyncService, 'sync_partners', fake_sync):
+            rows, revisions = self.outbox._claim_batch(10)
+            rows._drain_batch(revisions)
+
+        remaining = self.outbox.search([('external_id', '=', 'ext-1')])
+        self.assertEqual(remaining.revision, 2)
+        self.assertEqual(remaining.state, 'pending')
+
+    def test_claim_leases_rows_without_keeping_them_locked(self):
+        self.partner.action_sync_to_external()
+
+        rows, revisions = self.outbox._claim_batch(10)
+        self.assertEqual(rows.state, 'sending')
+        self.assertTrue(rows.claimed_at)
+        self.assertFalse(self.outbox._claim_batch(10)[0])
+
+        self.partner.write({'phone': '999888777'})
+        self.assertEqual(rows.state, 'pending')
+        self.assertEqual(rows.revision, revisions[rows.id] + 1)
+
+    def test_claim_reclaims_expired_leases(self):
+        self.partner.action_sync_to_external()
+        rows, _revisions = self.outbox._claim_batch(10)
+        rows.write({'claimed_at': fields.Datetime.now() - timedelta(hours=1)})
+
+        reclaimed, _revisions = self.outbox._claim_batch(10)
+        self.assertEqual(reclaimed, rows)
+
+    def test_failure_does_not_override_rows_changed_while_sending(self):
+        self.partner.action_sync_to_external()
+
+        def fake_sync(service, payloads):
+            self.partner.write({'phone': '999888777'})
+            raise RuntimeError('timeout')
+
+        with patch.object(ExternalSyncService, 'sync_partners', fake_sync):
+            rows, revisions = self.outbox._claim_batch(10)
+            rows._drain_batch(revisions)
+
+        self.assertEqual(rows.state, 'pending')
+        self.assertEqual(rows.attempts, 0)
+        self.assertFalse(rows.last_error)
@@ -0,0 +1 @@
+from . import decolecta_enrich_wizard
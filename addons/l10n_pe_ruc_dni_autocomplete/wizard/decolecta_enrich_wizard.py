@@ -0,0 +1,41 @@
+from odoo import Command, api, fields, models
+
+
+class DecolectaEnrichWizard(models.TransientModel):
+    _name = 'decolecta.enrich.wizard'
+    _description = 'Autocompletado masivo RUC/DNI'
+
+    partner_ids = fields.Many2many(
+        'res.partner',
+        string='Contactos',
+    )
+    max_workers = fields.Integer(
+        string='Consultas en paralelo',
+        default=4,
+    )
+    force_refresh = fields.Boolean(
+        string='Ignorar caché',
+        default=False,
+    )
+
+    @api.model
+    def default_get(self, fields_list):
+        values = super().default_get(fields_list)
+        if 'partner_ids' in fields_list and self.env.context.get('active_model') == 'res.partner':
+            values['partner_ids'] = [Command.set(self.env.context.get('active_ids') or [])]
+        return values
+
+    def action_enrich(self):
+        self.ensure_one()
+        job = self.env['decolecta.enrich.job']._enqueue(
+            self.partner_ids,
+            force_refresh=self.force_refresh,
+            max_workers=self.max_workers,
+        )
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': job._name,
+            'res_id': job.id,
+            'view_mode': 'form',
+            'target': 'current',
+        }
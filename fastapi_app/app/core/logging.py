@@ -1,25 +1,67 @@
+import atexit
 import json
 import logging
+import queue
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+_listener: Optional[QueueListener] = None
+
+
+def dumps(payload: dict) -> str:
+    if orjson is not None:
+        return orjson.dumps(payload, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(payload, ensure_ascii=False, default=str)
 
 
 class JsonFormatter(logging.Formatter):
+    def __init__(self, max_message_length: int = 4096) -> None:
+        super().__init__()
+        self.max_message_length = max_message_length
+
     def format(self, record: logging.LogRecord) -> str:
+        message = record.getMessage()
+        if self.max_message_length and len(message) > self.max_message_length:
+            message = f"{message[:self.max_message_length]}...<{len(message)} chars>"
         payload = {
             "timestamp": datetime.utcnow().isoformat(),
             "level": record.levelname,
             "logger": record.name,
-            "message": record.getMessage(),
+            "message": message,
         }
         if record.exc_info:
             payload["exc_info"] = self.formatException(record.exc_info)
-        return json.dumps(payload, ensure_ascii=False)
+        return dumps(payload)
 
 
-def configure_logging(level: str = "INFO") -> None:
+def configure_logging(level: str = "INFO", queued: bool = False, max_message_length: int = 4096) -> None:
+    global _listener
+    shutdown_logging()
     handler = logging.StreamHandler()
-    handler.setFormatter(JsonFormatter())
+    handler.setFormatter(JsonFormatter(max_message_length=max_message_length))
     root = logging.getLogger()
     root.handlers = []
     root.setLevel(level)
-    root.addHandler(handler)
+    if queued:
+        records: queue.SimpleQueue = queue.SimpleQueue()
+        _listener = QueueListener(records, handler, respect_handler_level=True)
+        _listener.start()
+        root.addHandler(QueueHandler(records))
+    else:
+        root.addHandler(handler)
+
+
+def shutdown_logging() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
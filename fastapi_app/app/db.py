@@ -1,16 +1,88 @@
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache
+from typing import Optional
 
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from .core.config import get_settings
+from .core.metrics import instrument_engine
 
 
-def get_engine():
+def _engine_options(database_url: str) -> dict:
     settings = get_settings()
-    return create_engine(settings.database_url, echo=False, pool_pre_ping=True)
+    options = {
+        "echo": False,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+    if not database_url.startswith("sqlite"):
+        options["pool_size"] = settings.db_pool_size
+        options["max_overflow"] = settings.db_max_overflow
+        options["pool_timeout"] = settings.db_pool_timeout
+    return options
+
+
+@lru_cache
+def get_engine() -> Engine:
+    settings = get_settings()
+    engine = create_engine(settings.database_url, **_engine_options(settings.database_url))
+    instrument_engine(engine)
+    return engine
+
+
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def get_async_database_url(database_url: str, override: Optional[str] = None) -> str:
+    if override:
+        return override
+    url = make_url(database_url)
+    driver = _ASYNC_DRIVERS.get(url.get_backend_name())
+    if not driver:
+        raise ValueError(f"No async driver configured for {url.get_backend_name()}")
+    return url.set(drivername=driver).render_as_string(hide_password=False)
+
+
+@lru_cache
+def get_async_engine() -> AsyncEngine:
+    settings = get_settings()
+    database_url = get_async_database_url(settings.database_url, settings.async_database_url)
+    engine = create_async_engine(database_url, **_engine_options(database_url))
+    instrument_engine(engine.sync_engine)
+    return engine
+
+
+async def dispose_async_engine() -> None:
+    if get_async_engine.cache_info().currsize:
+        await get_async_engine().dispose()
+    get_async_engine.cache_clear()
+
+
+def dispose_engine() -> None:
+    if get_engine.cache_info().currsize:
+        get_engine().dispose()
+    get_engine.cache_clear()
+
+
+def get_pool_stats() -> dict:
+    pool = get_engine().pool
+    stats = {"pool_class": type(pool).__name__, "status": pool.status()}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            stats[name] = method()
+    return stats
 
 
 def init_db() -> None:
+    from . import models  # noqa: F401
+
     engine = get_engine()
     SQLModel.metadata.create_all(engine)
 
@@ -18,5 +90,11 @@ def init_db() -> None:
 @contextmanager
 def get_session():
     engine = get_engine()
-    with Session(engine) as session:
+    with Session(engine, expire_on_commit=False) as session:
+        yield session
+
+
+@asynccontextmanager
+async def get_async_session():
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
         yield session
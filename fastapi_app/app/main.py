@@ -1,31 +1,81 @@
 import logging
 from datetime import datetime
-from fastapi import Depends, FastAPI, Header, HTTPException, Request, status
-from fastapi.responses import JSONResponse
+from typing import Optional
+
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import ValidationError
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from .core.config import get_settings
 from .core.logging import configure_logging
-from .db import get_session, init_db
-from .models import PartnerCreate, PartnerRead, PartnerUpdate
-from .services.crud import (
-    get_partner_by_external_id,
-    update_partner,
-    upsert_partner,
+from .core.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from .core.metrics import REGISTRY, MetricsMiddleware
+from .db import (
+    dispose_async_engine,
+    dispose_engine,
+    get_async_session,
+    get_pool_stats,
+    get_session,
+    init_db,
+)
+from .models import PartnerCreate, PartnerRead, PartnerUpdate, SyncJob
+from .services import async_crud
+from .services.crud import decode_cursor, encode_cursor
+from .services.etag import etag_matches, format_last_modified, is_not_modified, make_etag
+from .services.odoo_rpc import get_reference_cache, get_sync_target
+from .services.partner_cache import get_partner_cache
+from .services.reconciliation import ConflictError, PreconditionFailedError
+from .services.serialization import FastJSONResponse, dump_partner, partner_to_dict
+from .services.sync_jobs import (
+    describe_job,
+    enqueue_sync_job,
+    resume_sync_jobs,
+    shutdown_executor,
 )
-from .services.odoo_rpc import sync_partners_to_odoo
-from .services.reconciliation import ConflictError
 
 settings = get_settings()
-configure_logging(settings.log_level)
+configure_logging(
+    settings.log_level,
+    queued=settings.log_queued,
+    max_message_length=settings.log_max_message_length,
+)
 _logger = logging.getLogger(__name__)
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def _json_response(content, status_code: int = status.HTTP_200_OK, headers: Optional[dict] = None) -> JSONResponse:
+    if settings.fast_json:
+        return FastJSONResponse(content=content, status_code=status_code, headers=headers)
+    return JSONResponse(content=jsonable_encoder(content), status_code=status_code, headers=headers)
+
+
+def _partner_content(partner):
+    if settings.fast_json:
+        return partner if isinstance(partner, dict) else partner_to_dict(partner)
+    if isinstance(partner, dict):
+        return PartnerRead.parse_obj(partner)
+    return PartnerRead.from_orm(partner)
+
+
 app = FastAPI(title="External Partner API", version="1.0")
+app.add_middleware(MetricsMiddleware)
 
 
 @app.on_event("startup")
 def on_startup() -> None:
     init_db()
+    resume_sync_jobs()
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    shutdown_executor()
+    await dispose_async_engine()
+    dispose_engine()
 
 
 @app.get("/health")
@@ -38,6 +88,11 @@ def get_db() -> Session:
         yield session
 
 
+async def get_async_db() -> AsyncSession:
+    async with get_async_session() as session:
+        yield session
+
+
 def verify_token(authorization: str = Header(default="")) -> None:
     if not authorization.startswith("Bearer "):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing token")
@@ -46,98 +101,279 @@ def verify_token(authorization: str = Header(default="")) -> None:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid token")
 
 
+@app.get("/metrics", dependencies=[Depends(verify_token)])
+def metrics() -> PlainTextResponse:
+    return PlainTextResponse(REGISTRY.render(), media_type=METRICS_CONTENT_TYPE)
+
+
+@app.get("/health/db-pool", dependencies=[Depends(verify_token)])
+def db_pool_stats() -> dict:
+    return get_pool_stats()
+
+
 @app.post("/partners", response_model=PartnerRead, dependencies=[Depends(verify_token)])
-def create_partner_endpoint(payload: PartnerCreate, session: Session = Depends(get_db)):
-    partner = upsert_partner(session, payload)
-    return partner
+async def create_partner_endpoint(payload: PartnerCreate, session: AsyncSession = Depends(get_async_db)):
+    partner = await async_crud.upsert_partner(session, payload)
+    return _json_response(_partner_content(partner))
+
+
+@app.post("/partners/bulk", dependencies=[Depends(verify_token)])
+async def bulk_upsert_partners_endpoint(items: list[dict], session: AsyncSession = Depends(get_async_db)):
+    results = await _bulk_upsert(session, items)
+    summary = {key: 0 for key in ("created", "updated", "conflict", "error")}
+    for result in results:
+        summary[result["status"]] += 1
+    return _json_response({"results": results, **summary})
+
+
+def _decode_cursor_param(cursor: Optional[str]):
+    if not cursor:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+
+async def _stream_partners_ndjson(after, limit: int, filters: dict):
+    async with get_async_session() as session:
+        while True:
+            partners = await async_crud.list_partners(session, limit, after, **filters)
+            for partner in partners:
+                if settings.fast_json:
+                    yield dump_partner(partner) + b"\n"
+                else:
+                    yield PartnerRead.from_orm(partner).json() + "\n"
+            if len(partners) < limit:
+                return
+            after = (partners[-1].updated_at, partners[-1].id)
+            session.expunge_all()
+
+
+@app.get("/partners", dependencies=[Depends(verify_token)])
+async def list_partners_endpoint(
+    request: Request,
+    limit: int = Query(default=100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    updated_since: Optional[datetime] = None,
+    country_code: Optional[str] = None,
+    vat: Optional[str] = None,
+    format: Optional[str] = Query(default=None, regex="^(json|ndjson)$"),
+    session: AsyncSession = Depends(get_async_db),
+):
+    after = _decode_cursor_param(cursor)
+    filters = {"updated_since": updated_since, "country_code": country_code, "vat": vat}
+    if format == "ndjson" or (format is None and NDJSON_MEDIA_TYPE in request.headers.get("accept", "")):
+        return StreamingResponse(_stream_partners_ndjson(after, limit, filters), media_type=NDJSON_MEDIA_TYPE)
+
+    partners = await async_crud.list_partners(session, limit + 1, after, **filters)
+    page = partners[:limit]
+    next_cursor = encode_cursor(page[-1]) if len(partners) > limit else None
+    return _json_response({"items": [_partner_content(partner) for partner in page], "next_cursor": next_cursor})
+
+
+def _version_headers(partner_id: int, version: int, updated_at: datetime) -> dict[str, str]:
+    return {"ETag": make_etag(partner_id, version), "Last-Modified": format_last_modified(updated_at)}
 
 
 @app.get("/partners/{external_id}", response_model=PartnerRead, dependencies=[Depends(verify_token)])
-def get_partner_endpoint(external_id: str, session: Session = Depends(get_db)):
-    partner = get_partner_by_external_id(session, external_id)
+async def get_partner_endpoint(
+    external_id: str,
+    if_none_match: Optional[str] = Header(default=None),
+    if_modified_since: Optional[str] = Header(default=None),
+    session: AsyncSession = Depends(get_async_db),
+):
+    if if_none_match or if_modified_since:
+        version = await async_crud.get_partner_version(session, external_id)
+        if not version:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Partner not found")
+        partner_id, partner_version, updated_at = version
+        if is_not_modified(make_etag(partner_id, partner_version), updated_at, if_none_match, if_modified_since):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers=_version_headers(partner_id, partner_version, updated_at),
+            )
+    partner = await async_crud.get_cached_partner(session, external_id)
     if not partner:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Partner not found")
-    return partner
+    headers = _version_headers(partner["id"], partner["version"], datetime.fromisoformat(partner["updated_at"]))
+    return _json_response(_partner_content(partner), headers=headers)
 
 
 @app.put("/partners/{external_id}", response_model=PartnerRead, dependencies=[Depends(verify_token)])
-def update_partner_endpoint(
+async def update_partner_endpoint(
     external_id: str,
     payload: PartnerUpdate,
-    session: Session = Depends(get_db),
+    if_match: Optional[str] = Header(default=None),
+    session: AsyncSession = Depends(get_async_db),
 ):
-    partner = get_partner_by_external_id(session, external_id)
+    partner = await async_crud.get_partner_by_external_id(session, external_id)
     if not partner:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Partner not found")
-    updated = update_partner(session, partner, payload)
-    return updated
+    if if_match and not etag_matches(if_match, make_etag(partner.id, partner.version)):
+        raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail="Partner was modified")
+    updated = await async_crud.update_partner(
+        session, partner, payload, expected_version=partner.version if if_match else None
+    )
+    if updated is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Partner not found")
+    headers = _version_headers(updated.id, updated.version, updated.updated_at)
+    return _json_response(_partner_content(updated), headers=headers)
 
 
 @app.delete("/partners/{external_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(verify_token)])
-def delete_partner_endpoint(external_id: str, session: Session = Depends(get_db)):
-    partner = get_partner_by_external_id(session, external_id)
+async def delete_partner_endpoint(external_id: str, session: AsyncSession = Depends(get_async_db)):
+    partner = await async_crud.get_partner_by_external_id(session, external_id)
     if not partner:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Partner not found")
-    session.delete(partner)
-    session.commit()
+    await async_crud.delete_partner(session, partner)
 
 
-@app.post("/rpc")
-async def json_rpc(request: Request, session: Session = Depends(get_db)):
-    payload = await request.json()
-    method = payload.get("method")
-    params = payload.get("params", {})
-    request_id = payload.get("id")
+def _rpc_error(code: int, message: str, request_id) -> dict:
+    return {"jsonrpc": "2.0", "error": {"code": code, "message": message}, "id": request_id}
 
-    try:
-        verify_token(request.headers.get("Authorization", ""))
-    except HTTPException as exc:
-        return JSONResponse(
-            status_code=exc.status_code,
-            content={"jsonrpc": "2.0", "error": {"code": exc.status_code, "message": exc.detail}, "id": request_id},
-        )
 
-    if method != "partner.sync":
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content={"jsonrpc": "2.0", "error": {"code": 400, "message": "Unknown method"}, "id": request_id},
-        )
+async def _rpc_sync(session: AsyncSession, params: dict, request_id) -> tuple[int, dict]:
+    try:
+        payload = PartnerCreate(**params)
+    except (TypeError, ValidationError) as exc:
+        return status.HTTP_400_BAD_REQUEST, _rpc_error(400, f"Invalid params: {exc}", request_id)
 
     try:
-        _logger.info("rpc_sync_start external_id=%s", params.get("external_id"))
-        partner = upsert_partner(session, PartnerCreate(**params))
+        _logger.info("rpc_sync_start external_id=%s", payload.external_id)
+        partner = await async_crud.upsert_partner(session, payload)
     except ConflictError as exc:
-        return JSONResponse(
-            status_code=status.HTTP_409_CONFLICT,
-            content={"jsonrpc": "2.0", "error": {"code": 409, "message": str(exc)}, "id": request_id},
-        )
-    except Exception as exc:  # pragma: no cover - safety net
+        return status.HTTP_409_CONFLICT, _rpc_error(409, str(exc), request_id)
+    except Exception as exc:
+        await session.rollback()
         _logger.exception("RPC sync failed")
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content={"jsonrpc": "2.0", "error": {"code": 500, "message": str(exc)}, "id": request_id},
-        )
+        return status.HTTP_500_INTERNAL_SERVER_ERROR, _rpc_error(500, str(exc), request_id)
 
-    return {
+    return status.HTTP_200_OK, {
         "jsonrpc": "2.0",
-        "result": PartnerRead.from_orm(partner).dict(),
+        "result": partner_to_dict(partner),
         "id": request_id,
     }
 
 
-@app.post("/sync/odoo", dependencies=[Depends(verify_token)])
-def sync_partners_to_odoo_endpoint(session: Session = Depends(get_db)):
+async def _bulk_upsert(session: AsyncSession, items: list) -> list[dict]:
+    results: list[Optional[dict]] = [None] * len(items)
+    payloads: list[PartnerCreate] = []
+    positions: list[int] = []
+    for index, item in enumerate(items):
+        external_id = item.get("external_id") if isinstance(item, dict) else None
+        try:
+            payloads.append(PartnerCreate(**item))
+        except (TypeError, ValidationError) as exc:
+            results[index] = {"external_id": external_id, "status": "error", "error": {"code": 400, "message": str(exc)}}
+            continue
+        positions.append(index)
+
+    upserted = await async_crud.upsert_partners(session, payloads)
+    for index, outcome in zip(positions, upserted):
+        entry = {"external_id": outcome.external_id, "status": outcome.status}
+        if outcome.partner is not None:
+            entry["partner"] = partner_to_dict(outcome.partner)
+        if outcome.error:
+            entry["error"] = {"code": 409, "message": outcome.error}
+        results[index] = entry
+    return results
+
+
+async def _rpc_sync_many(session: AsyncSession, params, request_id) -> tuple[int, dict]:
+    items = params.get("partners") if isinstance(params, dict) else params
+    if not isinstance(items, list):
+        return status.HTTP_400_BAD_REQUEST, _rpc_error(400, "Invalid params: expected a list of partners", request_id)
+
+    _logger.info("rpc_sync_many_start items=%s", len(items))
     try:
-        result = sync_partners_to_odoo(session)
-    except Exception as exc:
-        _logger.exception("Bulk sync to Odoo failed")
-        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
-    return {"status": "ok", **result}
+        results = await _bulk_upsert(session, items)
+    except Exception as exc:  # pragma: no cover - safety net
+        await session.rollback()
+        _logger.exception("RPC bulk sync failed")
+        return status.HTTP_500_INTERNAL_SERVER_ERROR, _rpc_error(500, str(exc), request_id)
+
+    return status.HTTP_200_OK, {"jsonrpc": "2.0", "result": results, "id": request_id}
+
+
+_RPC_METHODS = {
+    "partner.sync": _rpc_sync,
+    "partner.sync_many": _rpc_sync_many,
+}
+
+
+async def _dispatch_rpc(session: AsyncSession, call) -> tuple[int, dict]:
+    if not isinstance(call, dict):
+        return status.HTTP_400_BAD_REQUEST, _rpc_error(400, "Invalid request", None)
+    request_id = call.get("id")
+    handler = _RPC_METHODS.get(call.get("method"))
+    if handler is None:
+        return status.HTTP_400_BAD_REQUEST, _rpc_error(400, "Unknown method", request_id)
+    return await handler(session, call.get("params", {}), request_id)
+
+
+@app.post("/rpc")
+async def json_rpc(request: Request, session: AsyncSession = Depends(get_async_db)):
+    payload = await request.json()
+    is_batch = isinstance(payload, list)
+    request_id = None if is_batch else payload.get("id")
+
+    try:
+        verify_token(request.headers.get("Authorization", ""))
+    except HTTPException as exc:
+        return _json_response(_rpc_error(exc.status_code, exc.detail, request_id), status_code=exc.status_code)
+
+    if not is_batch:
+        status_code, body = await _dispatch_rpc(session, payload)
+        return _json_response(body, status_code=status_code)
+
+    if not payload:
+        return _json_response(_rpc_error(400, "Invalid request", None), status_code=status.HTTP_400_BAD_REQUEST)
+    responses = [(await _dispatch_rpc(session, call))[1] for call in payload]
+    return _json_response(responses)
+
+
+@app.post("/sync/odoo", status_code=status.HTTP_202_ACCEPTED, dependencies=[Depends(verify_token)])
+def sync_partners_to_odoo_endpoint(response: Response, full: bool = False, session: Session = Depends(get_db)):
+    job, created = enqueue_sync_job(session, get_sync_target(), full=full)
+    if not created:
+        response.status_code = status.HTTP_200_OK
+    return describe_job(job)
+
+
+@app.get("/sync/odoo/cache", dependencies=[Depends(verify_token)])
+def odoo_reference_cache_stats() -> dict:
+    return get_reference_cache().stats()
+
+
+@app.delete("/sync/odoo/cache", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(verify_token)])
+def invalidate_odoo_reference_cache() -> None:
+    get_reference_cache().invalidate()
+
+
+@app.get("/cache/partners", dependencies=[Depends(verify_token)])
+def partner_cache_stats() -> dict:
+    return get_partner_cache().stats()
+
+
+@app.delete("/cache/partners", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(verify_token)])
+def clear_partner_cache() -> None:
+    get_partner_cache().clear()
+
+
+@app.get("/sync/odoo/{job_id}", dependencies=[Depends(verify_token)])
+def sync_job_status_endpoint(job_id: int, session: Session = Depends(get_db)):
+    job = session.get(SyncJob, job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sync job not found")
+    return describe_job(job)
 
 
 @app.exception_handler(ConflictError)
 def conflict_handler(request: Request, exc: ConflictError):
-    return JSONResponse(
-        status_code=status.HTTP_409_CONFLICT,
-        content={"detail": str(exc)},
-    )
+    return _json_response({"detail": str(exc)}, status_code=status.HTTP_409_CONFLICT)
+
+
+@app.exception_handler(PreconditionFailedError)
+def precondition_failed_handler(request: Request, exc: PreconditionFailedError):
+    return _json_response({"detail": str(exc)}, status_code=status.HTTP_412_PRECONDITION_FAILED)
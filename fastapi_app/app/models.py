@@ -1,11 +1,12 @@
 from datetime import datetime
 from typing import Optional
 
+from sqlalchemy import Index, text
 from sqlmodel import Field, SQLModel
 
 
 class PartnerBase(SQLModel):
-    external_id: str = Field(index=True, nullable=False)
+    external_id: str = Field(index=True, unique=True, nullable=False)
     name: Optional[str] = None
     vat: Optional[str] = None
     identification_type_code: Optional[str] = None
@@ -21,7 +22,13 @@ class PartnerBase(SQLModel):
 
 
 class Partner(PartnerBase, table=True):
+    __table_args__ = (
+        Index("ix_partner_updated_at_id", "updated_at", "id"),
+        Index("ix_partner_external_id_version", "external_id", "updated_at", "id", "version"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
+    version: int = Field(default=1, nullable=False)
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 
@@ -31,6 +38,7 @@ class PartnerCreate(PartnerBase):
 
 class PartnerRead(PartnerBase):
     id: int
+    version: int
     created_at: datetime
 
 
@@ -47,3 +55,44 @@ class PartnerUpdate(SQLModel):
     country_code: Optional[str] = None
     score: Optional[float] = None
     updated_at: Optional[datetime] = None
+
+
+SYNC_JOB_ACTIVE_STATUSES = ("queued", "running")
+
+
+class SyncJob(SQLModel, table=True):
+    __tablename__ = "sync_job"
+    __table_args__ = (
+        Index(
+            "uq_sync_job_active_target",
+            "target",
+            unique=True,
+            postgresql_where=text("status IN ('queued', 'running')"),
+            sqlite_where=text("status IN ('queued', 'running')"),
+        ),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    target: str = Field(index=True, nullable=False)
+    status: str = Field(default="queued", nullable=False)
+    full: bool = False
+    total: int = 0
+    processed: int = 0
+    created: int = 0
+    updated: int = 0
+    failed: int = 0
+    error: Optional[str] = None
+    owner: Optional[str] = None
+    heartbeat_at: Optional[datetime] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class SyncWatermark(SQLModel, table=True):
+    __tablename__ = "sync_watermark"
+
+    target: str = Field(primary_key=True)
+    updated_at: Optional[datetime] = None
+    last_id: int = 0
+    synced_at: Optional[datetime] = None
@@ -0,0 +1,63 @@
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..models import Partner, PartnerCreate, PartnerUpdate
+from . import crud
+from .crud import UpsertResult
+from .partner_cache import get_partner_cache
+
+
+async def get_partner_by_external_id(session: AsyncSession, external_id: str) -> Optional[Partner]:
+    return await session.run_sync(crud.get_partner_by_external_id, external_id)
+
+
+async def get_partner_version(session: AsyncSession, external_id: str) -> Optional[tuple[int, int, datetime]]:
+    return await session.run_sync(crud.get_partner_version, external_id)
+
+
+async def get_cached_partner(session: AsyncSession, external_id: str) -> Optional[dict[str, Any]]:
+    cache = get_partner_cache()
+    cached = cache.get(external_id)
+    if cached is not None:
+        return cached
+    generation = cache.generation(external_id)
+    partner = await get_partner_by_external_id(session, external_id)
+    if partner is None:
+        return None
+    return cache.set(partner, generation=generation)
+
+
+async def list_partners(
+    session: AsyncSession,
+    limit: int,
+    after: Optional[tuple[datetime, int]] = None,
+    updated_since: Optional[datetime] = None,
+    country_code: Optional[str] = None,
+    vat: Optional[str] = None,
+) -> list[Partner]:
+    return await session.run_sync(crud.list_partners, limit, after, updated_since, country_code, vat)
+
+
+async def upsert_partner(session: AsyncSession, payload: PartnerCreate) -> Partner:
+    return await session.run_sync(crud.upsert_partner, payload)
+
+
+async def upsert_partners(session: AsyncSession, payloads: list[PartnerCreate]) -> list[UpsertResult]:
+    return await session.run_sync(crud.upsert_partners, payloads)
+
+
+async def update_partner(
+    session: AsyncSession,
+    partner: Partner,
+    payload: PartnerUpdate,
+    expected_version: Optional[int] = None,
+) -> Optional[Partner]:
+    return await session.run_sync(crud.update_partner, partner, payload, expected_version)
+
+
+async def delete_partner(session: AsyncSession, partner: Partner) -> None:
+    await session.delete(partner)
+    await session.commit()
+    get_partner_cache().invalidate([partner.external_id])
@@ -0,0 +1,98 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    def __init__(self, ttl: float, maxsize: Optional[int] = None, clock: Callable[[], float] = time.monotonic):
+        self._ttl = float(ttl)
+        self._maxsize = maxsize
+        self._clock = clock
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _lookup(self, key: Hashable, now: float) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return _MISSING
+        expires_at, value = entry
+        if expires_at <= now:
+            del self._data[key]
+            self.evictions += 1
+            return _MISSING
+        self._data.move_to_end(key)
+        return value
+
+    def _purge_expired(self, now: float) -> None:
+        while self._data:
+            key, (expires_at, _value) = next(iter(self._data.items()))
+            if expires_at > now:
+                return
+            del self._data[key]
+            self.evictions += 1
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            value = self._lookup(key, self._clock())
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return value
+
+    def get_many(self, keys: Iterable[Hashable]) -> tuple[dict[Hashable, Any], set[Hashable]]:
+        found: dict[Hashable, Any] = {}
+        missing: set[Hashable] = set()
+        with self._lock:
+            now = self._clock()
+            for key in keys:
+                value = self._lookup(key, now)
+                if value is _MISSING:
+                    missing.add(key)
+                else:
+                    found[key] = value
+            self.hits += len(found)
+            self.misses += len(missing)
+        return found, missing
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self.set_many({key: value})
+
+    def set_many(self, values: dict[Hashable, Any]) -> None:
+        with self._lock:
+            now = self._clock()
+            self._purge_expired(now)
+            expires_at = now + self._ttl
+            for key, value in values.items():
+                self._data[key] = (expires_at, value)
+                self._data.move_to_end(key)
+            while self._maxsize is not None and len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self._maxsize,
+                "ttl": self._ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            }
@@ -1,61 +1,286 @@
+import base64
+import binascii
 import logging
+import sqlite3
 from datetime import datetime
-from typing import Optional
+from typing import NamedTuple, Optional
 
+from sqlalchemy import tuple_, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlmodel import Session, select
 
+from ..core.metrics import PARTNER_UPSERTS
 from ..models import Partner, PartnerCreate, PartnerUpdate
-from .normalization import normalize_partner_data
-from .reconciliation import ConflictError, should_accept_update
+from .normalization import normalize_partner_data, normalize_text
+from .partner_cache import get_partner_cache
+from .reconciliation import ConflictError, PreconditionFailedError, should_accept_update
 
 _logger = logging.getLogger(__name__)
 
+_NATIVE_UPSERT_INSERTS = {"postgresql": postgresql_insert}
+if sqlite3.sqlite_version_info >= (3, 35):
+    _NATIVE_UPSERT_INSERTS["sqlite"] = sqlite_insert
+
+_UPSERT_IMMUTABLE_COLUMNS = {"id", "external_id", "created_at", "version"}
+_BULK_UPSERT_CHUNK_SIZE = 500
+
+
+class UpsertResult(NamedTuple):
+    external_id: str
+    status: str
+    partner: Optional[Partner] = None
+    error: Optional[str] = None
+
 
 def get_partner_by_external_id(session: Session, external_id: str) -> Optional[Partner]:
     statement = select(Partner).where(Partner.external_id == external_id)
     return session.exec(statement).first()
 
 
+def get_partner_version(session: Session, external_id: str) -> Optional[tuple[int, int, datetime]]:
+    statement = select(Partner.id, Partner.version, Partner.updated_at).where(Partner.external_id == external_id)
+    row = session.exec(statement).first()
+    return (row[0], row[1], row[2]) if row else None
+
+
+def encode_cursor(partner: Partner) -> str:
+    raw = f"{partner.updated_at.isoformat()}|{partner.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        updated_at, partner_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(updated_at), int(partner_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def list_partners(
+    session: Session,
+    limit: int,
+    after: Optional[tuple[datetime, int]] = None,
+    updated_since: Optional[datetime] = None,
+    country_code: Optional[str] = None,
+    vat: Optional[str] = None,
+) -> list[Partner]:
+    statement = select(Partner).order_by(Partner.updated_at, Partner.id).limit(limit)
+    if after is not None:
+        statement = statement.where(tuple_(Partner.updated_at, Partner.id) > tuple_(*after))
+    if updated_since is not None:
+        statement = statement.where(Partner.updated_at >= updated_since)
+    if country_code:
+        statement = statement.where(Partner.country_code == normalize_text(country_code))
+    if vat:
+        statement = statement.where(Partner.vat == normalize_text(vat))
+    return session.exec(statement).all()
+
+
 def create_partner(session: Session, payload: PartnerCreate) -> Partner:
     normalized = normalize_partner_data(payload.dict())
     partner = Partner(**normalized)
     session.add(partner)
     session.commit()
+    get_partner_cache().invalidate([partner.external_id])
     session.refresh(partner)
     _logger.info("partner_created external_id=%s", partner.external_id)
     return partner
 
 
+def build_upsert_statement(dialect_name: str, values: dict | list[dict]):
+    statement = _NATIVE_UPSERT_INSERTS[dialect_name](Partner).values(values)
+    excluded = statement.excluded
+    return (
+        statement.on_conflict_do_update(
+            index_elements=[Partner.external_id],
+            set_={
+                **{
+                    column.name: excluded[column.name]
+                    for column in Partner.__table__.columns
+                    if column.name not in _UPSERT_IMMUTABLE_COLUMNS
+                },
+                "version": Partner.version + 1,
+            },
+            where=excluded.updated_at >= Partner.updated_at,
+        )
+        .returning(Partner)
+    )
+
+
 def upsert_partner(session: Session, payload: PartnerCreate) -> Partner:
+    dialect_name = session.get_bind().dialect.name
+    if dialect_name not in _NATIVE_UPSERT_INSERTS:
+        return _upsert_partner_fallback(session, payload)
+
+    now = datetime.utcnow()
+    values = normalize_partner_data(payload.dict())
+    values["updated_at"] = values.get("updated_at") or now
+    values["created_at"] = now
+    statement = build_upsert_statement(dialect_name, values)
+    partner = session.scalars(statement, execution_options={"populate_existing": True}).first()
+    session.commit()
+    get_partner_cache().invalidate([payload.external_id])
+    if partner is None:
+        PARTNER_UPSERTS.inc("conflict")
+        raise ConflictError("Incoming update is older than existing record")
+
+    event = "partner_created" if partner.created_at == now else "partner_updated"
+    PARTNER_UPSERTS.inc("created" if partner.created_at == now else "updated")
+    _logger.info("%s external_id=%s", event, partner.external_id)
+    return partner
+
+
+def _upsert_partner_fallback(session: Session, payload: PartnerCreate) -> Partner:
     existing = get_partner_by_external_id(session, payload.external_id)
     if not existing:
+        PARTNER_UPSERTS.inc("created")
         return create_partner(session, payload)
 
     incoming_updated = payload.updated_at
     if not should_accept_update(existing.updated_at, incoming_updated):
+        PARTNER_UPSERTS.inc("conflict")
         raise ConflictError("Incoming update is older than existing record")
 
     update_data = normalize_partner_data(payload.dict())
     for key, value in update_data.items():
         setattr(existing, key, value)
     existing.updated_at = incoming_updated or datetime.utcnow()
+    existing.version += 1
     session.add(existing)
     session.commit()
+    get_partner_cache().invalidate([existing.external_id])
     session.refresh(existing)
+    PARTNER_UPSERTS.inc("updated")
     _logger.info("partner_updated external_id=%s", existing.external_id)
     return existing
 
 
-def update_partner(session: Session, partner: Partner, payload: PartnerUpdate) -> Partner:
+def upsert_partners(session: Session, payloads: list[PartnerCreate]) -> list[UpsertResult]:
+    if not payloads:
+        return []
+    dialect_name = session.get_bind().dialect.name
+    if dialect_name in _NATIVE_UPSERT_INSERTS:
+        results = _upsert_partners_native(session, dialect_name, payloads)
+    else:
+        results = _upsert_partners_fallback(session, payloads)
+
+    get_partner_cache().invalidate(result.external_id for result in results if result.status != "conflict")
+    for result in results:
+        PARTNER_UPSERTS.inc(result.status)
+    _logger.info(
+        "partner_bulk_upsert total=%s created=%s updated=%s conflicts=%s",
+        len(results),
+        sum(1 for result in results if result.status == "created"),
+        sum(1 for result in results if result.status == "updated"),
+        sum(1 for result in results if result.status == "conflict"),
+    )
+    return results
+
+
+def _upsert_partners_native(
+    session: Session, dialect_name: str, payloads: list[PartnerCreate]
+) -> list[UpsertResult]:
+    # ON CONFLICT cannot touch the same row twice in one statement, so repeated
+    # external_ids are applied in successive rounds, preserving payload order.
+    rounds: list[list[int]] = []
+    seen: dict[str, int] = {}
+    for index, payload in enumerate(payloads):
+        round_index = seen.get(payload.external_id, -1) + 1
+        seen[payload.external_id] = round_index
+        if round_index == len(rounds):
+            rounds.append([])
+        rounds[round_index].append(index)
+
+    now = datetime.utcnow()
+    results: list[Optional[UpsertResult]] = [None] * len(payloads)
+    created: set[str] = set()
+    for indexes in rounds:
+        for start in range(0, len(indexes), _BULK_UPSERT_CHUNK_SIZE):
+            chunk = indexes[start:start + _BULK_UPSERT_CHUNK_SIZE]
+            rows = []
+            for index in chunk:
+                values = normalize_partner_data(payloads[index].dict())
+                values["updated_at"] = values.get("updated_at") or now
+                values["created_at"] = now
+                rows.append(values)
+            statement = build_upsert_statement(dialect_name, rows)
+            upserted = session.scalars(statement, execution_options={"populate_existing": True}).all()
+            partners = {partner.external_id: partner for partner in upserted}
+            for index in chunk:
+                external_id = payloads[index].external_id
+                partner = partners.get(external_id)
+                if partner is None:
+                    results[index] = UpsertResult(
+                        external_id, "conflict", error="Incoming update is older than existing record"
+                    )
+                elif partner.created_at == now and external_id not in created:
+                    created.add(external_id)
+                    results[index] = UpsertResult(external_id, "created", partner)
+                else:
+                    results[index] = UpsertResult(external_id, "updated", partner)
+    session.commit()
+    return results
+
+
+def _upsert_partners_fallback(session: Session, payloads: list[PartnerCreate]) -> list[UpsertResult]:
+    external_ids = {payload.external_id for payload in payloads}
+    statement = select(Partner).where(Partner.external_id.in_(external_ids))
+    existing = {partner.external_id: partner for partner in session.exec(statement).all()}
+
+    results = []
+    for payload in payloads:
+        partner = existing.get(payload.external_id)
+        if partner is None:
+            partner = Partner(**normalize_partner_data(payload.dict()))
+            session.add(partner)
+            existing[partner.external_id] = partner
+            results.append(UpsertResult(payload.external_id, "created", partner))
+            continue
+
+        incoming_updated = payload.updated_at
+        if not should_accept_update(partner.updated_at, incoming_updated):
+            results.append(
+                UpsertResult(payload.external_id, "conflict", error="Incoming update is older than existing record")
+            )
+            continue
+
+        for key, value in normalize_partner_data(payload.dict()).items():
+            setattr(partner, key, value)
+        partner.updated_at = incoming_updated or datetime.utcnow()
+        partner.version += 1
+        session.add(partner)
+        results.append(UpsertResult(payload.external_id, "updated", partner))
+
+    session.commit()
+    return results
+
+
+def update_partner(
+    session: Session,
+    partner: Partner,
+    payload: PartnerUpdate,
+    expected_version: Optional[int] = None,
+) -> Optional[Partner]:
     update_data = normalize_partner_data(payload.dict(exclude_unset=True))
     incoming_updated = payload.updated_at
     if incoming_updated and not should_accept_update(partner.updated_at, incoming_updated):
         raise ConflictError("Incoming update is older than existing record")
-    for key, value in update_data.items():
-        setattr(partner, key, value)
-    partner.updated_at = incoming_updated or datetime.utcnow()
-    session.add(partner)
+    update_data["updated_at"] = incoming_updated or datetime.utcnow()
+    update_data["version"] = Partner.version + 1
+    partner_id = partner.id
+    statement = update(Partner).where(Partner.id == partner_id)
+    if expected_version is not None:
+        statement = statement.where(Partner.version == expected_version)
+    result = session.execute(statement.values(**update_data))
+    if result.rowcount == 0:
+        session.rollback()
+        if session.exec(select(Partner.id).where(Partner.id == partner_id)).first() is None:
+            return None
+        raise PreconditionFailedError("Partner was modified")
     session.commit()
+    get_partner_cache().invalidate([partner.external_id])
     session.refresh(partner)
     _logger.info("partner_updated external_id=%s", partner.external_id)
     return partner
@@ -0,0 +1,41 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+
+def make_etag(partner_id: int, version: int) -> str:
+    return f'"{partner_id:x}-{version:x}"'
+
+
+def format_last_modified(updated_at: datetime) -> str:
+    return format_datetime(updated_at.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+
+def _parse_etags(header: str) -> list[str]:
+    return [tag.strip().removeprefix("W/") for tag in header.split(",") if tag.strip()]
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    tags = _parse_etags(header)
+    return "*" in tags or etag in tags
+
+
+def is_not_modified(
+    etag: str,
+    updated_at: datetime,
+    if_none_match: Optional[str] = None,
+    if_modified_since: Optional[str] = None,
+) -> bool:
+    if if_none_match:
+        return etag_matches(if_none_match, etag)
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return updated_at.replace(tzinfo=timezone.utc, microsecond=0) <= since
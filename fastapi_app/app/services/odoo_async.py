@@ -0,0 +1,280 @@
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Optional
+
+import httpx
+from sqlmodel import Session
+
+from ..core.config import get_settings
+from ..core.metrics import ODOO_SYNC_PHASE
+from .cache import TTLCache
+from .odoo_rpc import (
+    OdooReferenceCache,
+    _build_jsonrpc_request,
+    _build_partner_payload,
+    _parse_jsonrpc_response,
+    _partner_codes,
+    get_reference_cache,
+    get_sync_target,
+    get_sync_window,
+    iter_partner_chunks,
+    normalize_code,
+)
+from .watermarks import advance_watermark
+
+_logger = logging.getLogger(__name__)
+
+
+async def _timed(phase: str, awaitable):
+    with ODOO_SYNC_PHASE.time(phase):
+        return await awaitable
+
+
+async def _jsonrpc_call_async(
+    client: httpx.AsyncClient,
+    url: str,
+    service: str,
+    method: str,
+    args: list[Any],
+    request_id: str,
+) -> Any:
+    response = await client.post(url, json=_build_jsonrpc_request(service, method, args, request_id))
+    response.raise_for_status()
+    return _parse_jsonrpc_response(response.json())
+
+
+class _OdooAsyncRpc:
+    def __init__(self, client: httpx.AsyncClient, url: str, db: str, password: str, concurrency: int):
+        self._client = client
+        self._url = url
+        self._db = db
+        self._password = password
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self.uid: Optional[int] = None
+
+    async def call(self, service: str, method: str, args: list[Any], request_id: str) -> Any:
+        async with self._semaphore:
+            return await _jsonrpc_call_async(self._client, self._url, service, method, args, request_id)
+
+    async def authenticate(self, username: str) -> int:
+        login = self.call("common", "login", [self._db, username, self._password], request_id="auth")
+        uid = await _timed("auth", login)
+        if not uid:
+            raise RuntimeError("No se pudo autenticar contra Odoo.")
+        self.uid = uid
+        return uid
+
+    async def execute_kw(self, model: str, method: str, args: list[Any], kwargs: Optional[dict] = None, *, request_id: str) -> Any:
+        call_args = [self._db, self.uid, self._password, model, method, args]
+        if kwargs is not None:
+            call_args.append(kwargs)
+        return await self.call("object", "execute_kw", call_args, request_id=request_id)
+
+    async def resolve_codes(
+        self, references: OdooReferenceCache, cache: TTLCache, target: str, model: str, codes: set[str]
+    ) -> dict[str, int]:
+        codes = {normalize_code(code) for code in codes} - {None}
+        mapping, missing = references.lookup(cache, target, codes)
+        if not missing:
+            return mapping
+        records = await _timed(
+            "reference_lookup",
+            self.execute_kw(
+                model,
+                "search_read",
+                [[["code", "in", sorted(missing)]]],
+                {"fields": ["code", "id"]},
+                request_id=model,
+            ),
+        )
+        resolved = {normalize_code(record["code"]): record["id"] for record in records or []}
+        references.store(cache, target, missing, resolved)
+        mapping.update(resolved)
+        return mapping
+
+
+async def _sync_chunk_async(
+    rpc: _OdooAsyncRpc,
+    index: int,
+    payloads: list[dict[str, Any]],
+) -> dict[str, Any]:
+    started = time.perf_counter()
+    external_ids = [payload["external_id"] for payload in payloads]
+    existing = await _timed(
+        "search_read",
+        rpc.execute_kw(
+            "res.partner",
+            "search_read",
+            [[["external_id", "in", external_ids]]],
+            {"fields": ["id", "external_id"]},
+            request_id=f"existing-{index}",
+        ),
+    )
+    existing_map = {record["external_id"]: record["id"] for record in existing or []}
+
+    to_create = [payload for payload in payloads if payload["external_id"] not in existing_map]
+    to_write = [payload for payload in payloads if payload["external_id"] in existing_map]
+    calls = [
+        _timed(
+            "write",
+            rpc.execute_kw(
+                "res.partner",
+                "write",
+                [[existing_map[payload["external_id"]]], payload],
+                request_id=f"write-{payload['external_id']}",
+            ),
+        )
+        for payload in to_write
+    ]
+    if to_create:
+        calls.append(_timed("create", rpc.execute_kw("res.partner", "create", [to_create], request_id=f"create-{index}")))
+    results = await asyncio.gather(*calls, return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException) and not isinstance(result, Exception):
+            raise result
+
+    errors = {
+        payload["external_id"]: str(result)
+        for payload, result in zip(to_write, results)
+        if isinstance(result, Exception)
+    }
+    created = len(to_create)
+    if to_create and isinstance(results[-1], Exception):
+        errors.update({payload["external_id"]: str(results[-1]) for payload in to_create})
+        created = 0
+    return {
+        "chunk": index,
+        "size": len(payloads),
+        "created": created,
+        "updated": len(to_write) - sum(1 for payload in to_write if payload["external_id"] in errors),
+        "failed": len(errors),
+        "errors": [{"external_id": external_id, "error": error} for external_id, error in errors.items()],
+        "seconds": round(time.perf_counter() - started, 4),
+    }
+
+
+async def _run_chunk(
+    rpc: _OdooAsyncRpc,
+    index: int,
+    payloads: list[dict[str, Any]],
+    continue_on_error: bool,
+) -> dict[str, Any]:
+    started = time.perf_counter()
+    try:
+        timing = await _sync_chunk_async(rpc, index, payloads)
+    except Exception as exc:
+        if not continue_on_error:
+            raise
+        _logger.warning("odoo_async_sync chunk_failed chunk=%s error=%s", index, exc)
+        return {
+            "chunk": index,
+            "size": len(payloads),
+            "created": 0,
+            "updated": 0,
+            "failed": len(payloads),
+            "errors": [{"external_id": payload["external_id"], "error": str(exc)} for payload in payloads],
+            "seconds": round(time.perf_counter() - started, 4),
+            "error": str(exc),
+        }
+    if timing["failed"] and not continue_on_error:
+        raise RuntimeError(timing["errors"][0]["error"])
+    if timing["failed"]:
+        _logger.warning("odoo_async_sync items_failed chunk=%s failed=%s", index, timing["failed"])
+    return timing
+
+
+async def async_sync_partners_to_odoo(
+    session: Session,
+    chunk_size: Optional[int] = None,
+    concurrency: Optional[int] = None,
+    on_chunk: Optional[Callable[[dict[str, Any]], None]] = None,
+    continue_on_error: bool = False,
+    full: bool = False,
+    target: Optional[str] = None,
+) -> dict[str, Any]:
+    settings = get_settings()
+    chunk_size = chunk_size or settings.odoo_sync_chunk_size
+    target = target or get_sync_target()
+    since, until = await asyncio.to_thread(get_sync_window, session, target, full)
+    concurrency = concurrency or settings.odoo_sync_concurrency
+    url = f"{settings.odoo_url.rstrip('/')}/jsonrpc"
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    references = get_reference_cache()
+    pending: set[asyncio.Task] = set()
+    timings: list[dict[str, Any]] = []
+    chunk_index = 0
+    total = 0
+
+    def collect(results) -> None:
+        for timing in results:
+            timings.append(timing)
+            if on_chunk is not None:
+                on_chunk(timing)
+
+    async with httpx.AsyncClient(timeout=settings.odoo_timeout, limits=limits, http2=settings.odoo_http2) as client:
+        rpc = _OdooAsyncRpc(client, url, settings.odoo_db, settings.odoo_password, concurrency)
+        chunks = iter_partner_chunks(session, chunk_size, since, until)
+        try:
+            while True:
+                partners = await asyncio.to_thread(next, chunks, None)
+                if partners is None:
+                    break
+                if rpc.uid is None:
+                    rpc.uid = references.uids.get((target, settings.odoo_username))
+                if rpc.uid is None:
+                    references.uids.set((target, settings.odoo_username), await rpc.authenticate(settings.odoo_username))
+
+                country_codes, identification_codes = _partner_codes(partners)
+                country_map, identification_type_map = await asyncio.gather(
+                    rpc.resolve_codes(references, references.countries, target, "res.country", country_codes),
+                    rpc.resolve_codes(
+                        references,
+                        references.identification_types,
+                        target,
+                        "l10n_latam.identification.type",
+                        identification_codes,
+                    ),
+                )
+
+                payloads = [
+                    _build_partner_payload(partner, country_map, identification_type_map) for partner in partners
+                ]
+                total += len(payloads)
+                pending.add(asyncio.create_task(_run_chunk(rpc, chunk_index, payloads, continue_on_error)))
+                chunk_index += 1
+                if len(pending) >= concurrency:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    collect(task.result() for task in done)
+            if pending:
+                collect(await asyncio.gather(*pending))
+        except BaseException:
+            for task in pending:
+                task.cancel()
+            raise
+        finally:
+            chunks.close()
+
+    timings.sort(key=lambda timing: timing["chunk"])
+    created = sum(timing["created"] for timing in timings)
+    updated = sum(timing["updated"] for timing in timings)
+    failed = sum(timing["failed"] for timing in timings)
+    if until is not None and not failed:
+        await asyncio.to_thread(advance_watermark, session, target, until)
+    _logger.info(
+        "odoo_async_sync completed created=%s updated=%s failed=%s chunks=%s full=%s",
+        created,
+        updated,
+        failed,
+        len(timings),
+        full,
+    )
+    return {
+        "created": created,
+        "updated": updated,
+        "failed": failed,
+        "total": total,
+        "mode": "full" if full else "incremental",
+        "chunks": timings,
+    }
@@ -1,25 +1,60 @@
 import logging
 from datetime import datetime
-from typing import Any
+from functools import lru_cache
+from typing import Any, Iterator, Optional
 
 import httpx
+from sqlalchemy import tuple_
 from sqlmodel import Session, select
 
 from ..core.config import get_settings
+from ..core.metrics import ODOO_SYNC_PHASE
 from ..models import Partner
+from .cache import TTLCache
+from .watermarks import PartnerKey, advance_watermark, get_watermark, latest_partner_key
 
 _logger = logging.getLogger(__name__)
 
 
-def _jsonrpc_call(
-    client: httpx.Client,
-    url: str,
-    service: str,
-    method: str,
-    args: list[Any],
-    request_id: str,
-) -> Any:
-    payload = {
+class OdooReferenceCache:
+    def __init__(self, ttl: float):
+        self.uids = TTLCache(ttl)
+        self.countries = TTLCache(ttl)
+        self.identification_types = TTLCache(ttl)
+
+    def lookup(self, cache: TTLCache, target: str, codes: set[str]) -> tuple[dict[str, int], set[str]]:
+        found, missing = cache.get_many((target, code) for code in codes)
+        resolved = {key[1]: value for key, value in found.items() if value is not None}
+        return resolved, {key[1] for key in missing}
+
+    def store(self, cache: TTLCache, target: str, codes: set[str], resolved: dict[str, int]) -> None:
+        cache.set_many({(target, code): resolved.get(code) for code in codes})
+
+    def invalidate(self) -> None:
+        for cache in (self.uids, self.countries, self.identification_types):
+            cache.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "uid": self.uids.stats(),
+            "countries": self.countries.stats(),
+            "identification_types": self.identification_types.stats(),
+        }
+
+
+@lru_cache
+def get_reference_cache() -> OdooReferenceCache:
+    return OdooReferenceCache(get_settings().odoo_reference_cache_ttl)
+
+
+def normalize_code(code: Optional[str]) -> Optional[str]:
+    if not code:
+        return None
+    return code.strip().upper() or None
+
+
+def _build_jsonrpc_request(service: str, method: str, args: list[Any], request_id: str) -> dict[str, Any]:
+    return {
         "jsonrpc": "2.0",
         "method": "call",
         "params": {
@@ -29,14 +64,27 @@ def _jsonrpc_call(
         },
         "id": request_id,
     }
-    response = client.post(url, json=payload)
-    response.raise_for_status()
-    body = response.json()
+
+
+def _parse_jsonrpc_response(body: dict[str, Any]) -> Any:
     if "error" in body:
         raise RuntimeError(body["error"].get("message", "Unknown JSON-RPC error"))
     return body.get("result")
 
 
+def _jsonrpc_call(
+    client: httpx.Client,
+    url: str,
+    service: str,
+    method: str,
+    args: list[Any],
+    request_id: str,
+) -> Any:
+    response = client.post(url, json=_build_jsonrpc_request(service, method, args, request_id))
+    response.raise_for_status()
+    return _parse_jsonrpc_response(response.json())
+
+
 def _authenticate(client: httpx.Client, url: str, db: str, username: str, password: str) -> int:
     uid = _jsonrpc_call(
         client,
@@ -70,7 +118,7 @@ def _resolve_country_ids(client: httpx.Client, url: str, db: str, uid: int, pass
         ],
         request_id="countries",
     )
-    return {record["code"]: record["id"] for record in records or []}
+    return {normalize_code(record["code"]): record["id"] for record in records or []}
 
 
 def _resolve_identification_type_ids(
@@ -78,7 +126,7 @@ def _resolve_identification_type_ids(
 ) -> dict[str, int]:
     if not codes:
         return {}
-    normalized_codes = {code.strip().upper() for code in codes if code}
+    normalized_codes = {normalize_code(code) for code in codes if normalize_code(code)}
     records = _jsonrpc_call(
         client,
         url,
@@ -95,7 +143,13 @@ def _resolve_identification_type_ids(
         ],
         request_id="identification-types",
     )
-    return {record["code"].upper(): record["id"] for record in records or []}
+    return {normalize_code(record["code"]): record["id"] for record in records or []}
+
+
+def _partner_codes(partners: list[Partner]) -> tuple[set[str], set[str]]:
+    country_codes = {normalize_code(partner.country_code) for partner in partners} - {None}
+    identification_codes = {normalize_code(partner.identification_type_code) for partner in partners} - {None}
+    return country_codes, identification_codes
 
 
 def _build_partner_payload(
@@ -117,41 +171,70 @@ def _build_partner_payload(
         "external_updated_at": partner.updated_at.isoformat() if partner.updated_at else None,
         "external_last_sync_at": datetime.utcnow().isoformat(),
     }
-    if partner.country_code and partner.country_code in country_map:
-        values["country_id"] = country_map[partner.country_code]
-    if partner.identification_type_code:
-        identification_code = partner.identification_type_code.strip().upper()
-        if identification_code in identification_type_map:
-            values["l10n_latam_identification_type_id"] = identification_type_map[identification_code]
+    country_code = normalize_code(partner.country_code)
+    if country_code in country_map:
+        values["country_id"] = country_map[country_code]
+    identification_code = normalize_code(partner.identification_type_code)
+    if identification_code in identification_type_map:
+        values["l10n_latam_identification_type_id"] = identification_type_map[identification_code]
     return {key: value for key, value in values.items() if value is not None}
 
 
-def sync_partners_to_odoo(session: Session) -> dict[str, int]:
+def get_sync_target() -> str:
     settings = get_settings()
-    partners = session.exec(select(Partner)).all()
-    if not partners:
-        return {"created": 0, "updated": 0, "total": 0}
+    return f"odoo:{settings.odoo_url.rstrip('/')}/{settings.odoo_db}"
 
-    url = f"{settings.odoo_url.rstrip('/')}/jsonrpc"
-    with httpx.Client(timeout=settings.odoo_timeout) as client:
-        uid = _authenticate(client, url, settings.odoo_db, settings.odoo_username, settings.odoo_password)
-        country_codes = {partner.country_code for partner in partners if partner.country_code}
-        country_map = _resolve_country_ids(client, url, settings.odoo_db, uid, settings.odoo_password, country_codes)
-        identification_codes = {partner.identification_type_code for partner in partners if partner.identification_type_code}
-        identification_type_map = _resolve_identification_type_ids(
-            client, url, settings.odoo_db, uid, settings.odoo_password, identification_codes
-        )
 
-        external_ids = [partner.external_id for partner in partners]
+def get_sync_window(
+    session: Session, target: str, full: bool = False
+) -> tuple[Optional[PartnerKey], Optional[PartnerKey]]:
+    since = None if full else get_watermark(session, target)
+    return since, latest_partner_key(session)
+
+
+def iter_partner_chunks(
+    session: Session,
+    chunk_size: int,
+    since: Optional[PartnerKey] = None,
+    until: Optional[PartnerKey] = None,
+) -> Iterator[list[Partner]]:
+    key = tuple_(Partner.updated_at, Partner.id)
+    last_key = since
+    while True:
+        statement = select(Partner).order_by(Partner.updated_at, Partner.id).limit(chunk_size)
+        if last_key is not None:
+            statement = statement.where(key > tuple_(*last_key))
+        if until is not None:
+            statement = statement.where(key <= tuple_(*until))
+        chunk = session.exec(statement).all()
+        if not chunk:
+            return
+        yield chunk
+        last_key = (chunk[-1].updated_at, chunk[-1].id)
+        session.expunge_all()
+
+
+def _sync_chunk(
+    client: httpx.Client,
+    url: str,
+    db: str,
+    uid: int,
+    password: str,
+    partners: list[Partner],
+    country_map: dict[str, int],
+    identification_type_map: dict[str, int],
+) -> tuple[int, int]:
+    external_ids = [partner.external_id for partner in partners]
+    with ODOO_SYNC_PHASE.time("search_read"):
         existing = _jsonrpc_call(
             client,
             url,
             "object",
             "execute_kw",
             [
-                settings.odoo_db,
+                db,
                 uid,
-                settings.odoo_password,
+                password,
                 "res.partner",
                 "search_read",
                 [[["external_id", "in", external_ids]]],
@@ -159,47 +242,90 @@ def sync_partners_to_odoo(session: Session) -> dict[str, int]:
             ],
             request_id="existing",
         )
-        existing_map = {record["external_id"]: record["id"] for record in existing or []}
-
-        created = 0
-        updated = 0
-        for partner in partners:
-            payload = _build_partner_payload(partner, country_map, identification_type_map)
-            existing_id = existing_map.get(partner.external_id)
-            if existing_id:
-                _jsonrpc_call(
-                    client,
-                    url,
-                    "object",
-                    "execute_kw",
-                    [
-                        settings.odoo_db,
-                        uid,
-                        settings.odoo_password,
-                        "res.partner",
-                        "write",
-                        [[existing_id], payload],
-                    ],
-                    request_id=f"write-{partner.external_id}",
-                )
-                updated += 1
-            else:
-                _jsonrpc_call(
-                    client,
-                    url,
-                    "object",
-                    "execute_kw",
-                    [
-                        settings.odoo_db,
-                        uid,
-                        settings.odoo_password,
-                        "res.partner",
-                        "create",
-                        [[payload]],
-                    ],
-                    request_id=f"create-{partner.external_id}",
+    existing_map = {record["external_id"]: record["id"] for record in existing or []}
+
+    to_create = []
+    updated = 0
+    for partner in partners:
+        payload = _build_partner_payload(partner, country_map, identification_type_map)
+        existing_id = existing_map.get(partner.external_id)
+        if not existing_id:
+            to_create.append(payload)
+            continue
+        with ODOO_SYNC_PHASE.time("write"):
+            _jsonrpc_call(
+                client,
+                url,
+                "object",
+                "execute_kw",
+                [db, uid, password, "res.partner", "write", [[existing_id], payload]],
+                request_id=f"write-{partner.external_id}",
+            )
+        updated += 1
+
+    if to_create:
+        with ODOO_SYNC_PHASE.time("create"):
+            _jsonrpc_call(
+                client,
+                url,
+                "object",
+                "execute_kw",
+                [db, uid, password, "res.partner", "create", [to_create]],
+                request_id=f"create-{partners[0].external_id}",
+            )
+    return len(to_create), updated
+
+
+def sync_partners_to_odoo(
+    session: Session,
+    chunk_size: Optional[int] = None,
+    full: bool = False,
+    target: Optional[str] = None,
+) -> dict[str, Any]:
+    settings = get_settings()
+    chunk_size = chunk_size or settings.odoo_sync_chunk_size
+    target = target or get_sync_target()
+    since, until = get_sync_window(session, target, full)
+    url = f"{settings.odoo_url.rstrip('/')}/jsonrpc"
+    db, password = settings.odoo_db, settings.odoo_password
+
+    created = 0
+    updated = 0
+    total = 0
+    uid = None
+    references = get_reference_cache()
+    with httpx.Client(timeout=settings.odoo_timeout) as client:
+        for partners in iter_partner_chunks(session, chunk_size, since, until):
+            if uid is None:
+                uid = references.uids.get((target, settings.odoo_username))
+            if uid is None:
+                with ODOO_SYNC_PHASE.time("auth"):
+                    uid = _authenticate(client, url, db, settings.odoo_username, password)
+                references.uids.set((target, settings.odoo_username), uid)
+
+            country_codes, identification_codes = _partner_codes(partners)
+            with ODOO_SYNC_PHASE.time("reference_lookup"):
+                country_map, missing = references.lookup(references.countries, target, country_codes)
+                if missing:
+                    resolved = _resolve_country_ids(client, url, db, uid, password, missing)
+                    references.store(references.countries, target, missing, resolved)
+                    country_map.update(resolved)
+                identification_type_map, missing = references.lookup(
+                    references.identification_types, target, identification_codes
                 )
-                created += 1
+                if missing:
+                    resolved = _resolve_identification_type_ids(client, url, db, uid, password, missing)
+                    references.store(references.identification_types, target, missing, resolved)
+                    identification_type_map.update(resolved)
+
+            chunk_created, chunk_updated = _sync_chunk(
+                client, url, db, uid, password, partners, country_map, identification_type_map
+            )
+            created += chunk_created
+            updated += chunk_updated
+            total += len(partners)
 
-    _logger.info("odoo_bulk_sync completed created=%s updated=%s", created, updated)
-    return {"created": created, "updated": updated, "total": len(partners)}
+    if until is not None:
+        advance_watermark(session, target, until)
+    _logger.info("odoo_bulk_sync completed created=%s updated=%s full=%s", created, updated, full)
+    return {"created": created, "updated": updated, "total": total, "mode": "full" if full else "incremental"}
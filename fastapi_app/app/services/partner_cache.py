@@ -0,0 +1,258 @@
+import json
+import logging
+import threading
+import time
+import uuid
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Optional, Protocol
+
+from ..core.config import get_settings
+from ..models import Partner, PartnerRead
+from .cache import TTLCache
+
+_logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "partner:v2:"
+_GENERATION_PREFIX = "partner-gen:"
+_EPOCH_KEY = "partner-cache:epoch"
+
+
+class CacheBackend(Protocol):
+    def get(self, key: str) -> Optional[str]:
+        ...
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        ...
+
+    def delete(self, *keys: str) -> None:
+        ...
+
+    def incr(self, key: str, ttl: Optional[float] = None) -> int:
+        ...
+
+    def incr_many(self, keys: Iterable[str], ttl: Optional[float] = None) -> None:
+        ...
+
+
+class InMemoryBackend:
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._data: dict[str, tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= self._clock():
+                del self._data[key]
+                return None
+            return entry[1]
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        with self._lock:
+            self._data[key] = (self._clock() + ttl, value)
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def incr(self, key: str, ttl: Optional[float] = None) -> int:
+        with self._lock:
+            entry = self._data.get(key)
+            current = int(entry[1]) if entry is not None and entry[0] > self._clock() else 0
+            expires_at = self._clock() + ttl if ttl is not None else float("inf")
+            self._data[key] = (expires_at, str(current + 1))
+            return current + 1
+
+    def incr_many(self, keys: Iterable[str], ttl: Optional[float] = None) -> None:
+        for key in keys:
+            self.incr(key, ttl)
+
+
+class RedisBackend:
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError as exc:
+            raise ValueError("The redis package is required for a redis:// partner cache backend") from exc
+        self._client = redis.Redis.from_url(url, decode_responses=True)
+
+    def get(self, key: str) -> Optional[str]:
+        return self._client.get(key)
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        self._client.set(key, value, px=int(ttl * 1000))
+
+    def delete(self, *keys: str) -> None:
+        if keys:
+            self._client.delete(*keys)
+
+    def incr(self, key: str, ttl: Optional[float] = None) -> int:
+        pipeline = self._client.pipeline()
+        pipeline.incr(key)
+        if ttl is not None:
+            pipeline.pexpire(key, int(ttl * 1000))
+        return pipeline.execute()[0]
+
+    def incr_many(self, keys: Iterable[str], ttl: Optional[float] = None) -> None:
+        pipeline = self._client.pipeline(transaction=False)
+        for key in keys:
+            pipeline.incr(key)
+            if ttl is not None:
+                pipeline.pexpire(key, int(ttl * 1000))
+        pipeline.execute()
+
+
+class PartnerCache:
+    def __init__(
+        self,
+        ttl: float,
+        maxsize: Optional[int] = None,
+        backend: Optional[CacheBackend] = None,
+        local_ttl: Optional[float] = None,
+    ):
+        self._ttl = float(ttl)
+        if backend is not None and local_ttl is not None:
+            local_ttl = min(float(local_ttl), self._ttl)
+        else:
+            local_ttl = self._ttl
+        self._local = TTLCache(local_ttl, maxsize=maxsize)
+        self._generation_ttl = max(self._ttl, 60.0)
+        self._generations = TTLCache(self._generation_ttl, maxsize=maxsize or 10000)
+        self._backend = backend
+        self._epoch = 0
+        self._invalidations = 0
+        self._lock = threading.Lock()
+        self.backend_hits = 0
+        self.backend_misses = 0
+        self.backend_errors = 0
+
+    def get(self, external_id: str) -> Optional[dict[str, Any]]:
+        value = self._local.get(external_id)
+        if value is not None or self._backend is None:
+            return value
+        try:
+            raw = self._backend.get(self._value_key(self._backend_epoch(), external_id))
+        except Exception:
+            self._count("backend_errors")
+            _logger.warning("Partner cache backend read failed", exc_info=True)
+            return None
+        if raw is None:
+            self._count("backend_misses")
+            return None
+        self._count("backend_hits")
+        value = json.loads(raw)
+        self._local.set(external_id, value)
+        return value
+
+    def generation(self, external_id: str) -> str:
+        if self._backend is None:
+            with self._lock:
+                return self._local_generation(external_id)
+        try:
+            return f"{self._backend_epoch()}:{self._backend.get(_GENERATION_PREFIX + external_id) or 0}"
+        except Exception:
+            self._count("backend_errors")
+            _logger.warning("Partner cache backend read failed", exc_info=True)
+            return uuid.uuid4().hex
+
+    def set(self, partner: Partner, generation: Optional[str] = None) -> dict[str, Any]:
+        value = json.loads(PartnerRead.from_orm(partner).json())
+        if self._backend is None:
+            with self._lock:
+                if generation is None or generation == self._local_generation(partner.external_id):
+                    self._local.set(partner.external_id, value)
+            return value
+        if generation is not None and self.generation(partner.external_id) != generation:
+            return value
+        self._local.set(partner.external_id, value)
+        try:
+            key = self._value_key(self._backend_epoch(), partner.external_id)
+            self._backend.set(key, json.dumps(value), self._ttl)
+        except Exception:
+            self._count("backend_errors")
+            _logger.warning("Partner cache backend write failed", exc_info=True)
+        return value
+
+    def invalidate(self, external_ids: Iterable[str]) -> None:
+        keys = [external_id for external_id in external_ids if external_id]
+        if not keys:
+            return
+        if self._backend is None:
+            with self._lock:
+                self._invalidations += 1
+                self._generations.set_many(dict.fromkeys(keys, self._invalidations))
+                for external_id in keys:
+                    self._local.invalidate(external_id)
+            return
+        for external_id in keys:
+            self._local.invalidate(external_id)
+        try:
+            epoch = self._backend_epoch()
+            self._backend.incr_many((_GENERATION_PREFIX + external_id for external_id in keys), self._generation_ttl)
+            self._backend.delete(*(self._value_key(epoch, external_id) for external_id in keys))
+        except Exception:
+            self._count("backend_errors")
+            _logger.warning("Partner cache backend invalidation failed", exc_info=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._epoch += 1
+            self._local.clear()
+        if self._backend is not None:
+            try:
+                self._backend.incr(_EPOCH_KEY)
+            except Exception:
+                self._count("backend_errors")
+                _logger.warning("Partner cache backend clear failed", exc_info=True)
+
+    def _local_generation(self, external_id: str) -> str:
+        # Untracked keys report the latest invalidation sequence, so a
+        # generation evicted from the bounded map can never match an older read.
+        return f"{self._epoch}:{self._generations.get(external_id, self._invalidations)}"
+
+    def _backend_epoch(self) -> str:
+        return self._backend.get(_EPOCH_KEY) or "0"
+
+    @staticmethod
+    def _value_key(epoch: str, external_id: str) -> str:
+        return f"{_KEY_PREFIX}{epoch}:{external_id}"
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def stats(self) -> dict[str, Any]:
+        stats = {"local": self._local.stats(), "backend": None}
+        if self._backend is not None:
+            stats["backend"] = {
+                "type": type(self._backend).__name__,
+                "hits": self.backend_hits,
+                "misses": self.backend_misses,
+                "errors": self.backend_errors,
+            }
+        return stats
+
+
+def build_backend(url: Optional[str]) -> Optional[CacheBackend]:
+    if not url:
+        return None
+    if url == "memory://":
+        return InMemoryBackend()
+    if url.startswith(("redis://", "rediss://")):
+        return RedisBackend(url)
+    raise ValueError(f"Unsupported partner cache backend: {url}")
+
+
+@lru_cache
+def get_partner_cache() -> PartnerCache:
+    settings = get_settings()
+    return PartnerCache(
+        settings.partner_cache_ttl,
+        maxsize=settings.partner_cache_maxsize,
+        backend=build_backend(settings.partner_cache_url),
+        local_ttl=settings.partner_cache_local_ttl,
+    )
@@ -6,6 +6,10 @@ class ConflictError(Exception):
     pass
 
 
+class PreconditionFailedError(Exception):
+    pass
+
+
 def parse_datetime(value: str | None) -> Optional[datetime]:
     if not value:
         return None
@@ -0,0 +1,39 @@
+import json
+from datetime import date, datetime
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from ..models import Partner, PartnerRead
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+PARTNER_READ_FIELDS = tuple(PartnerRead.__fields__)
+
+
+def partner_to_dict(partner: Partner) -> dict[str, Any]:
+    return {field: getattr(partner, field) for field in PARTNER_READ_FIELDS}
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def dump_partner(partner: Partner) -> bytes:
+    return dumps(partner_to_dict(partner))
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,223 @@
+import asyncio
+import logging
+import os
+import socket
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Iterator, Optional
+
+from sqlalchemy import func, or_, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from ..core.config import get_settings
+from ..db import get_session
+from ..models import SYNC_JOB_ACTIVE_STATUSES, Partner, SyncJob
+from .odoo_async import async_sync_partners_to_odoo
+from .odoo_rpc import get_reference_cache
+from .watermarks import get_watermark
+
+_logger = logging.getLogger(__name__)
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+@lru_cache
+def get_executor() -> ThreadPoolExecutor:
+    settings = get_settings()
+    return ThreadPoolExecutor(max_workers=settings.sync_job_workers, thread_name_prefix="sync-job")
+
+
+def shutdown_executor() -> None:
+    if get_executor.cache_info().currsize:
+        get_executor().shutdown(wait=False, cancel_futures=True)
+    get_executor.cache_clear()
+
+
+def get_active_job(session: Session, target: str) -> Optional[SyncJob]:
+    statement = select(SyncJob).where(SyncJob.target == target, SyncJob.status.in_(SYNC_JOB_ACTIVE_STATUSES))
+    return session.exec(statement).first()
+
+
+def enqueue_sync_job(session: Session, target: str, full: bool = False) -> tuple[SyncJob, bool]:
+    reap_expired_jobs(session)
+    active = get_active_job(session, target)
+    if active:
+        return active, False
+
+    job = SyncJob(target=target, full=full)
+    session.add(job)
+    try:
+        session.commit()
+    except IntegrityError:
+        session.rollback()
+        return get_active_job(session, target), False
+
+    submit_sync_job(job.id)
+    _logger.info("sync_job_enqueued job_id=%s target=%s", job.id, target)
+    return job, True
+
+
+def submit_sync_job(job_id: int) -> Future:
+    return get_executor().submit(run_sync_job, job_id)
+
+
+def _update_job(job_id: int, **values: Any) -> None:
+    with get_session() as session:
+        job = session.get(SyncJob, job_id)
+        for key, value in values.items():
+            setattr(job, key, value)
+        session.add(job)
+        session.commit()
+
+
+def _count_pending_partners(session: Session, target: str, full: bool) -> int:
+    statement = select(func.count()).select_from(Partner)
+    since = None if full else get_watermark(session, target)
+    if since is not None:
+        statement = statement.where(tuple_(Partner.updated_at, Partner.id) > tuple_(*since))
+    return session.exec(statement).one()
+
+
+def claim_sync_job(job_id: int) -> bool:
+    now = datetime.utcnow()
+    with get_session() as session:
+        result = session.execute(
+            update(SyncJob)
+            .where(SyncJob.id == job_id, SyncJob.status == "queued")
+            .values(status="running", owner=WORKER_ID, started_at=now, heartbeat_at=now)
+        )
+        session.commit()
+    return result.rowcount == 1
+
+
+def _touch_job(job_id: int) -> None:
+    with get_session() as session:
+        session.execute(
+            update(SyncJob)
+            .where(SyncJob.id == job_id, SyncJob.owner == WORKER_ID, SyncJob.status == "running")
+            .values(heartbeat_at=datetime.utcnow())
+        )
+        session.commit()
+
+
+@contextmanager
+def _heartbeat(job_id: int) -> Iterator[None]:
+    stop = threading.Event()
+    interval = max(get_settings().sync_job_lease_seconds / 3, 1)
+
+    def beat() -> None:
+        while not stop.wait(interval):
+            try:
+                _touch_job(job_id)
+            except Exception:
+                _logger.exception("sync_job_heartbeat_failed job_id=%s", job_id)
+
+    thread = threading.Thread(target=beat, name=f"sync-job-{job_id}-heartbeat", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def final_status(progress: dict[str, int]) -> str:
+    if not progress["failed"]:
+        return "succeeded"
+    if progress["failed"] < progress["processed"]:
+        return "partial"
+    return "failed"
+
+
+def run_sync_job(job_id: int) -> None:
+    if not claim_sync_job(job_id):
+        _logger.info("sync_job_already_claimed job_id=%s", job_id)
+        return
+    with get_session() as session:
+        job = session.get(SyncJob, job_id)
+        target, full = job.target, job.full
+        total = _count_pending_partners(session, target, full)
+    _update_job(job_id, total=total)
+
+    progress = {"processed": 0, "created": 0, "updated": 0, "failed": 0}
+
+    def on_chunk(timing: dict[str, Any]) -> None:
+        progress["processed"] += timing["size"]
+        for key in ("created", "updated", "failed"):
+            progress[key] += timing[key]
+        _update_job(job_id, heartbeat_at=datetime.utcnow(), **progress)
+
+    try:
+        with _heartbeat(job_id), get_session() as session:
+            asyncio.run(
+                async_sync_partners_to_odoo(
+                    session, on_chunk=on_chunk, continue_on_error=True, full=full, target=target
+                )
+            )
+    except Exception as exc:
+        _logger.exception("sync_job_failed job_id=%s", job_id)
+        get_reference_cache().uids.clear()
+        _update_job(job_id, status="failed", error=str(exc), finished_at=datetime.utcnow())
+        return
+    status = final_status(progress)
+    error = None if status == "succeeded" else f"{progress['failed']} partners fallaron"
+    _update_job(job_id, status=status, error=error, finished_at=datetime.utcnow())
+    _logger.info("sync_job_finished job_id=%s status=%s %s", job_id, status, progress)
+
+
+def reap_expired_jobs(session: Session) -> int:
+    now = datetime.utcnow()
+    expired_before = now - timedelta(seconds=get_settings().sync_job_lease_seconds)
+    result = session.execute(
+        update(SyncJob)
+        .where(
+            SyncJob.status == "running",
+            or_(SyncJob.heartbeat_at.is_(None), SyncJob.heartbeat_at < expired_before),
+        )
+        .values(status="failed", error="Lease expirado: el proceso dejó de reportar progreso", finished_at=now)
+    )
+    session.commit()
+    if result.rowcount:
+        _logger.warning("sync_jobs_reaped count=%s", result.rowcount)
+    return result.rowcount
+
+
+def resume_sync_jobs() -> None:
+    with get_session() as session:
+        reap_expired_jobs(session)
+        queued = session.exec(select(SyncJob.id).where(SyncJob.status == "queued")).all()
+    for job_id in queued:
+        submit_sync_job(job_id)
+
+
+def describe_job(job: SyncJob) -> dict[str, Any]:
+    rate = None
+    eta_seconds = None
+    if job.started_at:
+        elapsed = ((job.finished_at or datetime.utcnow()) - job.started_at).total_seconds()
+        if elapsed > 0 and job.processed:
+            rate = round(job.processed / elapsed, 2)
+            if job.status == "running":
+                eta_seconds = round(max(job.total - job.processed, 0) / rate, 1)
+    return {
+        "job_id": job.id,
+        "target": job.target,
+        "status": job.status,
+        "mode": "full" if job.full else "incremental",
+        "total": job.total,
+        "processed": job.processed,
+        "created": job.created,
+        "updated": job.updated,
+        "failed": job.failed,
+        "rate_per_second": rate,
+        "eta_seconds": eta_seconds,
+        "error": job.error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
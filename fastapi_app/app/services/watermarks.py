@@ -0,0 +1,35 @@
+import logging
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import Session, select
+
+from ..models import Partner, SyncWatermark
+
+_logger = logging.getLogger(__name__)
+
+PartnerKey = tuple[datetime, int]
+
+
+def get_watermark(session: Session, target: str) -> Optional[PartnerKey]:
+    watermark = session.get(SyncWatermark, target)
+    if not watermark:
+        return None
+    return watermark.updated_at, watermark.last_id
+
+
+def latest_partner_key(session: Session) -> Optional[PartnerKey]:
+    statement = select(Partner.updated_at, Partner.id).order_by(Partner.updated_at.desc(), Partner.id.desc()).limit(1)
+    row = session.exec(statement).first()
+    return (row[0], row[1]) if row else None
+
+
+def advance_watermark(session: Session, target: str, key: PartnerKey) -> None:
+    watermark = session.get(SyncWatermark, target) or SyncWatermark(target=target)
+    if watermark.updated_at is not None and (watermark.updated_at, watermark.last_id) >= key:
+        return
+    watermark.updated_at, watermark.last_id = key
+    watermark.synced_at = datetime.utcnow()
+    session.add(watermark)
+    session.commit()
+    _logger.info("sync_watermark_advanced target=%s updated_at=%s id=%s", target, key[0].isoformat(), key[1])
@@ -0,0 +1,284 @@
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+
+import httpx
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+BENCH_TOKEN = "bench-token"
+SCENARIOS = ("post_partners", "get_partners", "list_partners", "rpc_sync_many", "sync_odoo")
+REGRESSION_METRICS = {"p95_ms": 1, "throughput": -1}
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float, **extra: Any) -> dict[str, Any]:
+    ordered = sorted(latencies)
+    count = len(ordered)
+    return {
+        "requests": count,
+        "errors": errors,
+        "seconds": round(elapsed, 4),
+        "throughput": round(count / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(ordered) / count * 1000, 3) if count else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3) if count else 0.0,
+        **extra,
+    }
+
+
+async def drive(
+    calls: list[Callable[[], Awaitable[httpx.Response]]],
+    concurrency: int,
+) -> tuple[list[float], int, float]:
+    queue: asyncio.Queue = asyncio.Queue()
+    for call in calls:
+        queue.put_nowait(call)
+    latencies: list[float] = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        while True:
+            try:
+                call = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            started = time.perf_counter()
+            try:
+                response = await call()
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies.append(time.perf_counter() - started)
+            errors += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    return latencies, errors, time.perf_counter() - started
+
+
+async def run_scenarios(args: argparse.Namespace, base_url: str) -> dict[str, Any]:
+    from scripts.populate import generate_partners
+
+    run_id = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+    headers = {"Authorization": f"Bearer {args.token}"}
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    results: dict[str, Any] = {}
+    rng = random.Random(args.seed)
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=60) as client:
+        posted = list(generate_partners(args.requests, seed=args.seed, prefix=f"post-{run_id}"))
+        if "post_partners" in args.scenarios:
+            calls = [lambda payload=payload: client.post("/partners", json=payload) for payload in posted]
+            results["post_partners"] = summarize(*await drive(calls, args.concurrency))
+
+        if "get_partners" in args.scenarios and "post_partners" in args.scenarios:
+            ids = [partner["external_id"] for partner in posted]
+            calls = [lambda external_id=rng.choice(ids): client.get(f"/partners/{external_id}") for _ in range(args.requests)]
+            results["get_partners"] = summarize(*await drive(calls, args.concurrency))
+
+        if "list_partners" in args.scenarios:
+            latencies, errors, rows = [], 0, 0
+            cursor: Optional[str] = None
+            started = time.perf_counter()
+            while True:
+                params = {"limit": args.page_size, **({"cursor": cursor} if cursor else {})}
+                request_started = time.perf_counter()
+                response = await client.get("/partners", params=params)
+                latencies.append(time.perf_counter() - request_started)
+                if response.status_code >= 400:
+                    errors += 1
+                    break
+                body = response.json()
+                rows += len(body["items"])
+                cursor = body["next_cursor"]
+                if not cursor:
+                    break
+            elapsed = time.perf_counter() - started
+            results["list_partners"] = summarize(latencies, errors, elapsed, rows=rows, rows_per_second=round(rows / elapsed, 2))
+
+        if "rpc_sync_many" in args.scenarios:
+            payloads = list(generate_partners(args.requests, seed=args.seed, prefix=f"rpc-{run_id}"))
+            batches = [payloads[start:start + args.batch_size] for start in range(0, len(payloads), args.batch_size)]
+            calls = [
+                lambda index=index, batch=batch: client.post(
+                    "/rpc",
+                    json={"jsonrpc": "2.0", "method": "partner.sync_many", "params": {"partners": batch}, "id": index},
+                )
+                for index, batch in enumerate(batches)
+            ]
+            latencies, errors, elapsed = await drive(calls, args.concurrency)
+            results["rpc_sync_many"] = summarize(
+                latencies, errors, elapsed, batch_size=args.batch_size, rows_per_second=round(len(payloads) / elapsed, 2)
+            )
+
+        if "sync_odoo" in args.scenarios:
+            started = time.perf_counter()
+            job = (await client.post("/sync/odoo", params={"full": "true"})).json()
+            while job["status"] in ("queued", "running"):
+                await asyncio.sleep(0.2)
+                job = (await client.get(f"/sync/odoo/{job['job_id']}")).json()
+            elapsed = time.perf_counter() - started
+            results["sync_odoo"] = {
+                "status": job["status"],
+                "seconds": round(elapsed, 4),
+                "total": job.get("total"),
+                "processed": job.get("processed"),
+                "created": job.get("created"),
+                "updated": job.get("updated"),
+                "failed": job.get("failed"),
+                "rows_per_second": round((job.get("processed") or 0) / elapsed, 2) if elapsed else 0.0,
+                "error": job.get("error"),
+            }
+    return results
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_local_stack(args: argparse.Namespace) -> tuple[str, Callable[[], None]]:
+    from bench.odoo_stub import start_stub, stub_url
+
+    workdir = tempfile.mkdtemp(prefix="partner-bench-")
+    stub, _state = start_stub(latency=args.odoo_latency)
+    os.environ.update({
+        "FASTAPI_DATABASE_URL": f"sqlite:///{workdir}/bench.db",
+        "FASTAPI_API_TOKEN": args.token,
+        "FASTAPI_LOG_LEVEL": "WARNING",
+        "FASTAPI_ODOO_URL": stub_url(stub),
+        "FASTAPI_FAST_JSON": "true" if args.fast_json else "false",
+    })
+
+    import uvicorn
+
+    from app.db import init_db
+    from app.main import app
+
+    init_db()
+    if args.seed_rows:
+        from scripts.populate import populate_synthetic
+
+        populate_synthetic(args.seed_rows, seed=args.seed)
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    def stop() -> None:
+        server.should_exit = True
+        thread.join(timeout=10)
+        stub.shutdown()
+
+    return f"http://127.0.0.1:{port}", stop
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    regressions = []
+    for scenario, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(scenario)
+        if not previous:
+            continue
+        for metric, direction in REGRESSION_METRICS.items():
+            before, after = previous.get(metric), current.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before * direction
+            if change > tolerance:
+                regressions.append(f"{scenario}.{metric}: {before} -> {after} ({change:+.0%})")
+    return regressions
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load test the partner API")
+    parser.add_argument("--base-url", help="Target an already running API instead of a local stack")
+    parser.add_argument("--token", default=BENCH_TOKEN)
+    parser.add_argument("--requests", type=int, default=500, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--batch-size", type=int, default=100, help="Partners per partner.sync_many call")
+    parser.add_argument("--page-size", type=int, default=500, help="Page size for the listing walk")
+    parser.add_argument("--seed-rows", type=int, default=0, help="Synthetic partners inserted before the run (local stack)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--odoo-latency", type=float, default=0.0, help="Seconds added to each Odoo stub call")
+    parser.add_argument("--fast-json", action="store_true", help="Enable FASTAPI_FAST_JSON on the local stack")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--output", type=Path, help="Result file (default: bench/results/<timestamp>-<rev>.json)")
+    parser.add_argument("--baseline", type=Path, help="Previous result file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression before failing")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    stop = None
+    base_url = args.base_url
+    if not base_url:
+        base_url, stop = start_local_stack(args)
+    try:
+        scenarios = asyncio.run(run_scenarios(args, base_url))
+    finally:
+        if stop is not None:
+            stop()
+
+    revision = _git_revision()
+    results = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(),
+            "revision": revision,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "base_url": args.base_url or "local",
+            "args": {key: str(value) if isinstance(value, Path) else value for key, value in vars(args).items() if key != "token"},
+        },
+        "scenarios": scenarios,
+    }
+    output = args.output or RESULTS_DIR / f"{datetime.utcnow():%Y%m%dT%H%M%S}-{revision or 'unknown'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(json.dumps(scenarios, indent=2))
+    print(f"Results saved to {output}")
+
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
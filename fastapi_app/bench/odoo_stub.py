@@ -0,0 +1,106 @@
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+REFERENCE_MODELS = {
+    "res.country": {"PE": 173, "US": 233},
+    "l10n_latam.identification.type": {"RUC": 4, "DNI": 5},
+}
+
+
+class OdooStubState:
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.partners: dict[str, int] = {}
+        self.calls: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def handle(self, params: dict[str, Any]) -> Any:
+        if self.latency:
+            time.sleep(self.latency)
+        service, method, args = params["service"], params["method"], params["args"]
+        if service == "common" and method == "login":
+            self._count("login")
+            return 2
+        model, model_method, model_args = args[3], args[4], args[5]
+        self._count(f"{model}.{model_method}")
+        if model in REFERENCE_MODELS:
+            codes = model_args[0][0][2]
+            return [{"id": REFERENCE_MODELS[model][code], "code": code} for code in codes if code in REFERENCE_MODELS[model]]
+        if model_method == "search_read":
+            external_ids = model_args[0][0][2]
+            with self._lock:
+                return [
+                    {"id": self.partners[external_id], "external_id": external_id}
+                    for external_id in external_ids
+                    if external_id in self.partners
+                ]
+        if model_method == "write":
+            return True
+        if model_method == "create":
+            with self._lock:
+                ids = []
+                for values in model_args[0]:
+                    ids.append(self.partners.setdefault(values["external_id"], len(self.partners) + 1))
+                return ids
+        raise ValueError(f"Unsupported call {model}.{model_method}")
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+
+
+def _handler(state: OdooStubState):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self) -> None:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            try:
+                response = {"jsonrpc": "2.0", "id": body.get("id"), "result": state.handle(body["params"])}
+            except Exception as exc:
+                response = {"jsonrpc": "2.0", "id": body.get("id"), "error": {"message": str(exc)}}
+            payload = json.dumps(response).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format: str, *args) -> None:
+            return
+
+    return Handler
+
+
+def start_stub(host: str = "127.0.0.1", port: int = 0, latency: float = 0.0) -> tuple[ThreadingHTTPServer, OdooStubState]:
+    state = OdooStubState(latency=latency)
+    server = ThreadingHTTPServer((host, port), _handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+def stub_url(server: ThreadingHTTPServer) -> str:
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local Odoo JSON-RPC stub for benchmarks")
+    parser.add_argument("--port", type=int, default=8069)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every call")
+    args = parser.parse_args()
+    server, _state = start_stub(port=args.port, latency=args.latency)
+    print(f"Odoo stub listening on {stub_url(server)}/jsonrpc")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
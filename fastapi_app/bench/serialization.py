@@ -0,0 +1,64 @@
+import argparse
+import json
+import timeit
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.models import Partner, PartnerRead
+from app.services.serialization import FastJSONResponse, partner_to_dict
+
+
+def build_partners(count: int) -> list[Partner]:
+    base = datetime(2024, 1, 1)
+    return [
+        Partner(
+            id=index,
+            external_id=f"bench-{index}",
+            name=f"Partner {index} S.A.C.",
+            vat=f"20{index:09d}",
+            email=f"partner{index}@example.com",
+            phone="999888777",
+            street="Av. Siempre Viva 123",
+            city="Lima",
+            country_code="PE",
+            score=index / count,
+            created_at=base,
+            updated_at=base + timedelta(seconds=index),
+        )
+        for index in range(count)
+    ]
+
+
+def current_path(partners: list[Partner]) -> bytes:
+    content = {"items": [PartnerRead.from_orm(partner) for partner in partners], "next_cursor": None}
+    return JSONResponse(content=jsonable_encoder(content)).body
+
+
+def fast_path(partners: list[Partner]) -> bytes:
+    content = {"items": [partner_to_dict(partner) for partner in partners], "next_cursor": None}
+    return FastJSONResponse(content=content).body
+
+
+def run(count: int, repeat: int) -> dict:
+    partners = build_partners(count)
+    assert json.loads(current_path(partners)) == json.loads(fast_path(partners))
+    results = {}
+    for name, func in (("current", current_path), ("fast", fast_path)):
+        best = min(timeit.repeat(lambda: func(partners), number=1, repeat=repeat))
+        results[name] = {"seconds": round(best, 6), "partners_per_second": round(count / best)}
+    results["speedup"] = round(results["current"]["seconds"] / results["fast"]["seconds"], 2)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare partner response serialization paths")
+    parser.add_argument("--partners", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps({"partners": args.partners, **run(args.partners, args.repeat)}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
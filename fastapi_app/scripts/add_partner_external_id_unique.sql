@@ -0,0 +1,6 @@
+-- Makes partner.external_id unique on databases created before the
+-- constraint existed (PostgreSQL). Required by the INSERT ... ON CONFLICT
+-- upsert path. Resolve duplicated external_id rows before running it.
+
+DROP INDEX IF EXISTS ix_partner_external_id;
+CREATE UNIQUE INDEX ix_partner_external_id ON partner (external_id);
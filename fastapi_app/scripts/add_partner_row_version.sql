@@ -0,0 +1,6 @@
+-- Server-controlled row version backing the partner ETag (PostgreSQL).
+-- Only needed on databases created before the column was declared.
+
+ALTER TABLE partner ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
+DROP INDEX IF EXISTS ix_partner_external_id_version;
+CREATE INDEX ix_partner_external_id_version ON partner (external_id, updated_at, id, version);
@@ -0,0 +1,4 @@
+-- Keyset index used by the chunked and incremental Odoo sync (PostgreSQL).
+-- Only needed on databases created before the index was declared.
+
+CREATE INDEX IF NOT EXISTS ix_partner_updated_at_id ON partner (updated_at, id);
@@ -0,0 +1,4 @@
+-- Covering index for conditional GET checks on /partners/{external_id} (PostgreSQL).
+-- Only needed on databases created before the index was declared.
+
+CREATE INDEX IF NOT EXISTS ix_partner_external_id_version ON partner (external_id, updated_at, id);
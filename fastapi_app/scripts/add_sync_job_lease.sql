@@ -0,0 +1,5 @@
+-- Lease columns used to claim sync jobs across workers (PostgreSQL).
+-- Only needed on databases created before the columns were declared.
+
+ALTER TABLE sync_job ADD COLUMN IF NOT EXISTS owner VARCHAR;
+ALTER TABLE sync_job ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMP WITHOUT TIME ZONE;
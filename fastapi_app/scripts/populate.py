@@ -1,5 +1,7 @@
+import argparse
 import random
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Iterator, Optional
 
 from sqlmodel import Session
 
@@ -40,7 +42,64 @@ SAMPLE_PARTNERS = [
 ]
 
 
+SYNTHETIC_CITIES = ["Lima", "Arequipa", "Trujillo", "Cusco", "Iquitos", "Piura", "Chiclayo"]
+SYNTHETIC_PREFIXES = ["Comercial", "Servicios", "Insumos", "Distribuidora", "Inversiones", "Transportes"]
+SYNTHETIC_SUFFIXES = ["Andina", "Amazonia", "Pacifico", "del Sur", "Norte", "Central"]
+
+
+def generate_partners(
+    count: int,
+    seed: int = 0,
+    prefix: str = "bench",
+    start: Optional[datetime] = None,
+) -> Iterator[dict]:
+    rng = random.Random(seed)
+    start = start or datetime(2024, 1, 1)
+    for index in range(count):
+        is_company = rng.random() < 0.7
+        yield {
+            "external_id": f"{prefix}-{index}",
+            "name": f"{rng.choice(SYNTHETIC_PREFIXES)} {rng.choice(SYNTHETIC_SUFFIXES)} {index}",
+            "vat": f"20{index:09d}" if is_company else f"{index:08d}",
+            "identification_type_code": "RUC" if is_company else "DNI",
+            "company_type": "company" if is_company else "person",
+            "email": f"contacto{index}@example.pe",
+            "phone": f"+51 1 555-{index % 10000:04d}",
+            "street": f"Av. Principal {rng.randint(1, 999)}",
+            "city": rng.choice(SYNTHETIC_CITIES),
+            "country_code": "PE",
+            "score": round(rng.uniform(0.2, 0.95), 2),
+            "updated_at": (start + timedelta(seconds=index)).isoformat(),
+        }
+
+
+def populate_synthetic(count: int, seed: int = 0, batch_size: int = 1000) -> None:
+    engine = get_engine()
+    with Session(engine) as session:
+        batch = []
+        for partner in generate_partners(count, seed=seed):
+            partner["updated_at"] = datetime.fromisoformat(partner["updated_at"])
+            batch.append(partner)
+            if len(batch) >= batch_size:
+                session.bulk_insert_mappings(Partner, batch)
+                session.commit()
+                batch = []
+        if batch:
+            session.bulk_insert_mappings(Partner, batch)
+            session.commit()
+
+
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Puebla la base con partners de ejemplo")
+    parser.add_argument("--count", type=int, default=0, help="Cantidad de partners sintéticos a generar")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.count:
+        populate_synthetic(args.count, seed=args.seed)
+        print(f"{args.count} partners sintéticos poblados correctamente")
+        return
+
     engine = get_engine()
     with Session(engine) as session:
         for partner in SAMPLE_PARTNERS:
@@ -1,18 +1,24 @@
 import os
+from pathlib import Path
+
 import pytest
 from fastapi.testclient import TestClient
 
 from app.core import config
-from app.db import init_db
+from app.db import dispose_engine, init_db
 
 
 @pytest.fixture(scope="session", autouse=True)
 def _configure_settings():
+    Path("test.db").unlink(missing_ok=True)
     os.environ["FASTAPI_DATABASE_URL"] = "sqlite:///./test.db"
     os.environ["FASTAPI_API_TOKEN"] = "test-token"
     os.environ["FASTAPI_LOG_LEVEL"] = "INFO"
     config.get_settings.cache_clear()
+    dispose_engine()
     init_db()
+    yield
+    dispose_engine()
 
 
 @pytest.fixture()
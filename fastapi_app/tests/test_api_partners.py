@@ -1,3 +1,4 @@
+import json
 from datetime import datetime, timedelta
 
 
@@ -38,3 +39,160 @@ def test_conflict_when_older_update(client):
     }
     conflict = client.post("/partners", json=older_payload, headers=auth_headers())
     assert conflict.status_code == 409
+
+
+def test_bulk_upsert_reports_per_item_status(client):
+    now = datetime.utcnow()
+    client.post(
+        "/partners", json={"external_id": "ext-7002", "name": "Base", "updated_at": now.isoformat()}, headers=auth_headers()
+    )
+    items = [
+        {"external_id": "ext-7001", "name": "Nuevo", "updated_at": now.isoformat()},
+        {"external_id": "ext-7002", "name": "Viejo", "updated_at": (now - timedelta(days=1)).isoformat()},
+        {"name": "Sin external_id"},
+    ]
+    response = client.post("/partners/bulk", json=items, headers=auth_headers())
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["status"] for item in body["results"]] == ["created", "conflict", "error"]
+    assert (body["created"], body["conflict"], body["error"]) == (1, 1, 1)
+
+
+LISTING_BASE = datetime(2030, 1, 1)
+
+
+def _seed_listing(client):
+    items = [
+        {
+            "external_id": f"ext-71{index:02d}",
+            "vat": "20999999999",
+            "country_code": "PE",
+            "updated_at": (LISTING_BASE + timedelta(minutes=index)).isoformat(),
+        }
+        for index in range(5)
+    ]
+    client.post("/partners/bulk", json=items, headers=auth_headers())
+    return items
+
+
+def test_list_partners_keyset_pagination(client):
+    base = LISTING_BASE
+    items = _seed_listing(client)
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2, "vat": "20999999999", "updated_since": base.isoformat()}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/partners", params=params, headers=auth_headers()).json()
+        seen.extend(item["external_id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert seen == [item["external_id"] for item in items]
+
+
+def test_list_partners_ndjson_stream(client):
+    _seed_listing(client)
+    response = client.get(
+        "/partners",
+        params={"vat": "20999999999", "limit": 2, "format": "ndjson"},
+        headers=auth_headers(),
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert len(lines) == 5
+    assert lines[0]["external_id"] == "ext-7100"
+
+
+def test_list_partners_rejects_bad_cursor(client):
+    response = client.get("/partners", params={"cursor": "not-a-cursor"}, headers=auth_headers())
+    assert response.status_code == 400
+
+
+def test_conditional_get_and_if_match(client):
+    payload = {"external_id": "ext-etag-1", "name": "Etag Uno", "updated_at": "2031-01-01T10:00:00.123456"}
+    client.post("/partners", json=payload, headers=auth_headers())
+
+    first = client.get("/partners/ext-etag-1", headers=auth_headers())
+    etag = first.headers["ETag"]
+    assert first.headers["Last-Modified"] == "Wed, 01 Jan 2031 10:00:00 GMT"
+
+    not_modified = client.get("/partners/ext-etag-1", headers={**auth_headers(), "If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == etag
+    since = client.get(
+        "/partners/ext-etag-1",
+        headers={**auth_headers(), "If-Modified-Since": first.headers["Last-Modified"]},
+    )
+    assert since.status_code == 304
+
+    stale = client.put(
+        "/partners/ext-etag-1",
+        json={"name": "Etag Viejo"},
+        headers={**auth_headers(), "If-Match": '"0-0"'},
+    )
+    assert stale.status_code == 412
+
+    updated = client.put("/partners/ext-etag-1", json={"name": "Etag Dos"}, headers={**auth_headers(), "If-Match": etag})
+    assert updated.status_code == 200
+    assert updated.headers["ETag"] != etag
+    changed = client.get("/partners/ext-etag-1", headers={**auth_headers(), "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["name"] == "Etag Dos"
+
+
+def test_etag_changes_when_content_changes_with_same_updated_at(client):
+    payload = {"external_id": "ext-etag-2", "name": "Mismo Uno", "updated_at": "2031-01-02T10:00:00"}
+    client.post("/partners", json=payload, headers=auth_headers())
+    etag = client.get("/partners/ext-etag-2", headers=auth_headers()).headers["ETag"]
+
+    client.post("/partners", json={**payload, "name": "Mismo Dos"}, headers=auth_headers())
+
+    refreshed = client.get("/partners/ext-etag-2", headers={**auth_headers(), "If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.json()["name"] == "Mismo Dos"
+    stale = client.put(
+        "/partners/ext-etag-2",
+        json={"name": "Mismo Tres"},
+        headers={**auth_headers(), "If-Match": etag},
+    )
+    assert stale.status_code == 412
+
+
+def test_fast_json_matches_default_serialization(client, monkeypatch):
+    from app import main
+
+    payload = {"external_id": "ext-fast-1", "name": "Rápido", "score": 0.25, "updated_at": "2031-02-01T08:00:00.5"}
+    client.post("/partners", json=payload, headers=auth_headers())
+    rpc = {"jsonrpc": "2.0", "method": "partner.sync", "params": payload, "id": 1}
+
+    default_get = client.get("/partners/ext-fast-1", headers=auth_headers())
+    monkeypatch.setattr(main.settings, "fast_json", True)
+    fast_get = client.get("/partners/ext-fast-1", headers=auth_headers())
+    assert fast_get.json() == default_get.json()
+    assert fast_get.headers["ETag"] == default_get.headers["ETag"]
+
+    fast_rpc = client.post("/rpc", json=rpc, headers=auth_headers()).json()
+    monkeypatch.setattr(main.settings, "fast_json", False)
+    default_rpc = client.post("/rpc", json=rpc, headers=auth_headers()).json()
+    assert default_rpc["result"].pop("version") == fast_rpc["result"].pop("version") + 1
+    assert fast_rpc == default_rpc
+
+
+def test_partner_responses_are_validated_by_partner_read(client, monkeypatch):
+    from app import main
+
+    payload = {"external_id": "ext-model-1", "name": "Modelo", "updated_at": "2031-03-01T08:00:00"}
+    client.post("/partners", json=payload, headers=auth_headers())
+    cached = client.get("/partners/ext-model-1", headers=auth_headers()).json()
+
+    async def leaky_cache(session, external_id):
+        return {**cached, "internal_note": "no exponer"}
+
+    monkeypatch.setattr(main.async_crud, "get_cached_partner", leaky_cache)
+    body = client.get("/partners/ext-model-1", headers=auth_headers()).json()
+    assert "internal_note" not in body
+    assert body == cached
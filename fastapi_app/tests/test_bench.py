@@ -0,0 +1,49 @@
+import httpx
+
+from bench.load import compare, percentile, summarize
+from bench.odoo_stub import start_stub, stub_url
+from scripts.populate import generate_partners
+
+
+def test_percentile_uses_nearest_rank():
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 95) == 0.0
+
+    summary = summarize([0.01, 0.02, 0.03, 0.04], errors=1, elapsed=2.0)
+    assert summary["requests"] == 4
+    assert summary["throughput"] == 2.0
+    assert summary["p50_ms"] == 20.0
+    assert summary["p99_ms"] == 40.0
+
+
+def test_compare_flags_regressions_beyond_tolerance():
+    baseline = {"scenarios": {"get_partners": {"p95_ms": 10.0, "throughput": 100.0}}}
+    slower = {"scenarios": {"get_partners": {"p95_ms": 15.0, "throughput": 95.0}}}
+    assert compare(slower, baseline, tolerance=0.2) == ["get_partners.p95_ms: 10.0 -> 15.0 (+50%)"]
+    assert compare(slower, baseline, tolerance=0.6) == []
+
+
+def test_generate_partners_is_deterministic():
+    first = list(generate_partners(5, seed=7))
+    assert first == list(generate_partners(5, seed=7))
+    assert [partner["external_id"] for partner in first] == [f"bench-{index}" for index in range(5)]
+
+
+def test_odoo_stub_creates_and_finds_partners():
+    server, state = start_stub()
+    url = f"{stub_url(server)}/jsonrpc"
+
+    def call(model, method, args):
+        body = {"jsonrpc": "2.0", "id": 1, "params": {"service": "object", "method": "execute_kw", "args": ["db", 2, "pw", model, method, args]}}
+        return httpx.post(url, json=body).json()["result"]
+
+    try:
+        assert call("res.partner", "create", [[{"external_id": "a"}, {"external_id": "b"}]]) == [1, 2]
+        assert call("res.partner", "search_read", [[["external_id", "in", ["b", "c"]]]]) == [{"id": 2, "external_id": "b"}]
+        assert call("res.country", "search_read", [[["code", "in", ["PE"]]]]) == [{"id": 173, "code": "PE"}]
+        assert state.calls["res.partner.create"] == 1
+    finally:
+        server.shutdown()
@@ -0,0 +1,42 @@
+from app.services.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_cache_expires_entries():
+    clock = FakeClock()
+    cache = TTLCache(ttl=10, clock=clock)
+    cache.set("pe", 173)
+    assert cache.get("pe") == 173
+    clock.now = 11
+    assert cache.get("pe") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_cache_lru_eviction_and_get_many():
+    cache = TTLCache(ttl=60, maxsize=2)
+    cache.set_many({"a": 1, "b": 2})
+    cache.get("a")
+    cache.set("c", 3)
+    found, missing = cache.get_many(["a", "b", "c"])
+    assert found == {"a": 1, "c": 3}
+    assert missing == {"b"}
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_cache_purges_expired_entries_on_insert():
+    clock = FakeClock()
+    cache = TTLCache(ttl=10, clock=clock)
+    cache.set_many({"a": 1, "b": 2})
+    clock.now = 11
+    cache.set("c", 3)
+    assert cache.stats()["size"] == 1
+    assert cache.stats()["evictions"] == 2
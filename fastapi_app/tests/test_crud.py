@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.db import get_session
+from app.models import PartnerCreate, PartnerUpdate
+from app.services import crud
+from app.services.reconciliation import ConflictError, PreconditionFailedError
+
+
+def test_postgresql_upsert_statement():
+    statement = crud.build_upsert_statement(
+        "postgresql",
+        {"external_id": "ext-4001", "name": "Cliente", "updated_at": datetime.utcnow()},
+    )
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (external_id) DO UPDATE" in sql
+    assert "WHERE excluded.updated_at >= partner.updated_at" in sql
+    assert "RETURNING" in sql
+
+
+@pytest.mark.parametrize("native", [True, False])
+def test_upsert_partner_conflict_semantics(monkeypatch, native):
+    if not native:
+        monkeypatch.setattr(crud, "_NATIVE_UPSERT_INSERTS", {})
+    external_id = f"ext-4002-{native}"
+    now = datetime.utcnow()
+    with get_session() as session:
+        created = crud.upsert_partner(session, PartnerCreate(external_id=external_id, name="Uno", updated_at=now))
+        updated = crud.upsert_partner(
+            session, PartnerCreate(external_id=external_id, name="Dos", updated_at=now + timedelta(minutes=1))
+        )
+        assert updated.id == created.id
+        assert updated.name == "Dos"
+        with pytest.raises(ConflictError):
+            crud.upsert_partner(session, PartnerCreate(external_id=external_id, name="Viejo", updated_at=now))
+        assert crud.get_partner_by_external_id(session, external_id).name == "Dos"
+
+
+def test_update_partner_compare_and_set():
+    with get_session() as session:
+        crud.create_partner(session, PartnerCreate(external_id="ext-cas-1", name="Uno"))
+    with get_session() as first, get_session() as second:
+        mine = crud.get_partner_by_external_id(first, "ext-cas-1")
+        theirs = crud.get_partner_by_external_id(second, "ext-cas-1")
+        version = mine.version
+        crud.update_partner(first, mine, PartnerUpdate(name="Dos"), expected_version=version)
+        with pytest.raises(PreconditionFailedError):
+            crud.update_partner(second, theirs, PartnerUpdate(name="Tres"), expected_version=version)
+    with get_session() as session:
+        assert crud.get_partner_by_external_id(session, "ext-cas-1").name == "Dos"
+
+
+def test_update_partner_returns_none_when_row_was_deleted():
+    with get_session() as session:
+        crud.create_partner(session, PartnerCreate(external_id="ext-cas-2", name="Uno"))
+    with get_session() as first, get_session() as second:
+        mine = crud.get_partner_by_external_id(first, "ext-cas-2")
+        theirs = crud.get_partner_by_external_id(second, "ext-cas-2")
+        second.delete(theirs)
+        second.commit()
+        assert crud.update_partner(first, mine, PartnerUpdate(name="Dos"), expected_version=mine.version) is None
+
+
+def test_bulk_upsert_uses_native_upsert_per_item():
+    now = datetime.utcnow()
+    with get_session() as session:
+        crud.create_partner(session, PartnerCreate(external_id="ext-bulk-1", name="Existente", updated_at=now))
+    payloads = [
+        PartnerCreate(external_id="ext-bulk-1", name="Viejo", updated_at=now - timedelta(minutes=1)),
+        PartnerCreate(external_id="ext-bulk-2", name="Nuevo", updated_at=now),
+        PartnerCreate(external_id="ext-bulk-2", name="Nuevo Editado", updated_at=now + timedelta(minutes=1)),
+    ]
+    with get_session() as session:
+        results = crud.upsert_partners(session, payloads)
+        assert [result.status for result in results] == ["conflict", "created", "updated"]
+        partner = crud.get_partner_by_external_id(session, "ext-bulk-2")
+        assert partner.name == "Nuevo Editado"
+        assert partner.version == 2
@@ -0,0 +1,25 @@
+import json
+import logging
+
+from app.core import logging as app_logging
+
+
+def test_json_formatter_truncates_long_messages():
+    formatter = app_logging.JsonFormatter(max_message_length=10)
+    record = logging.LogRecord("app", logging.INFO, __file__, 1, "%s", ("x" * 50,), None)
+
+    payload = json.loads(formatter.format(record))
+
+    assert payload["message"] == "x" * 10 + "...<50 chars>"
+    assert payload["level"] == "INFO"
+
+
+def test_queued_logging_hands_records_to_listener(capsys):
+    app_logging.configure_logging("INFO", queued=True)
+    try:
+        logging.getLogger("app.test").info("queued message")
+    finally:
+        app_logging.shutdown_logging()
+        app_logging.configure_logging("INFO")
+
+    assert "queued message" in capsys.readouterr().err
@@ -0,0 +1,60 @@
+from datetime import datetime
+
+import pytest
+
+from app.core.metrics import HTTP_DB_TIME, HTTP_LATENCY, PARTNER_UPSERTS, Counter, Histogram, Registry
+
+
+def auth_headers():
+    return {"Authorization": "Bearer test-token"}
+
+
+def test_registry_renders_prometheus_text():
+    registry = Registry()
+    counter = registry.register(Counter("jobs_total", "Jobs.", ("result",)))
+    histogram = registry.register(Histogram("job_seconds", "Job time.", buckets=(0.1, 1.0)))
+    counter.inc("ok", amount=2)
+    histogram.observe(0.5)
+
+    text = registry.render()
+
+    assert "# TYPE jobs_total counter" in text
+    assert 'jobs_total{result="ok"} 2' in text
+    assert 'job_seconds_bucket{le="0.1"} 0' in text
+    assert 'job_seconds_bucket{le="1.0"} 1' in text
+    assert 'job_seconds_bucket{le="+Inf"} 1' in text
+    assert "job_seconds_count 1" in text
+
+
+def test_requests_upserts_and_db_time_are_recorded(client):
+    route = "/partners/{external_id}"
+    created_before = PARTNER_UPSERTS.value("created")
+    requests_before = HTTP_LATENCY.count("GET", route)
+    db_time_before = HTTP_DB_TIME.sum("POST", "/partners")
+    payload = {"external_id": "ext-metrics-1", "name": "Métricas", "updated_at": datetime.utcnow().isoformat()}
+    client.post("/partners", json=payload, headers=auth_headers())
+    client.get("/partners/ext-metrics-1", headers=auth_headers())
+
+    assert PARTNER_UPSERTS.value("created") == created_before + 1
+    assert HTTP_LATENCY.count("GET", route) == requests_before + 1
+    assert HTTP_DB_TIME.count("POST", "/partners") >= 1
+    assert HTTP_DB_TIME.sum("POST", "/partners") > db_time_before
+
+    text = client.get("/metrics", headers=auth_headers()).text
+    assert 'http_requests_total{method="GET",route="/partners/{external_id}",status="200"}' in text
+    assert "partner_upserts_total" in text
+
+
+def test_failed_statements_leave_no_stale_start_time(client):
+    from sqlalchemy import text
+    from sqlalchemy.exc import OperationalError
+
+    from app.db import get_session
+
+    with get_session() as session:
+        with pytest.raises(OperationalError):
+            session.execute(text("SELECT * FROM missing_table"))
+        session.rollback()
+        connection = session.connection()
+        assert not connection.info.get("query_started")
+        session.execute(text("SELECT 1"))
@@ -0,0 +1,169 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import select
+
+from app.db import get_session
+from app.models import Partner, PartnerCreate
+from app.services import odoo_async, odoo_rpc
+from app.services.crud import upsert_partners
+from app.services.watermarks import latest_partner_key
+
+
+@pytest.fixture(autouse=True)
+def _clear_reference_cache():
+    odoo_rpc.get_reference_cache().invalidate()
+
+
+class FakeOdoo:
+    def __init__(self, existing_external_ids=()):
+        self.calls = []
+        self.records = {external_id: index for index, external_id in enumerate(existing_external_ids, start=1)}
+
+    def __call__(self, client, url, service, method, args, request_id):
+        if service == "common":
+            self.calls.append("login")
+            return 7
+        model, operation = args[3], args[4]
+        self.calls.append(f"{model}.{operation}")
+        if operation == "search_read" and model == "res.partner":
+            external_ids = args[5][0][0][2]
+            return [{"id": self.records[ext], "external_id": ext} for ext in external_ids if ext in self.records]
+        if operation == "search_read":
+            return [{"code": code, "id": index} for index, code in enumerate(args[5][0][0][2], start=1)]
+        if operation == "create":
+            ids = []
+            for values in args[5][0]:
+                self.records[values["external_id"]] = len(self.records) + 1
+                ids.append(self.records[values["external_id"]])
+            return ids
+        return True
+
+
+def _seed(prefix, count, updated_at=None):
+    payloads = [
+        PartnerCreate(
+            external_id=f"{prefix}-{index}",
+            name=f"Partner {index}",
+            country_code="PE",
+            updated_at=updated_at or datetime.utcnow(),
+        )
+        for index in range(count)
+    ]
+    with get_session() as session:
+        upsert_partners(session, payloads)
+
+
+def test_sync_partners_streams_chunks(monkeypatch):
+    _seed("ext-5000", 5)
+    with get_session() as session:
+        all_ids = [partner.external_id for partner in session.exec(select(Partner)).all()]
+    fake = FakeOdoo(existing_external_ids=all_ids[:2])
+    monkeypatch.setattr(odoo_rpc, "_jsonrpc_call", fake)
+
+    with get_session() as session:
+        result = odoo_rpc.sync_partners_to_odoo(session, chunk_size=2, full=True)
+
+    chunks = -(-len(all_ids) // 2)
+    assert result == {"created": len(all_ids) - 2, "updated": 2, "total": len(all_ids), "mode": "full"}
+    assert fake.calls.count("login") == 1
+    assert fake.calls.count("res.partner.search_read") == chunks
+    assert fake.calls.count("res.partner.write") == 2
+    assert fake.calls.count("res.partner.create") <= chunks
+    assert fake.calls.count("res.country.search_read") == 1
+
+
+def test_async_sync_partners_reports_chunk_timings(monkeypatch):
+    _seed("ext-5100", 3)
+    fake = FakeOdoo()
+
+    async def fake_call(client, url, service, method, args, request_id):
+        await asyncio.sleep(0)
+        return fake(client, url, service, method, args, request_id)
+
+    monkeypatch.setattr(odoo_async, "_jsonrpc_call_async", fake_call)
+
+    with get_session() as session:
+        total = len(session.exec(select(Partner)).all())
+        result = asyncio.run(odoo_async.async_sync_partners_to_odoo(session, chunk_size=2, concurrency=3, full=True))
+
+    assert result["total"] == total
+    assert result["created"] + result["updated"] == total
+    assert [chunk["chunk"] for chunk in result["chunks"]] == list(range(-(-total // 2)))
+    assert all(chunk["seconds"] >= 0 for chunk in result["chunks"])
+    assert fake.calls.count("login") == 1
+
+
+def test_async_sync_reports_failed_items_individually(monkeypatch):
+    _seed("ext-5250", 3)
+    with get_session() as session:
+        all_ids = [partner.external_id for partner in session.exec(select(Partner)).all()]
+    fake = FakeOdoo(existing_external_ids=all_ids)
+    sent_countries = []
+
+    async def fake_call(client, url, service, method, args, request_id):
+        await asyncio.sleep(0)
+        if service == "object" and args[3] == "res.country":
+            sent_countries.extend(args[5][0][0][2])
+        if request_id == "write-ext-5250-1":
+            raise RuntimeError("write rejected")
+        return fake(client, url, service, method, args, request_id)
+
+    monkeypatch.setattr(odoo_async, "_jsonrpc_call_async", fake_call)
+
+    with get_session() as session:
+        result = asyncio.run(
+            odoo_async.async_sync_partners_to_odoo(session, chunk_size=len(all_ids), full=True, continue_on_error=True)
+        )
+
+    assert (result["updated"], result["failed"]) == (len(all_ids) - 1, 1)
+    assert result["chunks"][0]["errors"] == [{"external_id": "ext-5250-1", "error": "write rejected"}]
+    assert "PE" in sent_countries
+    assert all(code == code.upper() for code in sent_countries)
+
+
+def test_reference_codes_are_normalized():
+    assert odoo_rpc.normalize_code(" pe ") == "PE"
+    assert odoo_rpc.normalize_code("") is None
+    partner = Partner(external_id="ext-5300", name="Minúsculas", country_code="pe", identification_type_code=" ruc")
+    payload = odoo_rpc._build_partner_payload(partner, {"PE": 173}, {"RUC": 4})
+    assert (payload["country_id"], payload["l10n_latam_identification_type_id"]) == (173, 4)
+
+
+def test_incremental_sync_only_sends_changed_partners(monkeypatch):
+    fake = FakeOdoo()
+    monkeypatch.setattr(odoo_rpc, "_jsonrpc_call", fake)
+    with get_session() as session:
+        odoo_rpc.sync_partners_to_odoo(session, target="odoo:test-incremental", full=True)
+        assert odoo_rpc.sync_partners_to_odoo(session, target="odoo:test-incremental")["total"] == 0
+
+    with get_session() as session:
+        latest_updated_at = latest_partner_key(session)[0]
+    _seed("ext-5200", 2, updated_at=latest_updated_at + timedelta(seconds=1))
+    with get_session() as session:
+        result = odoo_rpc.sync_partners_to_odoo(session, target="odoo:test-incremental")
+        assert result["mode"] == "incremental"
+        assert result["total"] == 2
+        assert result["created"] == 2
+        assert odoo_rpc.sync_partners_to_odoo(session, target="odoo:test-incremental", full=True)["total"] > 2
+
+
+def test_reference_lookups_are_cached_across_runs(monkeypatch):
+    fake = FakeOdoo()
+    monkeypatch.setattr(odoo_rpc, "_jsonrpc_call", fake)
+    with get_session() as session:
+        odoo_rpc.sync_partners_to_odoo(session, full=True)
+        odoo_rpc.sync_partners_to_odoo(session, full=True)
+
+    assert fake.calls.count("login") == 1
+    assert fake.calls.count("res.country.search_read") == 1
+    stats = odoo_rpc.get_reference_cache().stats()
+    assert stats["countries"]["hits"] >= 1
+    assert stats["uid"]["hits"] >= 1
+
+
+def test_reference_cache_endpoints(client):
+    headers = {"Authorization": "Bearer test-token"}
+    assert set(client.get("/sync/odoo/cache", headers=headers).json()) == {"uid", "countries", "identification_types"}
+    assert client.delete("/sync/odoo/cache", headers=headers).status_code == 204
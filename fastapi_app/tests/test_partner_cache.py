@@ -0,0 +1,106 @@
+from datetime import datetime
+
+from app.models import Partner
+from app.services.partner_cache import InMemoryBackend, PartnerCache, get_partner_cache
+
+
+def auth_headers():
+    return {"Authorization": "Bearer test-token"}
+
+
+def _partner(external_id, name):
+    now = datetime.utcnow()
+    return Partner(id=1, external_id=external_id, name=name, score=0.0, created_at=now, updated_at=now)
+
+
+def test_shared_backend_serves_other_instances():
+    backend = InMemoryBackend()
+    writer = PartnerCache(60, backend=backend)
+    reader = PartnerCache(60, backend=backend)
+
+    writer.set(_partner("ext-cache-1", "Cache Uno"))
+    assert reader.get("ext-cache-1")["name"] == "Cache Uno"
+    assert reader.stats()["backend"]["hits"] == 1
+
+    writer.invalidate(["ext-cache-1"])
+    reader.clear()
+    assert reader.get("ext-cache-1") is None
+    assert reader.stats()["backend"]["misses"] == 1
+
+
+def test_write_then_read_in_another_instance():
+    backend = InMemoryBackend()
+    writer = PartnerCache(60, backend=backend, local_ttl=0)
+    reader = PartnerCache(60, backend=backend, local_ttl=0)
+
+    writer.set(_partner("ext-cache-3", "Cache Tres"))
+    assert reader.get("ext-cache-3")["name"] == "Cache Tres"
+
+    writer.invalidate(["ext-cache-3"])
+    assert reader.get("ext-cache-3") is None
+    writer.set(_partner("ext-cache-3", "Cache Tres Editado"))
+    assert reader.get("ext-cache-3")["name"] == "Cache Tres Editado"
+
+    writer.clear()
+    assert reader.get("ext-cache-3") is None
+
+
+def test_stale_set_after_invalidation_is_dropped():
+    for backend in (None, InMemoryBackend()):
+        cache = PartnerCache(60, backend=backend)
+        generation = cache.generation("ext-cache-4")
+        cache.invalidate(["ext-cache-4"])
+        cache.set(_partner("ext-cache-4", "Viejo"), generation=generation)
+        assert cache.get("ext-cache-4") is None
+
+        cache.set(_partner("ext-cache-4", "Nuevo"), generation=cache.generation("ext-cache-4"))
+        assert cache.get("ext-cache-4")["name"] == "Nuevo"
+
+
+def test_get_partner_is_read_through_and_invalidated_on_write(client):
+    payload = {"external_id": "ext-cache-2", "name": "Cache Dos", "updated_at": datetime.utcnow().isoformat()}
+    client.post("/partners", json=payload, headers=auth_headers())
+    cache = get_partner_cache()
+    before = cache.stats()["local"]
+
+    assert client.get("/partners/ext-cache-2", headers=auth_headers()).json()["name"] == "Cache Dos"
+    assert client.get("/partners/ext-cache-2", headers=auth_headers()).json()["name"] == "Cache Dos"
+    after = client.get("/cache/partners", headers=auth_headers()).json()["local"]
+    assert after["hits"] - before["hits"] == 1
+    assert after["misses"] - before["misses"] == 1
+
+    client.put("/partners/ext-cache-2", json={"name": "Cache Dos Editado"}, headers=auth_headers())
+    assert client.get("/partners/ext-cache-2", headers=auth_headers()).json()["name"] == "Cache Dos Editado"
+
+    client.delete("/partners/ext-cache-2", headers=auth_headers())
+    assert client.get("/partners/ext-cache-2", headers=auth_headers()).status_code == 404
+
+
+def test_local_generations_are_bounded():
+    cache = PartnerCache(60, maxsize=2)
+    generation = cache.generation("ext-cache-5")
+    cache.invalidate(["ext-cache-5"])
+    cache.invalidate(["ext-cache-6", "ext-cache-7", "ext-cache-8"])
+    assert cache._generations.stats()["size"] == 2
+
+    cache.set(_partner("ext-cache-5", "Viejo"), generation=generation)
+    assert cache.get("ext-cache-5") is None
+
+
+def test_backend_invalidation_is_batched():
+    class RecordingBackend(InMemoryBackend):
+        def __init__(self):
+            super().__init__()
+            self.batches = []
+
+        def incr_many(self, keys, ttl=None):
+            keys = list(keys)
+            self.batches.append(keys)
+            super().incr_many(keys, ttl)
+
+    backend = RecordingBackend()
+    cache = PartnerCache(60, backend=backend)
+
+    cache.invalidate(["ext-cache-9", "ext-cache-10"])
+    assert backend.batches == [["partner-gen:ext-cache-9", "partner-gen:ext-cache-10"]]
+    assert backend.get("partner-gen:ext-cache-9") == "1"
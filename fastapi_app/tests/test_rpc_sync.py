@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 
 
 def auth_headers():
@@ -21,3 +21,84 @@ def test_rpc_sync_partner(client):
     assert response.status_code == 200
     body = response.json()
     assert body["result"]["external_id"] == "ext-3001"
+
+
+def test_rpc_batch_request(client):
+    payload = [
+        {
+            "jsonrpc": "2.0",
+            "method": "partner.sync",
+            "params": {"external_id": "ext-3101", "name": "Lote Uno", "updated_at": datetime.utcnow().isoformat()},
+            "id": 1,
+        },
+        {"jsonrpc": "2.0", "method": "partner.unknown", "params": {}, "id": 2},
+    ]
+    response = client.post("/rpc", json=payload, headers=auth_headers())
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["id"] for item in body] == [1, 2]
+    assert body[0]["result"]["external_id"] == "ext-3101"
+    assert body[1]["error"]["code"] == 400
+
+
+def test_rpc_sync_many(client):
+    now = datetime.utcnow()
+    client.post(
+        "/rpc",
+        json={
+            "jsonrpc": "2.0",
+            "method": "partner.sync",
+            "params": {"external_id": "ext-3202", "name": "Existente", "updated_at": now.isoformat()},
+            "id": 1,
+        },
+        headers=auth_headers(),
+    )
+    payload = {
+        "jsonrpc": "2.0",
+        "method": "partner.sync_many",
+        "params": {
+            "partners": [
+                {"external_id": "ext-3201", "name": "Nuevo", "updated_at": now.isoformat()},
+                {"external_id": "ext-3202", "name": "Viejo", "updated_at": (now - timedelta(days=1)).isoformat()},
+                {"name": "Sin external_id"},
+            ]
+        },
+        "id": 2,
+    }
+    response = client.post("/rpc", json=payload, headers=auth_headers())
+    assert response.status_code == 200
+    results = response.json()["result"]
+    assert [item["status"] for item in results] == ["created", "conflict", "error"]
+    assert results[0]["partner"]["name"] == "Nuevo"
+    assert results[1]["error"]["code"] == 409
+
+
+def test_rpc_sync_rejects_invalid_params(client):
+    payload = {"jsonrpc": "2.0", "method": "partner.sync", "params": {"name": "Sin external_id"}, "id": 7}
+    response = client.post("/rpc", json=payload, headers=auth_headers())
+    assert response.status_code == 400
+    assert response.json()["error"]["code"] == 400
+
+
+def test_rpc_batch_recovers_after_database_error(client, monkeypatch):
+    from app.models import Partner
+    from app.services import async_crud
+
+    now = datetime.utcnow().isoformat()
+    client.post("/partners", json={"external_id": "ext-3301", "name": "Duplicado", "updated_at": now}, headers=auth_headers())
+    real_upsert = async_crud.upsert_partner
+
+    async def failing_once(session, payload):
+        if payload.external_id == "ext-3302":
+            session.add(Partner(external_id="ext-3301"))
+            await session.flush()
+        return await real_upsert(session, payload)
+
+    monkeypatch.setattr(async_crud, "upsert_partner", failing_once)
+    payload = [
+        {"jsonrpc": "2.0", "method": "partner.sync", "params": {"external_id": "ext-3302", "updated_at": now}, "id": 1},
+        {"jsonrpc": "2.0", "method": "partner.sync", "params": {"external_id": "ext-3303", "updated_at": now}, "id": 2},
+    ]
+    body = client.post("/rpc", json=payload, headers=auth_headers()).json()
+    assert body[0]["error"]["code"] == 500
+    assert body[1]["result"]["external_id"] == "ext-3303"
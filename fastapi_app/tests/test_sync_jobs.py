@@ -0,0 +1,134 @@
+import time
+from datetime import datetime, timedelta
+
+from app.db import get_session
+from app.models import SyncJob
+from app.services import sync_jobs
+
+
+def auth_headers():
+    return {"Authorization": "Bearer test-token"}
+
+
+def _wait_for_job(client, job_id, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        body = client.get(f"/sync/odoo/{job_id}", headers=auth_headers()).json()
+        if body["status"] not in ("queued", "running"):
+            return body
+        time.sleep(0.05)
+    raise AssertionError("sync job did not finish")
+
+
+def test_sync_job_reports_progress(client, monkeypatch):
+    async def fake_sync(session, on_chunk=None, **kwargs):
+        on_chunk({"size": 2, "created": 1, "updated": 1, "failed": 0})
+        on_chunk({"size": 1, "created": 0, "updated": 0, "failed": 1})
+        return {}
+
+    monkeypatch.setattr(sync_jobs, "async_sync_partners_to_odoo", fake_sync)
+
+    response = client.post("/sync/odoo", headers=auth_headers())
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+
+    body = _wait_for_job(client, job_id)
+    assert body["status"] == "partial"
+    assert (body["processed"], body["created"], body["updated"], body["failed"]) == (3, 1, 1, 1)
+    assert body["rate_per_second"] is not None
+
+
+def test_sync_job_single_active_per_target(client, monkeypatch):
+    release = []
+
+    async def slow_sync(session, on_chunk=None, **kwargs):
+        while not release:
+            time.sleep(0.01)
+        return {}
+
+    monkeypatch.setattr(sync_jobs, "async_sync_partners_to_odoo", slow_sync)
+
+    first = client.post("/sync/odoo", headers=auth_headers())
+    second = client.post("/sync/odoo", headers=auth_headers())
+    release.append(True)
+    assert first.status_code == 202
+    assert second.status_code == 200
+    assert second.json()["job_id"] == first.json()["job_id"]
+    assert _wait_for_job(client, first.json()["job_id"])["status"] == "succeeded"
+
+
+def test_sync_job_failure_is_recorded(client, monkeypatch):
+    async def broken_sync(session, on_chunk=None, **kwargs):
+        raise RuntimeError("No se pudo autenticar contra Odoo.")
+
+    monkeypatch.setattr(sync_jobs, "async_sync_partners_to_odoo", broken_sync)
+
+    job_id = client.post("/sync/odoo", headers=auth_headers()).json()["job_id"]
+    body = _wait_for_job(client, job_id)
+    assert body["status"] == "failed"
+    assert "autenticar" in body["error"]
+
+
+def test_sync_job_not_found(client):
+    assert client.get("/sync/odoo/999999", headers=auth_headers()).status_code == 404
+
+
+def test_final_status_reflects_failed_items():
+    assert sync_jobs.final_status({"processed": 3, "failed": 0}) == "succeeded"
+    assert sync_jobs.final_status({"processed": 3, "failed": 1}) == "partial"
+    assert sync_jobs.final_status({"processed": 3, "failed": 3}) == "failed"
+
+
+def _create_job(**values):
+    with get_session() as session:
+        job = SyncJob(target=f"lease-{time.monotonic_ns()}", **values)
+        session.add(job)
+        session.commit()
+        return job.id
+
+
+def _job_status(job_id):
+    with get_session() as session:
+        return session.get(SyncJob, job_id).status
+
+
+def test_queued_job_is_claimed_once():
+    job_id = _create_job()
+    assert sync_jobs.claim_sync_job(job_id)
+    assert not sync_jobs.claim_sync_job(job_id)
+    with get_session() as session:
+        assert session.get(SyncJob, job_id).owner == sync_jobs.WORKER_ID
+
+
+def test_only_expired_running_jobs_are_reaped():
+    now = datetime.utcnow()
+    live = _create_job(status="running", owner="other-worker", heartbeat_at=now)
+    stale = _create_job(status="running", owner="dead-worker", heartbeat_at=now - timedelta(hours=1))
+
+    with get_session() as session:
+        sync_jobs.reap_expired_jobs(session)
+
+    assert _job_status(live) == "running"
+    assert _job_status(stale) == "failed"
+    with get_session() as session:
+        session.get(SyncJob, live).status = "failed"
+        session.commit()
+
+
+def test_enqueue_replaces_job_with_expired_lease(monkeypatch):
+    submitted = []
+    monkeypatch.setattr(sync_jobs, "submit_sync_job", submitted.append)
+    stale = _create_job(status="running", owner="dead-worker", heartbeat_at=datetime.utcnow() - timedelta(hours=1))
+    with get_session() as session:
+        target = session.get(SyncJob, stale).target
+
+    with get_session() as session:
+        job, created = sync_jobs.enqueue_sync_job(session, target)
+
+    assert created
+    assert job.id != stale
+    assert submitted == [job.id]
+    assert _job_status(stale) == "failed"
+    with get_session() as session:
+        session.get(SyncJob, job.id).status = "failed"
+        session.commit()
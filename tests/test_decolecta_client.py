@@ -3,6 +3,8 @@ import sys
 from types import ModuleType
 from pathlib import Path
 
+import pytest
+
 _MODULE_PATH = Path(__file__).resolve().parents[1] / "addons" / "l10n_pe_ruc_dni_autocomplete" / "services" / "decolecta_client.py"
 package_name = "addons.l10n_pe_ruc_dni_autocomplete.services"
 base_path = Path(__file__).resolve().parents[1] / "addons" / "l10n_pe_ruc_dni_autocomplete" / "services"
@@ -17,27 +19,30 @@ decolecta_client = importlib.util.module_from_spec(spec)
 spec.loader.exec_module(decolecta_client)
 
 fetch_decolecta_payload = decolecta_client.fetch_decolecta_payload
+http_client = sys.modules[f"{package_name}.http_client"]
 
 
 class DummyResponse:
+    status_code = 200
+
     def __init__(self, payload):
         self._payload = payload
 
     def json(self):
         return self._payload
 
+    def raise_for_status(self):
+        return None
+
 
 def test_fetch_decolecta_payload(monkeypatch):
-    def fake_request(method, url, headers=None, params=None, timeout=None, json=None, data=None):
+    def fake_request(session, method, url, headers=None, params=None, timeout=None, json=None, data=None):
         assert method == "GET"
         assert "sunat" in url
         assert headers["Authorization"].startswith("Bearer")
         return DummyResponse({"numero_documento": "20123456789"})
 
-    monkeypatch.setattr(
-        "addons.l10n_pe_ruc_dni_autocomplete.services.http_client.requests.request",
-        fake_request,
-    )
+    monkeypatch.setattr(http_client.requests.Session, "request", fake_request)
     payload = fetch_decolecta_payload(
         base_url="https://api.decolecta.com/v1",
         token="token",
@@ -45,3 +50,53 @@ def test_fetch_decolecta_payload(monkeypatch):
         params={"numero": "20123456789"},
     )
     assert payload["numero_documento"] == "20123456789"
+
+
+class NotFoundResponse(DummyResponse):
+    status_code = 404
+
+    def raise_for_status(self):
+        raise http_client.requests.HTTPError("404", response=self)
+
+
+def test_fetch_decolecta_payloads_in_parallel(monkeypatch):
+    def fake_request(session, method, url, headers=None, params=None, timeout=None, json=None, data=None):
+        if params["numero"] == "00000000":
+            return NotFoundResponse(None)
+        return DummyResponse({"document_number": params["numero"]})
+
+    monkeypatch.setattr(http_client.requests.Session, "request", fake_request)
+    results = decolecta_client.fetch_decolecta_payloads(
+        {
+            ("dni", "12345678"): ("reniec/dni", {"numero": "12345678"}),
+            ("dni", "00000000"): ("reniec/dni", {"numero": "00000000"}),
+        },
+        base_url="https://api.decolecta.com/v1",
+        token="token",
+        max_workers=2,
+        rps=0,
+    )
+
+    assert results[("dni", "12345678")] == ({"document_number": "12345678"}, None)
+    assert results[("dni", "00000000")] == ({}, None)
+
+
+def test_fetch_decolecta_payload_honours_deadline(monkeypatch):
+    timeouts = []
+
+    def fake_request(session, method, url, headers=None, params=None, timeout=None, json=None, data=None):
+        timeouts.append(timeout)
+        raise http_client.requests.ConnectionError("down")
+
+    monkeypatch.setattr(http_client.requests.Session, "request", fake_request)
+    monkeypatch.setattr(http_client.time, "sleep", lambda seconds: None)
+    with pytest.raises(http_client.requests.ConnectionError):
+        fetch_decolecta_payload(
+            base_url="https://deadline.decolecta.test/v1",
+            token="token",
+            endpoint="reniec/dni",
+            params={"numero": "12345678"},
+            rps=0,
+            deadline=2,
+        )
+    assert timeouts and max(timeouts) <= 2
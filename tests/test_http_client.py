@@ -0,0 +1,148 @@
+import importlib.util
+import logging
+import sys
+import threading
+import time
+from types import ModuleType
+from pathlib import Path
+
+import pytest
+
+_MODULE_PATH = Path(__file__).resolve().parents[1] / "addons" / "l10n_pe_ruc_dni_autocomplete" / "services" / "http_client.py"
+package_name = "addons.l10n_pe_ruc_dni_autocomplete.services"
+base_path = _MODULE_PATH.parent
+for name in ["addons", "addons.l10n_pe_ruc_dni_autocomplete", package_name]:
+    if name not in sys.modules:
+        module = ModuleType(name)
+        module.__path__ = [str(base_path)]
+        sys.modules[name] = module
+
+spec = importlib.util.spec_from_file_location(f"{package_name}.http_client", _MODULE_PATH)
+http_client = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(http_client)
+
+
+class DummyResponse:
+    status_code = 200
+    headers = {}
+
+    def raise_for_status(self):
+        return None
+
+
+def test_sessions_are_pooled_per_base_url(monkeypatch):
+    sessions = []
+
+    def fake_request(session, method, url, **kwargs):
+        sessions.append(session)
+        return DummyResponse()
+
+    monkeypatch.setattr(http_client.requests.Session, "request", fake_request)
+    client = http_client.HttpClient(rps=0)
+    client.request("GET", "https://api.example.com/v1/a")
+    http_client.HttpClient(rps=0).request("GET", "https://api.example.com/v1/b")
+    client.request("GET", "https://other.example.com/v1/a")
+
+    assert sessions[0] is sessions[1]
+    assert sessions[0] is not sessions[2]
+
+
+def test_rate_limiter_is_shared_across_threads():
+    limiter = http_client.get_rate_limiter("https://limited.example.com", 20)
+    threads = [threading.Thread(target=limiter.acquire) for _ in range(5)]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert time.monotonic() - started >= 0.19
+
+
+class FailingResponse(DummyResponse):
+    status_code = 503
+
+    def raise_for_status(self):
+        raise http_client.requests.HTTPError("503", response=self)
+
+
+def test_circuit_breaker_opens_and_half_opens():
+    now = [0.0]
+    breaker = http_client.CircuitBreaker("https://flaky.example.com", failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == breaker.OPEN
+    assert not breaker.allow()
+
+    now[0] = 11
+    assert breaker.allow()
+    assert breaker.state == breaker.HALF_OPEN
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert (breaker.state, breaker.trips) == (breaker.OPEN, 2)
+
+    now[0] = 22
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == breaker.CLOSED
+    assert breaker.stats()["rejected"] == 2
+
+
+def test_open_circuit_fails_fast(monkeypatch):
+    calls = []
+
+    def fake_request(session, method, url, **kwargs):
+        calls.append(url)
+        return FailingResponse()
+
+    monkeypatch.setattr(http_client.requests.Session, "request", fake_request)
+    monkeypatch.setattr(http_client.time, "sleep", lambda seconds: None)
+    client = http_client.HttpClient(rps=0, max_retries=5, failure_threshold=2, reset_timeout=60)
+
+    with pytest.raises(http_client.CircuitOpenError):
+        client.request("GET", "https://down.example.com/v1/a")
+    assert len(calls) == 2
+    with pytest.raises(http_client.CircuitOpenError):
+        client.request("GET", "https://down.example.com/v1/b")
+    assert len(calls) == 2
+
+
+def test_retries_stop_when_deadline_budget_is_spent(monkeypatch):
+    calls = []
+
+    def fake_request(session, method, url, **kwargs):
+        calls.append(kwargs["timeout"])
+        return FailingResponse()
+
+    monkeypatch.setattr(http_client.requests.Session, "request", fake_request)
+    client = http_client.HttpClient(rps=0, max_retries=5, backoff_base=5, deadline=1, failure_threshold=10)
+
+    started = time.monotonic()
+    with pytest.raises(http_client.requests.HTTPError):
+        client.request("GET", "https://slow.example.com/v1/a")
+    assert len(calls) == 1
+    assert calls[0] <= 1
+    assert time.monotonic() - started < 0.5
+
+
+def test_circuit_transitions_are_logged(caplog):
+    now = [0.0]
+    breaker = http_client.CircuitBreaker("https://noisy.example.com", failure_threshold=1, reset_timeout=5, clock=lambda: now[0])
+
+    with caplog.at_level(logging.INFO, logger=http_client._logger.name):
+        breaker.record_failure()
+        breaker.record_failure()
+        now[0] = 6
+        breaker.allow()
+        breaker.record_success()
+
+    events = [record.getMessage() for record in caplog.records]
+    assert len(events) == 3
+    assert '"state":"open"' in events[0].replace(" ", "")
+    assert '"previous":"half_open"' in events[2].replace(" ", "")
+
+
+def test_default_deadline_is_derived_from_timeout_and_retries():
+    client = http_client.HttpClient(timeout=4, max_retries=2)
+    assert client._deadline == 12
@@ -0,0 +1,38 @@
+import importlib.util
+from pathlib import Path
+
+_MODULE_PATH = Path(__file__).resolve().parents[1] / "addons" / "l10n_pe_ruc_dni_autocomplete" / "services" / "lookup_cache.py"
+spec = importlib.util.spec_from_file_location("lookup_cache", _MODULE_PATH)
+lookup_cache = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(lookup_cache)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = lookup_cache.LookupLRU(clock=clock)
+    cache.set(("db", "ruc", "20100000001"), {"numero_documento": "20100000001"}, 60)
+
+    assert cache.get(("db", "ruc", "20100000001")) == {"numero_documento": "20100000001"}
+    clock.now = 61
+    assert lookup_cache.is_missing(cache.get(("db", "ruc", "20100000001")))
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_negative_entries_are_cached_and_lru_is_bounded():
+    cache = lookup_cache.LookupLRU(maxsize=2, clock=FakeClock())
+    cache.set("a", {}, 60)
+    cache.set("b", {"x": 1}, 60)
+    cache.get("a")
+    cache.set("c", {"x": 2}, 60)
+
+    assert cache.get("a") == {}
+    assert lookup_cache.is_missing(cache.get("b"))
+    assert cache.get("c") == {"x": 2}
@@ -1,4 +1,5 @@
 import importlib.util
+from datetime import datetime
 from pathlib import Path
 
 _MODULE_PATH = Path(__file__).resolve().parents[1] / "addons" / "l10n_pe_ruc_dni_autocomplete" / "services" / "partner_sync.py"
@@ -49,3 +50,38 @@ def test_reconcile_partner_payload():
     values = reconcile_partner_payload(payload)
     assert values["external_id"] == "ext-999"
     assert values["external_score"] == 0.9
+
+
+def test_batch_payloads_share_timestamps():
+    synced_at = datetime(2024, 1, 1, 12, 0, 0)
+    payload = build_external_payload(DummyPartner(), updated_at=synced_at)
+    assert payload["updated_at"] == "2024-01-01T12:00:00"
+    values = reconcile_partner_payload({"external_id": "ext-1", "score": 0.5}, synced_at=synced_at)
+    assert values["external_last_sync_at"] == synced_at
+
+
+class RecordingLogger:
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self.records = []
+
+    def isEnabledFor(self, level):
+        return self.enabled
+
+    def log(self, level, msg, *args):
+        self.records.append(msg % args)
+
+
+def test_log_event_is_lazy_and_truncates_large_fields():
+    class Exploding:
+        def __str__(self):
+            raise AssertionError("serialized while disabled")
+
+    partner_sync.log_event(RecordingLogger(False), "skipped", response=Exploding())
+
+    logger = RecordingLogger(True)
+    partner_sync.log_event(logger, "decolecta_autocomplete", partner_id=7, response={"data": "x" * 5000})
+    payload = partner_sync.json.loads(logger.records[0])
+    assert payload["partner_id"] == 7
+    assert payload["response"].endswith("chars>")
+    assert len(payload["response"]) < 1100
@@ -0,0 +1,35 @@
+import importlib.util
+import multiprocessing
+from pathlib import Path
+
+_MODULE_PATH = Path(__file__).resolve().parents[1] / "addons" / "l10n_pe_ruc_dni_autocomplete" / "services" / "rate_limiter.py"
+spec = importlib.util.spec_from_file_location("rate_limiter", _MODULE_PATH)
+rate_limiter = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(rate_limiter)
+
+
+def test_token_bucket_allows_burst_then_throttles(tmp_path):
+    bucket = rate_limiter.TokenBucket("decolecta.api", rate=10, burst=2, directory=str(tmp_path))
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    assert bucket.acquire() > 0.05
+    stats = bucket.stats()
+    assert stats["acquired_total"] == 3
+    assert stats["wait_seconds_total"] > 0.05
+
+
+def _acquire_from_worker(directory):
+    bucket = rate_limiter.TokenBucket("external.api", rate=5, burst=1, directory=directory)
+    bucket.acquire()
+
+
+def test_token_bucket_is_shared_across_processes(tmp_path):
+    workers = [multiprocessing.Process(target=_acquire_from_worker, args=(str(tmp_path),)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    stats = rate_limiter.TokenBucket("external.api", rate=5, burst=1, directory=str(tmp_path)).stats()
+    assert stats["acquired_total"] == 4
+    assert stats["wait_seconds_total"] > 0.2
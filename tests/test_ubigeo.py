@@ -0,0 +1,26 @@
+import importlib.util
+from pathlib import Path
+
+_MODULE_PATH = Path(__file__).resolve().parents[1] / "addons" / "l10n_pe_ruc_dni_autocomplete" / "services" / "ubigeo.py"
+spec = importlib.util.spec_from_file_location("ubigeo", _MODULE_PATH)
+ubigeo = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(ubigeo)
+
+INDEX = ubigeo.build_ubigeo_index(
+    [{"id": 1, "code": "15", "name": "Lima"}, {"id": 2, "code": "04", "name": "Arequipa"}],
+    [{"id": 10, "code": "1501", "name": "Lima", "state_id": 1}, {"id": 20, "code": "0401", "name": "Arequipa", "state_id": 2}],
+    [{"id": 100, "code": "150101", "name": "Lima", "city_id": 10}, {"id": 101, "code": False, "name": "Jesús María", "city_id": 10}],
+)
+
+
+def test_resolves_by_ubigeo_code():
+    assert ubigeo.resolve_ubigeo(INDEX, ubigeo="150101") == (1, 10, 100)
+
+
+def test_falls_back_to_accent_insensitive_names():
+    match = ubigeo.resolve_ubigeo(INDEX, ubigeo="", department="LIMA", province="lima", district="JESUS  MARIA")
+    assert match == (1, 10, 101)
+
+
+def test_unknown_location_resolves_to_false():
+    assert ubigeo.resolve_ubigeo(INDEX, department="Cusco") == (False, False, False)